@@ -0,0 +1,60 @@
+"""Compares the translation of the DataPoints of a simulation to the MoDS
+input JSON, item by item through the Cuds API versus in one pass over the
+session graph with CUDS_Adaptor.dataPointColumns.
+
+    python benchmarks/cuds_to_json.py
+"""
+import json
+import logging
+import time
+from collections import defaultdict
+from osp.core.namespaces import mods
+from osp.wrappers.sim_cmcl_mods_wrapper import CUDS_Adaptor
+
+DATA_POINTS = [100, 500, 2000]
+ITEMS_PER_POINT = 6
+
+
+logging.getLogger("osp.wrappers.sim_cmcl_mods_wrapper").setLevel(logging.WARNING)
+
+
+def make_simulation(n_points: int):
+    simulation = mods.MultiObjectiveSimulation()
+    input_data = mods.InputData()
+    for point in range(n_points):
+        data_point = mods.DataPoint()
+        data_point.add(*[
+            mods.DataPointItem(name=f"var{i}", value=f"{point * 0.1 + i}")
+            for i in range(ITEMS_PER_POINT)], rel=mods.hasPart)
+        input_data.add(data_point, rel=mods.hasPart)
+    simulation.add(input_data)
+    return simulation
+
+
+def per_item_columns(simulation):
+    columns = defaultdict(list)
+    for datum in CUDS_Adaptor.findAll(mods.DataPoint, simulation):
+        for item in datum.get(oclass=mods.DataPointItem):
+            columns[item.name].append(item.value)
+    return columns
+
+
+def cuds_to_json_benchmark():
+    print(f"{'data points':>12}{'per item (s)':>16}{'columnar (s)':>16}")
+    for n_points in DATA_POINTS:
+        simulation = make_simulation(n_points)
+
+        start = time.perf_counter()
+        expected = json.dumps(per_item_columns(simulation))
+        per_item = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columns = json.dumps(CUDS_Adaptor.dataPointColumns(simulation))
+        columnar = time.perf_counter() - start
+
+        assert columns == expected
+        print(f"{n_points:>12}{per_item:>16.2f}{columnar:>16.3f}")
+
+
+if __name__ == "__main__":
+    cuds_to_json_benchmark()
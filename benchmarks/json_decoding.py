@@ -0,0 +1,78 @@
+"""Compares the peak memory and time of decoding a large Evaluate result:
+whole-body decoding of the response text (the former Agent_Bridge path)
+versus the streamed Results_Decoder, with list and typed array outputs.
+
+The response body is served in chunks from memory, as it would be read
+from the socket.
+
+    python benchmarks/json_decoding.py
+"""
+import json
+import time
+import tracemalloc
+from osp.wrappers.sim_cmcl_mods_wrapper import Json_Backend
+from osp.wrappers.sim_cmcl_mods_wrapper.json_decoding import (
+    Results_Decoder, ijson, orjson, ujson)
+
+DATA_POINTS = 100000
+OUTPUTS = 20
+CHUNK_SIZE = 64 * 2**10
+
+
+def make_body() -> bytes:
+    return json.dumps({
+        "jobID": "benchmark",
+        "Outputs": [
+            {"name": f"out{k}", "values": [i * 0.37 + k for i in range(DATA_POINTS)]}
+            for k in range(OUTPUTS)
+        ],
+    }).encode("utf-8")
+
+
+def chunks(body: bytes):
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+
+def response_text(body: bytes):
+    # requests.Response.content read in full, then .text and json.loads
+    content = b"".join(chunks(body))
+    return json.loads(content.decode("utf-8"))
+
+
+def measure(decode, body: bytes):
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = decode(body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return elapsed, peak / 2**20
+
+
+def json_decoding_benchmark():
+    body = make_body()
+    print(f"{DATA_POINTS} points x {OUTPUTS} outputs, "
+          f"{len(body) / 2**20:.0f} MiB body, "
+          f"ijson {'installed' if ijson else 'not installed'}")
+
+    paths = {
+        "response.text + json.loads": response_text,
+        "streamed, lists": lambda body: Results_Decoder().decode(chunks(body)),
+        "streamed, typed arrays": lambda body: Results_Decoder(
+            typed_outputs=True).decode(chunks(body)),
+    }
+    for name, module in (("orjson", orjson), ("ujson", ujson)):
+        if module is not None:
+            paths[f"streamed, lists, {name}"] = (
+                lambda body, name=name: Results_Decoder(
+                    Json_Backend(name)).decode(chunks(body)))
+    print(f"{'path':>28}{'time (s)':>12}{'peak (MiB)':>14}")
+    for name, decode in paths.items():
+        elapsed, peak = measure(decode, body)
+        print(f"{name:>28}{elapsed:>12.2f}{peak:>14.0f}")
+
+
+if __name__ == "__main__":
+    json_decoding_benchmark()
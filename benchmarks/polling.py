@@ -0,0 +1,59 @@
+"""Compares the end-to-end latency of the polling strategies against the
+mods mock agent, for a range of simulated job durations.
+
+The mock agent must be running, e.g. from tests/mods_mock_agent/api:
+
+    python -m flask run -h 127.0.0.1 -p 5000
+    MODS_AGENT_BASE_URL=http://127.0.0.1:5000 python benchmarks/polling.py
+"""
+import json
+import logging
+import os
+import time
+import requests
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Fixed_Polling, Exponential_Backoff_Polling)
+
+JOB_DURATIONS = [0.5, 2.0, 5.0, 15.0]
+
+STRATEGIES = {
+    "fixed (10 s)": Fixed_Polling(),
+    "exponential backoff": Exponential_Backoff_Polling(),
+}
+
+INPUTS = json.dumps({
+    "SimulationType": "MOO",
+    "Inputs": [{"name": f"var{i}", "values": [0.1]} for i in range(1, 7)],
+})
+
+
+logging.getLogger("osp.wrappers.sim_cmcl_mods_wrapper").setLevel(logging.WARNING)
+
+
+def set_job_duration(base_url: str, duration: float) -> None:
+    requests.post(f"{base_url}/admin/config", json={"JOB_DURATION": duration})
+
+
+def polling_benchmark():
+    base_url = os.environ.setdefault(
+        "MODS_AGENT_BASE_URL", "http://127.0.0.1:5000")
+
+    print(f"{'job duration (s)':>18}" +
+          "".join(f"{name:>24}" for name in STRATEGIES))
+    try:
+        for duration in JOB_DURATIONS:
+            set_job_duration(base_url, duration)
+            latencies = []
+            for strategy in STRATEGIES.values():
+                start = time.perf_counter()
+                outputs = Agent_Bridge(polling_strategy=strategy).runJob(INPUTS)
+                latencies.append(time.perf_counter() - start)
+                assert outputs is not None
+            print(f"{duration:>18.1f}" +
+                  "".join(f"{latency:>24.2f}" for latency in latencies))
+    finally:
+        set_job_duration(base_url, 0)
+
+
+if __name__ == "__main__":
+    polling_benchmark()
@@ -0,0 +1,75 @@
+"""Synthetic data sets of the benchmark suite (see conftest.py)."""
+import functools
+import os
+from osp.core.namespaces import mods
+import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
+
+SIZES = [int(size) for size in os.environ.get(
+    "MODS_BENCHMARK_SIZES", "10,1000,100000,1000000").split(",")]
+
+CUDS_SIZES = [int(size) for size in os.environ.get(
+    "MODS_BENCHMARK_CUDS_SIZES", "10,100,1000").split(",")]
+
+SIMULATION_CLASSES = {
+    engtempl.Engine_Template.MOO: mods.MultiObjectiveSimulation,
+    engtempl.Engine_Template.MOOonly: mods.MultiObjectiveSimulationOnly,
+    engtempl.Engine_Template.HDMR: mods.HighDimensionalModelRepresentationSimulation,
+    engtempl.Engine_Template.Evaluate: mods.EvaluateSurrogate,
+    engtempl.Engine_Template.Sensitivity: mods.SensitivityAnalysis,
+    engtempl.Engine_Template.MCDM: mods.MultiCriteriaDecisionMaking,
+}
+
+INPUTS = ["var1", "var2", "var3"]
+OUTPUTS = ["var4", "var5", "var6"]
+
+
+def rounds(n_points: int) -> int:
+    """Number of rounds measured for a data set of n_points."""
+    return max(1, min(10, 2000 // n_points))
+
+
+@functools.lru_cache(maxsize=None)
+def make_simulation(template, n_points: int):
+    """Returns a simulation of the template with n_points input data points
+    (built once per template and size, as it is only read)."""
+    simulation = SIMULATION_CLASSES[template]()
+    algorithm = mods.Algorithm(name="algorithm1", type=template.name,
+                               maxNumberOfResults=10, saveSurrogate=False)
+    algorithm.add(*[mods.Variable(name=name, type="input") for name in INPUTS])
+    algorithm.add(*[mods.Variable(name=name, type="output", objective="Minimise",
+                                  maximum="10.0", weight="0.5")
+                    for name in OUTPUTS])
+    if template == engtempl.Engine_Template.Evaluate:
+        algorithm.surrogateToLoad = "mods-sim-1"
+    simulation.add(algorithm)
+
+    input_data = mods.InputData()
+    for point in range(n_points):
+        data_point = mods.DataPoint()
+        data_point.add(*[
+            mods.DataPointItem(name=name, value=point * 0.001 + i)
+            for i, name in enumerate(INPUTS + OUTPUTS)], rel=mods.hasPart)
+        input_data.add(data_point, rel=mods.hasPart)
+    simulation.add(input_data)
+    return simulation
+
+
+def make_results(template, n_points: int):
+    """Returns the JSON results of a job of the template with n_points
+    output data points (or sensitivities)."""
+    if template == engtempl.Engine_Template.Sensitivity:
+        return {
+            "jobID": "benchmark",
+            "Sensitivities": [{
+                "name": "sensitivity1",
+                "labels": [{"order": 1,
+                            "values": [f"var{i}" for i in range(n_points)]}],
+                "values": [{"order": 1,
+                            "values": [i * 0.001 for i in range(n_points)]}],
+            }],
+        }
+    return {
+        "jobID": "benchmark",
+        "Outputs": [{"name": name, "values": [i * 0.5 + k for i in range(n_points)]}
+                    for k, name in enumerate(INPUTS + OUTPUTS)],
+    }
@@ -0,0 +1,63 @@
+"""pytest-benchmark suite of the translation and transport hot paths, run
+against the synthetic data sets of benchmark_datasets.py.
+
+Only collected when given explicitly on the command line, once the
+requirements of benchmarks/requirements.txt are installed:
+
+    python -m pip install -r benchmarks/requirements.txt
+    python -m pytest benchmarks/suite --benchmark-autosave
+
+Each run is saved under .benchmarks/ with the commit it was run on, and can
+be compared with a previous run, e.g. the first one saved:
+
+    python -m pytest benchmarks/suite --benchmark-compare=0001 \
+        --benchmark-compare-fail=mean:10%
+
+The sizes are comma-separated lists set with environment variables:
+MODS_BENCHMARK_SIZES for the benchmarks of JSON data (10 to 10^6 data
+points by default), and MODS_BENCHMARK_CUDS_SIZES for the ones building or
+reading CUDS data sets (10 to 10^3 data points by default, as osp-core takes
+a few milliseconds per data point: 10^6 data points take hours). The
+end-to-end benchmarks need the mods mock agent, see benchmarks/polling.py,
+and are skipped when it is not running.
+"""
+import logging
+import os
+from pathlib import Path
+import pytest
+import requests
+
+SUITE_DIR = Path(__file__).resolve().parent
+
+
+def pytest_ignore_collect(collection_path, config):
+    """Leaves the suite out of the runs that do not target it."""
+    for arg in config.args:
+        target = (config.invocation_params.dir / arg.split("::")[0]).resolve()
+        if target == SUITE_DIR or SUITE_DIR in target.parents:
+            return None
+    return True
+
+
+@pytest.fixture(scope="session", autouse=True)
+def quiet_logs():
+    """Keeps the wrapper from logging every step of the benchmarked code."""
+    logger = logging.getLogger("osp.wrappers.sim_cmcl_mods_wrapper")
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    yield
+    logger.setLevel(level)
+
+
+@pytest.fixture(scope="session")
+def mock_agent():
+    """Base URL of the running mods mock agent, configured to finish jobs
+    immediately (the benchmarks using it are skipped if it is not running)."""
+    base_url = os.environ.setdefault(
+        "MODS_AGENT_BASE_URL", "http://127.0.0.1:5000")
+    try:
+        requests.post(f"{base_url}/admin/config", json={"JOB_DURATION": 0},
+                      timeout=2).raise_for_status()
+    except requests.RequestException:
+        pytest.skip(f"mods mock agent not running at {base_url}")
+    return base_url
@@ -0,0 +1,46 @@
+"""Benchmarks of the translation between CUDS and the MoDS JSON data."""
+import pytest
+from osp.core.namespaces import cuba, mods
+from osp.wrappers.sim_cmcl_mods_wrapper import CUDS_Adaptor, MoDS_Session
+import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
+from benchmark_datasets import CUDS_SIZES, make_results, make_simulation, rounds
+
+
+@pytest.mark.parametrize("n_points", CUDS_SIZES)
+@pytest.mark.parametrize("template", list(engtempl.Engine_Template),
+                         ids=lambda template: template.name)
+def test_to_json(benchmark, template, n_points):
+    simulation = make_simulation(template, n_points)
+    benchmark.extra_info["data_points"] = n_points
+    jsonSimCase = benchmark.pedantic(
+        CUDS_Adaptor.toJSON, args=(simulation, template),
+        rounds=rounds(n_points))
+    assert len(jsonSimCase) > n_points
+
+
+@pytest.mark.parametrize("n_points", CUDS_SIZES)
+@pytest.mark.parametrize("template", [engtempl.Engine_Template.MOO,
+                                      engtempl.Engine_Template.Evaluate,
+                                      engtempl.Engine_Template.Sensitivity],
+                         ids=lambda template: template.name)
+def test_to_cuds(benchmark, template, n_points):
+    jsonResults = make_results(template, n_points)
+    sessions = []
+
+    def newSimulation():
+        # Every round writes to an empty simulation of a new session
+        for session in sessions:
+            session.close()
+        sessions[:] = [MoDS_Session()]
+        wrapper = cuba.wrapper(session=sessions[0])
+        simulation = wrapper.add(mods.MultiObjectiveSimulation(),
+                                 rel=cuba.relationship)
+        return (simulation, jsonResults, template), {}
+
+    benchmark.extra_info["data_points"] = n_points
+    try:
+        benchmark.pedantic(CUDS_Adaptor.toCUDS, setup=newSimulation,
+                           rounds=rounds(n_points))
+    finally:
+        for session in sessions:
+            session.close()
@@ -0,0 +1,63 @@
+"""Benchmarks of the submission requests built by Agent_Bridge, and of full
+runs against the mods mock agent."""
+import json
+import pytest
+from osp.core.namespaces import cuba
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Fixed_Polling, MoDS_Session, Submission_Mode)
+import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
+from benchmark_datasets import CUDS_SIZES, SIZES, make_simulation, rounds
+
+
+def make_inputs(n_points: int) -> str:
+    return json.dumps({
+        "SimulationType": "Evaluate",
+        "Inputs": [{"name": f"var{k}", "values": [str(i * 0.001 + k)
+                                                  for i in range(n_points)]}
+                   for k in range(3)],
+    })
+
+
+@pytest.mark.parametrize("n_points", SIZES)
+def test_submission_url(benchmark, n_points, monkeypatch):
+    monkeypatch.setenv("MODS_AGENT_BASE_URL", "http://127.0.0.1:5000")
+    jsonString = make_inputs(n_points)
+    bridge = Agent_Bridge()
+    benchmark.extra_info["data_points"] = n_points
+    benchmark.extra_info["payload_bytes"] = len(jsonString)
+    url = benchmark.pedantic(bridge.buildSubmissionURL, args=(jsonString,),
+                             rounds=rounds(n_points), warmup_rounds=1)
+    assert len(url) > len(jsonString)
+
+
+@pytest.mark.parametrize("n_points", SIZES)
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_submission_body(benchmark, n_points, compression):
+    jsonString = make_inputs(n_points)
+    bridge = Agent_Bridge(compression=compression)
+    benchmark.extra_info["data_points"] = n_points
+    body, _ = benchmark.pedantic(bridge.buildSubmissionBody, args=(jsonString,),
+                                 rounds=rounds(n_points), warmup_rounds=1)
+    benchmark.extra_info["body_bytes"] = len(body)
+
+
+@pytest.mark.parametrize("n_points", CUDS_SIZES)
+@pytest.mark.parametrize("template", [engtempl.Engine_Template.MOO,
+                                      engtempl.Engine_Template.Evaluate],
+                         ids=lambda template: template.name)
+def test_end_to_end(benchmark, mock_agent, template, n_points):
+    simulation = make_simulation(template, n_points)
+    polling = Fixed_Polling(0.01, 10000)
+
+    def run():
+        with MoDS_Session(polling_strategy=polling,
+                          submission_mode=Submission_Mode.AUTO) as session:
+            wrapper = cuba.wrapper(session=session)
+            wrapper.add(simulation, rel=cuba.relationship)
+            session.run()
+            return session.last_run_profile()
+
+    benchmark.extra_info["data_points"] = n_points
+    profile = benchmark.pedantic(run, rounds=min(5, rounds(n_points)))
+    assert profile["succeeded"]
+    benchmark.extra_info["profile"] = profile
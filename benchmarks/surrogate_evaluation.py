@@ -0,0 +1,55 @@
+"""Compares the latency of evaluating a saved surrogate on a batch of data
+points as a remote Evaluate job and locally from its export.
+
+The mock agent must be running, e.g. from tests/mods_mock_agent/api:
+
+    python -m flask run -h 127.0.0.1 -p 5000
+    MODS_AGENT_BASE_URL=http://127.0.0.1:5000 python benchmarks/surrogate_evaluation.py
+"""
+import json
+import logging
+import os
+import time
+import numpy as np
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Exponential_Backoff_Polling, Submission_Mode, Surrogate_Store)
+
+BATCH_SIZES = [10, 1000, 100000]
+REPEATS = 20
+
+
+logging.getLogger("osp.wrappers.sim_cmcl_mods_wrapper").setLevel(logging.WARNING)
+
+
+def surrogate_evaluation_benchmark():
+    os.environ.setdefault("MODS_AGENT_BASE_URL", "http://127.0.0.1:5000")
+    surrogate = Surrogate_Store().get("mods-sim-1")
+    rng = np.random.default_rng(0)
+
+    print(f"{'data points':>12}{'remote (ms)':>14}{'local (ms)':>14}")
+    for batch_size in BATCH_SIZES:
+        inputs = {name: rng.random(batch_size) for name in surrogate.inputs}
+
+        jsonSimCase = json.dumps({
+            "SimulationType": "Evaluate",
+            "Algorithms": [{"name": "algorithm1", "surrogateToLoad": "mods-sim-1"}],
+            "Inputs": [{"name": name, "values": values.tolist()}
+                       for name, values in inputs.items()],
+        })
+        bridge = Agent_Bridge(submission_mode=Submission_Mode.AUTO,
+                              polling_strategy=Exponential_Backoff_Polling(
+                                  initial_delay=0.01))
+        start = time.perf_counter()
+        assert bridge.runJob(jsonSimCase) is not None
+        remote = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            surrogate.evaluate(inputs)
+        local = (time.perf_counter() - start) / REPEATS
+
+        print(f"{batch_size:>12}{remote * 1e3:>14.2f}{local * 1e3:>14.3f}")
+
+
+if __name__ == "__main__":
+    surrogate_evaluation_benchmark()
@@ -0,0 +1,69 @@
+"""Tracks the time CUDS_Adaptor.toCUDS takes to register the results of an
+Evaluate job, per 10k data points, against building the same OutputData
+subtree with one add() per item.
+
+    python benchmarks/to_cuds.py
+"""
+import logging
+import time
+from osp.core.namespaces import cuba, mods
+from osp.wrappers.sim_cmcl_mods_wrapper import CUDS_Adaptor, MoDS_Session
+import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
+
+DATA_POINTS = [1000, 5000]
+OUTPUTS = [5, 20]
+
+
+logging.getLogger("osp.wrappers.sim_cmcl_mods_wrapper").setLevel(logging.WARNING)
+
+
+def make_results(n_points: int, n_outputs: int):
+    return {
+        "jobID": "benchmark",
+        "Outputs": [
+            {"name": f"out{k}", "values": [i * 0.5 + k for i in range(n_points)]}
+            for k in range(n_outputs)
+        ],
+    }
+
+
+def per_item_to_cuds(simulation, jsonResults):
+    output_data = mods.OutputData()
+    for i in range(len(jsonResults["Outputs"][0]["values"])):
+        data_point = mods.DataPoint()
+        for output in jsonResults["Outputs"]:
+            data_point.add(
+                mods.DataPointItem(name=output["name"], value=output["values"][i]),
+                rel=mods.hasPart)
+        output_data.add(data_point, rel=mods.hasPart)
+    simulation.add(output_data)
+
+
+def bulk_to_cuds(simulation, jsonResults):
+    CUDS_Adaptor.toCUDS(simulation, jsonResults, engtempl.Engine_Template.Evaluate)
+
+
+def seconds_per_10k_points(to_cuds, jsonResults, n_points: int) -> float:
+    with MoDS_Session() as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(
+            mods.MultiObjectiveSimulation(), rel=cuba.relationship)
+        start = time.perf_counter()
+        to_cuds(simulation, jsonResults)
+        return (time.perf_counter() - start) * 10000 / n_points
+
+
+def to_cuds_benchmark():
+    print(f"{'data points':>12}{'outputs':>10}"
+          f"{'per item (s/10k)':>20}{'bulk (s/10k)':>16}")
+    for n_points in DATA_POINTS:
+        for n_outputs in OUTPUTS:
+            jsonResults = make_results(n_points, n_outputs)
+            per_item = seconds_per_10k_points(
+                per_item_to_cuds, jsonResults, n_points)
+            bulk = seconds_per_10k_points(bulk_to_cuds, jsonResults, n_points)
+            print(f"{n_points:>12}{n_outputs:>10}{per_item:>20.1f}{bulk:>16.1f}")
+
+
+if __name__ == "__main__":
+    to_cuds_benchmark()
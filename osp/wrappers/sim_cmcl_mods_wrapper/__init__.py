@@ -1,5 +1,28 @@
-from osp.wrappers.sim_cmcl_mods_wrapper.agent_bridge import Agent_Bridge
+from osp.wrappers.sim_cmcl_mods_wrapper.job_events import Job_State, Job_Event
+from osp.wrappers.sim_cmcl_mods_wrapper.tracing import (
+    Memory_Tracer, No_Op_Tracer, currentTracer, useTracer)
+from osp.wrappers.sim_cmcl_mods_wrapper.metrics import (
+    Counter, Histogram, Metrics_Registry)
+from osp.wrappers.sim_cmcl_mods_wrapper.agent_transport import Agent_Transport
+from osp.wrappers.sim_cmcl_mods_wrapper.json_decoding import Json_Backend
+from osp.wrappers.sim_cmcl_mods_wrapper.polling_strategies import (
+    Polling_Strategy, Fixed_Polling, Exponential_Backoff_Polling)
+from osp.wrappers.sim_cmcl_mods_wrapper.agent_bridge import Agent_Bridge, Submission_Mode
+from osp.wrappers.sim_cmcl_mods_wrapper.async_agent_bridge import Async_Agent_Bridge
+from osp.wrappers.sim_cmcl_mods_wrapper.formulas import Formula, Analytic_Model
+from osp.wrappers.sim_cmcl_mods_wrapper.job_journal import Job_Journal
+from osp.wrappers.sim_cmcl_mods_wrapper.execution_backends import (
+    Backend_Metrics, Execution_Backend, HTTP_Backend)
+from osp.wrappers.sim_cmcl_mods_wrapper.result_table import Result_Table
+from osp.wrappers.sim_cmcl_mods_wrapper.cuds_index import CUDS_Index
 from osp.wrappers.sim_cmcl_mods_wrapper.cuds_adaptor import CUDS_Adaptor
+from osp.wrappers.sim_cmcl_mods_wrapper.result_cache import Result_Cache
+from osp.wrappers.sim_cmcl_mods_wrapper.input_chunking import Input_Chunker
+from osp.wrappers.sim_cmcl_mods_wrapper.surrogates import HDMR_Surrogate, Surrogate_Store
+from osp.wrappers.sim_cmcl_mods_wrapper.ranking import Local_Ranker
+from osp.wrappers.sim_cmcl_mods_wrapper.process_backend import Process_Pool_Backend
+from osp.wrappers.sim_cmcl_mods_wrapper.request_coalescing import Request_Coalescer
+from osp.wrappers.sim_cmcl_mods_wrapper.job_handles import Job_Handle, as_completed, wait_any
 from osp.wrappers.sim_cmcl_mods_wrapper.mods_session import MoDS_Session
 from osp.wrappers.sim_cmcl_mods_wrapper.mods_engine import MoDS_Engine
 import logging
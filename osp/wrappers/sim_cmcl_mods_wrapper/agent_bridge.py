@@ -1,14 +1,39 @@
 import requests
 import json
+import gzip
+import threading
 import urllib.parse
-import time
-from typing import Optional, Dict
+from enum import Enum
+from typing import Optional, Dict, Iterator, List, Tuple
 import logging
 import os
+from osp.wrappers.sim_cmcl_mods_wrapper.agent_transport import Agent_Transport
+from osp.wrappers.sim_cmcl_mods_wrapper.json_decoding import (
+    Json_Backend, Results_Decoder)
+from osp.wrappers.sim_cmcl_mods_wrapper.job_events import (
+    Job_State, Job_Event, Job_Listener)
+from osp.wrappers.sim_cmcl_mods_wrapper.tracing import currentTracer
+from osp.wrappers.sim_cmcl_mods_wrapper.polling_strategies import (
+    Polling_Strategy, Fixed_Polling)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
 
+class Submission_Mode(Enum):
+    """How the input JSON of a job is sent to the MoDS Agent."""
+    # URL-encoded in the query string of a GET request
+    QUERY = 1
+    # As the body of a POST request
+    BODY = 2
+    # QUERY for short submission URLs, BODY for long ones
+    AUTO = 3
+
+
 class Agent_Bridge:
     """Class to handle communicating with the MoDSAgent servlet via a
     series of HTTP requests.
@@ -20,19 +45,155 @@ class Agent_Bridge:
     # Maximum number of requests when waiting for jobs to finish
     MAX_ATTEMPTS: int = 60
 
+    # Strategy deciding the waits between polls (None for a Fixed_Polling
+    # using POLL_INTERVAL and MAX_ATTEMPTS)
+    POLLING_STRATEGY: Optional[Polling_Strategy] = None
+
     # Additional URL part for job submission
     SUBMISSION_URL_PART: str = "request?query="
 
+    # Additional URL part for job submission with the JSON in the request body
+    SUBMISSION_BODY_URL_PART: str = "request"
+
+    # How input JSON is sent to the agent
+    SUBMISSION_MODE: Submission_Mode = Submission_Mode.QUERY
+
+    # Longest submission URL (bytes, with the encoded input JSON in its query
+    # string) sent in AUTO mode
+    MAX_QUERY_URL_SIZE: int = 2048
+
+    # Compression of request bodies (None, "gzip" or "zstd")
+    COMPRESSION: Optional[str] = None
+
     # Additional URL part for requesting job outputs
     OUTPUT_URL_PART: str = "output/request?query="
 
+    # Additional URL part for downloading saved surrogates
+    SURROGATE_URL_PART: str = "surrogate/request?query="
+
+    # Whether output columns are decoded to typed arrays instead of lists
+    TYPED_OUTPUTS: bool = False
+
+    # Size of the chunks in which output responses are read (bytes)
+    RESPONSE_CHUNK_SIZE: int = 64 * 2**10
+
     # ID of generated job
     jobID: Optional[str] = None
 
+    # Current state of the job (None until it is submitted)
+    state: Optional[Job_State] = None
+
+    # Number of output requests made for the job
+    attempts: int = 0
+
+    def __init__(
+        self,
+        transport: Optional[Agent_Transport] = None,
+        submission_mode: Optional[Submission_Mode] = None,
+        compression: Optional[str] = None,
+        polling_strategy: Optional[Polling_Strategy] = None,
+        typed_outputs: Optional[bool] = None,
+        json_backend: Optional[Json_Backend] = None,
+    ):
+        """Initialises the bridge.
+
+        Arguments:
+            transport        -- HTTP transport to use (defaults to the
+                                transport shared by all bridges of the process)
+            submission_mode  -- How input JSON is sent to the agent (defaults
+                                to SUBMISSION_MODE)
+            compression      -- Compression of request bodies (defaults to
+                                COMPRESSION)
+            polling_strategy -- Strategy deciding the waits between polls
+                                (defaults to POLLING_STRATEGY)
+            typed_outputs    -- Whether output columns are decoded to typed
+                                arrays (defaults to TYPED_OUTPUTS)
+            json_backend     -- JSON backend decoding the agent's responses
+                                (defaults to the standard json module)
+        """
+        if transport is None:
+            transport = Agent_Transport.shared()
+        self.transport = transport
+        self._listeners: List[Job_Listener] = []
+        self._cancelled = threading.Event()
+        if polling_strategy is not None:
+            self.POLLING_STRATEGY = polling_strategy
+        if submission_mode is not None:
+            self.SUBMISSION_MODE = submission_mode
+        if compression is not None:
+            self.COMPRESSION = compression
+        if typed_outputs is not None:
+            self.TYPED_OUTPUTS = typed_outputs
+        self.json_backend = json_backend or Json_Backend.default()
+        if self.COMPRESSION not in (None, "gzip", "zstd"):
+            raise ValueError(f"Unsupported compression: {self.COMPRESSION}")
+        if self.COMPRESSION == "zstd" and zstandard is None:
+            raise ValueError(
+                "zstd compression requires the zstandard package to be installed")
+
     @property
     def base_url(self) -> str:
         return f"{os.environ['MODS_AGENT_BASE_URL']}/"
 
+    def addListener(self, listener: Job_Listener) -> None:
+        """Registers a callable receiving a Job_Event on every state
+        transition of the job (once when it starts RUNNING, not on every
+        poll).
+
+        Arguments:
+            listener -- Callable taking a Job_Event
+        """
+        self._listeners.append(listener)
+
+    def setState(self, state: Job_State, attempt: int = 0) -> None:
+        """Records a state transition of the job and notifies the listeners.
+        Nothing happens if the job is already in that state (e.g. on every
+        poll of a running job).
+
+        Arguments:
+            state (Job_State) -- New state of the job
+            attempt (int)     -- Number of output requests made so far
+        """
+        if state == self.state:
+            return
+        self.state = state
+        event = Job_Event(self.jobID, state, attempt)
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Job listener failed on %s", event)
+
+    def cancel(self) -> None:
+        """Stops waiting for the job. Any pending wait returns immediately
+        and the job is reported as CANCELLED. Note that the remote job itself
+        keeps running on the agent.
+        """
+        logger.info("Cancelling job %s", self.jobID)
+        self._cancelled.set()
+
+    def isCancelled(self) -> bool:
+        """Returns true if the job was cancelled."""
+        return self._cancelled.is_set()
+
+    def finishJob(self, outputs: Optional[Dict], attempt: int = 0) -> Optional[Dict]:
+        """Records the final state of the job given its outputs.
+
+        Arguments:
+            outputs (dict) -- Job outputs (None in case of failure)
+            attempt (int)  -- Number of output requests made
+
+        Returns:
+            The job outputs
+        """
+        if outputs is not None:
+            self.setState(Job_State.DONE, attempt)
+        elif self.isCancelled():
+            self.setState(Job_State.CANCELLED, attempt)
+        else:
+            self.setState(Job_State.FAILED, attempt)
+        return outputs
+
     def runJob(self, jsonString: str) -> Optional[Dict]:
         """Runs a complete MoDS simulation on a remote machine via use of HTTP requests.
         Note that this method will block until the remote job is completed and has returned
@@ -44,40 +205,107 @@ class Agent_Bridge:
         Returns:
             Resulting JSON data objects (or None if error occurs)
         """
+        if not self.prepareSubmission(jsonString):
+            return self.finishJob(None)
+
+        submit_message = self.submitJob(jsonString)
+        if not self.acceptSubmission(submit_message):
+            return self.finishJob(submit_message)
+
+        # Request outputs
+        return self.completeJob(self.requestOutputs())
+
+    def resumeJob(self, jobID: str) -> Optional[Dict]:
+        """Waits for the results of a job submitted earlier, e.g. by a
+        client process that has since stopped, as runJob() does once the job
+        is submitted.
+
+        Arguments:
+            jobID (str) -- ID of the job
+
+        Returns:
+            Resulting JSON data objects (or None if error occurs)
+        """
+        if not self.prepareResume(jobID):
+            return self.finishJob(None)
+        return self.completeJob(self.requestOutputs())
+
+    # The steps of runJob() and resumeJob() around their HTTP requests are
+    # shared with Async_Agent_Bridge, which only awaits the requests
+
+    def prepareSubmission(self, jsonString: str) -> bool:
+        """Prepares the submission of a new job.
+
+        Returns:
+            False if the job was cancelled before its submission
+        """
         os.environ['NO_PROXY'] = self.base_url
         logger.info("MoDS enpoint: %s", os.environ['MODS_AGENT_BASE_URL'])
 
+        if self.isCancelled():
+            return False
+
         logger.info("Submitting job")
         logger.debug("Submission JSON: \n%s", jsonString)
-        submit_message = self.submitJob(jsonString)
+        return True
+
+    def acceptSubmission(self, submit_message: Optional[Dict]) -> bool:
+        """Records the response to the submission of a job.
+
+        Arguments:
+            submit_message (dict) -- Parsed submission response (None if the
+                                     submission failed)
+
+        Returns:
+            True if the job was submitted and its outputs must be requested,
+            False if the submission failed or returned the final results
+        """
         logger.debug("Submit Message: \n%s", submit_message)
 
         if submit_message is None:
             # TODO - How do we pass this error back to the calling SimPhoNY code?
             # TODO - Should there be a CUDS objects to hold error messages?
             logger.error("Job was not submitted successfully")
-            return None
+            return False
 
         logger.info("Job successfully submitted.")
+        self.setState(Job_State.SUBMITTED)
+        return not self.is_final_result(submit_message)
 
-        if self.is_final_result(submit_message):
-            return submit_message
+    def prepareResume(self, jobID: str) -> bool:
+        """Prepares waiting for the results of a job submitted earlier.
 
-        # Wait a little time for the request to process
-        time.sleep(self.POLL_INTERVAL)
+        Returns:
+            False if the job was cancelled before
+        """
+        os.environ['NO_PROXY'] = self.base_url
+        self.jobID = jobID
+        logger.info("Resuming job %s", jobID)
 
-        # Request outputs
-        outputs = self.requestOutputs()
+        if self.isCancelled():
+            return False
+        self.setState(Job_State.RUNNING)
+        return True
+
+    def completeJob(self, outputs: Optional[Dict]) -> Optional[Dict]:
+        """Records the end of a job once its outputs were requested.
+
+        Arguments:
+            outputs (dict) -- Job outputs (None in case of failure)
+
+        Returns:
+            The job outputs
+        """
         logger.debug("Outputs returned: \n%s", outputs)
 
         if (outputs is None):
             logger.error(
-                "Could not get job outputs (failed job?), returning None")
-            return None
-
-        logger.info(
-            "Job completed, returning JSON representation of output data")
-        return outputs
+                "Could not get outputs of job %s (failed job?), returning None",
+                self.jobID)
+        else:
+            logger.info(
+                "Job completed, returning JSON representation of output data")
+        return self.finishJob(outputs, self.attempts)
 
     def submitJob(self, jsonString: str) -> dict:
         """Submits a job using a HTTP request with the input JSON string, stores
@@ -90,12 +318,80 @@ class Agent_Bridge:
             True if a job was succesfully submitted
         """
 
-        # Build the job submission URL
-        url = self.buildSubmissionURL(jsonString)
-        logger.debug("Submission URL: %s", url)
-
         # Submit the request and get the response
-        response = requests.get(url)
+        response = self.sendSubmission(jsonString)
+
+        return self.handleSubmitResponse(response)
+
+    def sendSubmission(self, jsonString: str) -> requests.Response:
+        """Sends the job submission request, either with the input JSON in
+        the query string or in the request body, depending on the submission
+        mode and the length of the submission URL.
+
+        Arguments:
+            jsonString (str) -- Input parameter data in raw JSON form
+
+        Returns:
+            HTTP response
+        """
+        with currentTracer().start_as_current_span("submit") as span:
+            span.set_attribute("payload_bytes", len(jsonString))
+            url = None
+            if self.SUBMISSION_MODE != Submission_Mode.BODY:
+                # Build the job submission URL
+                url = self.buildSubmissionURL(jsonString)
+            if not self.useRequestBody(url):
+                logger.debug("Submission URL: %s", url)
+                response = self.transport.get(url)
+            else:
+                url = self.base_url + self.SUBMISSION_BODY_URL_PART
+                body, headers = self.buildSubmissionBody(jsonString)
+                logger.debug("Submission URL: %s (%s byte body)", url, len(body))
+                response = self.transport.request(
+                    "POST", url, data=body, headers=headers)
+            span.set_attribute("status_code", response.status_code)
+            return response
+
+    def useRequestBody(self, url: Optional[str]) -> bool:
+        """Returns true if the input JSON should be sent in the request body
+        rather than in the query string of the given submission URL (None
+        in BODY mode)."""
+        if self.SUBMISSION_MODE == Submission_Mode.AUTO:
+            return len(url) > self.MAX_QUERY_URL_SIZE
+        return self.SUBMISSION_MODE == Submission_Mode.BODY
+
+    def buildSubmissionBody(self, jsonString: str) -> Tuple[bytes, Dict[str, str]]:
+        """Builds the (optionally compressed) request body and headers for
+        the input JSON string.
+
+        Arguments:
+            jsonString (str) -- Input parameter data in JSON form
+
+        Returns:
+            Request body and headers
+        """
+        body = jsonString.encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+
+        if self.COMPRESSION == "gzip":
+            body = gzip.compress(body)
+        elif self.COMPRESSION == "zstd":
+            body = zstandard.ZstdCompressor().compress(body)
+
+        if self.COMPRESSION is not None:
+            headers["Content-Encoding"] = self.COMPRESSION
+        return body, headers
+
+    def handleSubmitResponse(self, response: requests.Response) -> Optional[Dict]:
+        """Checks the HTTP response of a job submission and stores the
+        resulting job ID returned by MoDS Agent.
+
+        Arguments:
+            response (requests.Response) -- Response to the submission request
+
+        Returns:
+            Parsed JSON response (or None if the submission failed)
+        """
 
         # Check the HTTP return code
         if (response.status_code != 200):
@@ -104,11 +400,8 @@ class Agent_Bridge:
             logger.error("Reason: %s", response.reason)
             return None
 
-        # Get the returned RAW text
-        returnedRaw = response.text
-
         # Parse into JSON
-        returnedJSON = json.loads(returnedRaw)
+        returnedJSON = self.json_backend.loads(response.content)
 
         # Get the generated job ID from the JSON
         self.jobID = returnedJSON["jobID"]
@@ -124,10 +417,22 @@ class Agent_Bridge:
             logger.info("Asynchronous job detected")
             return False
 
+    def pollingDelays(self) -> Iterator[float]:
+        """Returns the waits (seconds) before each output request of a new
+        job, as given by the polling strategy."""
+        strategy = self.POLLING_STRATEGY
+        if strategy is None:
+            strategy = Fixed_Polling(self.POLL_INTERVAL, self.MAX_ATTEMPTS)
+        return strategy.delays()
+
     def requestOutputs(self) -> Optional[Dict]:
-        """Sends a HTTP request asking for the results of the submitted job.
-        If the job fails, None is returned. Note that this function will block
-        until the job has executed on the remote machine.
+        """Sends HTTP requests asking for the results of the submitted job,
+        waiting before each request as given by the polling strategy, until
+        a request reports that the job is finished (or the polling strategy
+        gives up, or the job is cancelled). Only the latest response is held,
+        however many requests are needed. If the job fails, None is returned.
+        Note that this function will block until the job has executed on the
+        remote machine.
 
         Returns:
             JSON object detailing job outputs (None in case of failure)
@@ -136,8 +441,88 @@ class Agent_Bridge:
         # Build the URL
         url = self.buildOutputURL()
 
-        # Submit the request
-        result = self.__getJobResults(url, 1)
+        self.attempts = 0
+        for delay in self.pollingDelays():
+            # Wait a little time for the request to process
+            if self._cancelled.wait(delay):
+                logger.warning("Job %s cancelled while waiting.", self.jobID)
+                return self.checkOutputs(None)
+
+            # Submit the request
+            self.attempts += 1
+            finished, result = self.handleOutputResponse(*self.fetchOutputs(url))
+            if finished:
+                return self.checkOutputs(result)
+
+        # Fail once the polling strategy gives up
+        logger.warning(
+            "Polling strategy exhausted, considering job a failure.")
+        return self.checkOutputs(None)
+
+    def handleOutputResponse(self, status_code: int, reason: str,
+                             returnedJSON: Optional[Dict]
+                             ) -> Tuple[bool, Optional[Dict]]:
+        """Handles the response to an output request (see fetchOutputs).
+
+        Returns:
+            Whether the job is finished (false while it is still running),
+            and the JSON object parsed from the response (None if the
+            request failed)
+        """
+        # Check the HTTP return code
+        if (status_code == 204):
+            logger.info("Job %s still running (attempt %s)",
+                        self.jobID, self.attempts)
+            self.setState(Job_State.RUNNING, self.attempts)
+            return False, None
+        if (status_code != 200):
+            logger.error(
+                "HTTP request returns unexpected status code %s", status_code)
+            logger.error("Reason: %s", reason)
+            return True, None
+        return True, returnedJSON
+
+    def fetchOutputs(self, url: str) -> Tuple[int, str, Optional[Dict]]:
+        """Sends a single output request. The response body is streamed and
+        decoded chunk by chunk, so that the response text is never held in
+        memory.
+
+        Arguments:
+            url (str) -- Output request URL
+
+        Returns:
+            HTTP status code and reason, and the JSON object parsed from the
+            response (None unless the status code is 200)
+        """
+        tracer = currentTracer()
+        with tracer.start_as_current_span("poll") as span, \
+                self.transport.get(url, stream=True) as response:
+            span.set_attribute("status_code", response.status_code)
+            returnedJSON = None
+            if response.status_code == 200:
+                with tracer.start_as_current_span("download") as download:
+                    decoder = Results_Decoder(self.json_backend, self.TYPED_OUTPUTS)
+                    size = [0]
+
+                    def chunks():
+                        for chunk in response.iter_content(self.RESPONSE_CHUNK_SIZE):
+                            size[0] += len(chunk)
+                            yield chunk
+
+                    returnedJSON = decoder.decode(chunks())
+                    download.set_attribute("response_bytes", size[0])
+            return response.status_code, response.reason, returnedJSON
+
+    def checkOutputs(self, result: Optional[Dict]) -> Optional[Dict]:
+        """Checks that the outputs returned for a job describe a successfully
+        finished job.
+
+        Arguments:
+            result (dict) -- JSON object returned by the output request
+
+        Returns:
+            JSON object detailing job outputs (None in case of failure)
+        """
         if (result is None):
             logger.error("Job was not completed on the remote HPC!")
             return None
@@ -153,6 +538,28 @@ class Agent_Bridge:
         logger.info("Job finished successfully, output data received.")
         return result
 
+    def downloadSurrogate(self, surrogateID: str) -> Optional[Dict]:
+        """Downloads the export of a surrogate saved by a previous job (see
+        HDMR_Surrogate for its format).
+
+        Arguments:
+            surrogateID (str) -- ID of the surrogate (job ID of the
+                                 simulation that saved it)
+
+        Returns:
+            Exported surrogate (None if the download failed)
+        """
+        url = self.base_url + self.SURROGATE_URL_PART
+        url += self.encodeURL(json.dumps({"surrogateID": surrogateID}))
+
+        response = self.transport.get(url)
+        if (response.status_code != 200):
+            logger.error(
+                "Could not download surrogate %s, status code %s",
+                surrogateID, response.status_code)
+            return None
+        return self.json_backend.loads(response.content)
+
     def buildSubmissionURL(self, jsonString: str) -> str:
         """Builds the submission URL for the input JSON string.
 
@@ -162,8 +569,10 @@ class Agent_Bridge:
         Returns:
             Full job submission URL
         """
-        url = self.base_url + self.SUBMISSION_URL_PART
-        url += self.encodeURL(jsonString)
+        with currentTracer().start_as_current_span("encodeURL") as span:
+            url = self.base_url + self.SUBMISSION_URL_PART
+            url += self.encodeURL(jsonString)
+            span.set_attribute("url_bytes", len(url))
         return url
 
     def buildOutputURL(self) -> str:
@@ -193,45 +602,3 @@ class Agent_Bridge:
             Valid URL
         """
         return urllib.parse.quote(string)
-
-    def __getJobResults(self, url: str, attempt: int) -> Optional[Dict]:
-        """Make a HTTP request to get the final results of the submitted job.
-        Recurses until the request reports that the job is finished (or a
-        maximum number of attempts is reached)
-
-        Arguments:
-            url (str)     -- Output request URL
-            attempt (int) -- Current attempt index
-
-        Returns:
-            JSON object parsed from response (or None if failure occurs)
-        """
-
-        # Fail at is more than max attempts
-        if (attempt >= self.MAX_ATTEMPTS):
-            logger.warning(
-                "Maximum number of attempts reached, considering job a failure.")
-            return None
-
-        # Submit the request
-        response = requests.get(url)
-
-        # Check the HTTP return code
-        if (response.status_code == 204):
-            logger.info("Job still running (attempt %s of %s)",
-                        attempt, self.MAX_ATTEMPTS)
-            time.sleep(self.POLL_INTERVAL)
-            return self.__getJobResults(url, attempt + 1)
-        elif (response.status_code != 200):
-            logger.error(
-                "HTTP request returns unexpected status code %s", response.status_code)
-            logger.error("Reason: %s", response.reason)
-            return None
-        else:
-            # Get the returned RAW text
-            returnedRaw = response.text
-
-            # Parse into JSON
-            returnedJSON = json.loads(returnedRaw)
-
-            return returnedJSON
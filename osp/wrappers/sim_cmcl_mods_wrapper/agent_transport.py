@@ -0,0 +1,175 @@
+import requests
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from typing import Callable, Dict, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _Counting_Adapter(HTTPAdapter):
+    """HTTP adapter reporting every new connection opened by its pools."""
+
+    def __init__(self, on_new_connection: Callable[[], None], **kwargs):
+        self._on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_new_connection = self._on_new_connection
+
+        class Counting_HTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        class Counting_HTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": Counting_HTTPConnectionPool,
+            "https": Counting_HTTPSConnectionPool,
+        }
+
+
+class Agent_Transport:
+    """Pooled, keep-alive HTTP transport used to talk to the MoDS Agent.
+
+    A single requests.Session is kept per transport, so that the TCP/TLS
+    connections to the agent are reused between job submissions and
+    polls. Unless a transport is passed explicitly, all bridges of a process
+    share the transport returned by Agent_Transport.shared().
+    """
+
+    # Number of hosts for which a connection pool is kept
+    MAX_HOSTS: int = 10
+
+    # Maximum number of idle connections kept open per host (more
+    # connections are opened when more requests run at once, and closed
+    # after their request)
+    MAX_CONNECTIONS_PER_HOST: int = 32
+
+    # Connect and read timeouts of each request (seconds)
+    TIMEOUT: Tuple[float, float] = (10.0, 300.0)
+
+    # Transport shared by all bridges (created on first use)
+    _shared: Optional["Agent_Transport"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_hosts: int = MAX_HOSTS,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        keep_alive: bool = True,
+        timeout: Union[float, Tuple[float, float], None] = TIMEOUT,
+    ):
+        """Initialises the transport.
+
+        Arguments:
+            max_hosts                -- Number of hosts for which a connection
+                                        pool is kept
+            max_connections_per_host -- Maximum number of idle connections
+                                        kept open per host (this does not
+                                        limit the number of requests running
+                                        at once)
+            keep_alive               -- Whether connections are kept open
+                                        between requests
+            timeout                  -- Connect and read timeouts (seconds)
+        """
+        self.max_hosts = max_hosts
+        self.max_connections_per_host = max_connections_per_host
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._num_requests = 0
+        self._num_new_connections = 0
+
+        self.session = requests.Session()
+        adapter = _Counting_Adapter(
+            self._count_new_connection,
+            pool_connections=max_hosts,
+            pool_maxsize=max_connections_per_host,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    @classmethod
+    def shared(cls) -> "Agent_Transport":
+        """Returns the transport shared by all bridges of this process."""
+        with cls._shared_lock:
+            if Agent_Transport._shared is None:
+                Agent_Transport._shared = cls()
+            return Agent_Transport._shared
+
+    @classmethod
+    def configure_shared(cls, **kwargs) -> "Agent_Transport":
+        """Replaces the shared transport by a new one built with the given
+        settings (see __init__ for the accepted keyword arguments).
+
+        Returns:
+            The new shared transport
+        """
+        transport = cls(**kwargs)
+        with cls._shared_lock:
+            previous = Agent_Transport._shared
+            Agent_Transport._shared = transport
+        if previous is not None:
+            previous.close()
+        return transport
+
+    def _count_new_connection(self) -> None:
+        with self._lock:
+            self._num_new_connections += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Performs a HTTP GET request over the pooled connections.
+
+        Arguments:
+            url (str) -- Request URL
+            kwargs    -- Keyword arguments passed to requests
+
+        Returns:
+            HTTP response
+        """
+        return self.request("GET", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Performs a HTTP request over the pooled connections.
+
+        Arguments:
+            method (str) -- HTTP method
+            url (str)    -- Request URL
+            kwargs       -- Keyword arguments passed to requests
+
+        Returns:
+            HTTP response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self._num_requests += 1
+        return self.session.request(method, url, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the connection counters of this transport.
+
+        Returns:
+            Number of requests, new connections and reused connections
+        """
+        with self._lock:
+            num_requests = self._num_requests
+            num_new_connections = self._num_new_connections
+        return {
+            "requests": num_requests,
+            "new_connections": num_new_connections,
+            "reused_connections": max(num_requests - num_new_connections, 0),
+        }
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.session.close()
@@ -0,0 +1,197 @@
+import requests
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Tuple
+import logging
+import threading
+from osp.wrappers.sim_cmcl_mods_wrapper.agent_bridge import Agent_Bridge
+from osp.wrappers.sim_cmcl_mods_wrapper.agent_transport import Agent_Transport
+
+logger = logging.getLogger(__name__)
+
+
+class Async_Agent_Bridge(Agent_Bridge):
+    """Asyncio counterpart of the Agent_Bridge class. Jobs are submitted and
+    polled from coroutines, so that a single event loop can keep many MoDS
+    jobs in flight at once.
+
+    Waiting between polls is done on the event loop, and returns as soon as
+    the job is cancelled. The HTTP requests themselves are blocking
+    requests made over the bridge's pooled Agent_Transport: they are
+    offloaded to the worker threads of an executor shared by all bridges of
+    the process, a thread being held only while a request is on the wire.
+    They run in the context of the calling coroutine (so that they are
+    traced by its current tracer).
+    """
+
+    # Maximum number of HTTP requests in flight across all bridges
+    MAX_CONCURRENT_REQUESTS: int = Agent_Transport.MAX_CONNECTIONS_PER_HOST
+
+    # Shared executor (created on first use)
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Returns the thread pool, shared by all asynchronous bridges, to
+        which the blocking HTTP requests are offloaded."""
+        with cls._executor_lock:
+            if Async_Agent_Bridge._executor is None:
+                Async_Agent_Bridge._executor = ThreadPoolExecutor(
+                    max_workers=cls.MAX_CONCURRENT_REQUESTS,
+                    thread_name_prefix="mods-agent-http")
+            return Async_Agent_Bridge._executor
+
+    def __init__(self, *args, **kwargs):
+        """Initialises the bridge (see Agent_Bridge)."""
+        super().__init__(*args, **kwargs)
+        # Event loop and event of the pending wait between polls
+        self._cancelWaiter: Optional[Tuple[asyncio.AbstractEventLoop,
+                                           asyncio.Event]] = None
+
+    def cancel(self) -> None:
+        """Stops waiting for the job (see Agent_Bridge.cancel), waking up
+        the pending wait between polls from any thread."""
+        super().cancel()
+        waiter = self._cancelWaiter
+        if waiter is not None:
+            loop, event = waiter
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The event loop is closed
+                pass
+
+    async def waitForCancel(self, delay: float) -> bool:
+        """Waits up to delay seconds, returning early (and true) if the job
+        is cancelled."""
+        event = asyncio.Event()
+        self._cancelWaiter = (asyncio.get_running_loop(), event)
+        try:
+            if self.isCancelled():
+                return True
+            await asyncio.wait_for(event.wait(), delay)
+            return True
+        except asyncio.TimeoutError:
+            return self.isCancelled()
+        finally:
+            self._cancelWaiter = None
+
+    async def httpGetOutputs(self, url: str) -> Tuple[int, str, Optional[Dict]]:
+        """Sends a single output request (see Agent_Bridge.fetchOutputs)
+        on a thread of the shared executor.
+
+        Arguments:
+            url (str) -- Output request URL
+
+        Returns:
+            HTTP status code and reason, and the parsed JSON outputs
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor(), contextvars.copy_context().run,
+            self.fetchOutputs, url)
+
+    async def httpSubmit(self, jsonString: str) -> requests.Response:
+        """Sends the job submission request on a thread of the shared
+        executor.
+
+        Arguments:
+            jsonString (str) -- Input parameter data in raw JSON form
+
+        Returns:
+            HTTP response
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor(), contextvars.copy_context().run,
+            self.sendSubmission, jsonString)
+
+    async def runJob(self, jsonString: str) -> Optional[Dict]:
+        """Runs a complete MoDS simulation on a remote machine via use of HTTP requests.
+        The coroutine completes once the remote job has returned a result or
+        error message.
+
+        Arguments:
+            jsonString -- JSON input data string
+
+        Returns:
+            Resulting JSON data objects (or None if error occurs)
+        """
+        try:
+            return await self._runJob(jsonString)
+        except asyncio.CancelledError:
+            # The task running the job was cancelled
+            self._cancelled.set()
+            self.finishJob(None, self.attempts)
+            raise
+
+    async def resumeJob(self, jobID: str) -> Optional[Dict]:
+        """Awaitable counterpart of Agent_Bridge.resumeJob()."""
+        try:
+            if not self.prepareResume(jobID):
+                return self.finishJob(None)
+            return self.completeJob(await self.requestOutputs())
+        except asyncio.CancelledError:
+            self._cancelled.set()
+            self.finishJob(None, self.attempts)
+            raise
+
+    async def _runJob(self, jsonString: str) -> Optional[Dict]:
+        if not self.prepareSubmission(jsonString):
+            return self.finishJob(None)
+
+        submit_message = await self.submitJob(jsonString)
+        if not self.acceptSubmission(submit_message):
+            return self.finishJob(submit_message)
+
+        # Request outputs
+        return self.completeJob(await self.requestOutputs())
+
+    async def submitJob(self, jsonString: str) -> Optional[Dict]:
+        """Submits a job using a HTTP request with the input JSON string, stores
+        resulting job ID returned by MoDS Agent.
+
+        Arguments:
+            jsonString (str) -- Input parameter data in raw JSON form
+
+        Returns:
+            Parsed JSON response (or None if the submission failed)
+        """
+
+        # Submit the request and get the response
+        response = await self.httpSubmit(jsonString)
+
+        return self.handleSubmitResponse(response)
+
+    async def requestOutputs(self) -> Optional[Dict]:
+        """Sends HTTP requests asking for the results of the submitted job
+        until the job has executed on the remote machine, waiting before each
+        request as given by the polling strategy. If the job fails, None is
+        returned.
+
+        Returns:
+            JSON object detailing job outputs (None in case of failure)
+        """
+
+        # Build the URL
+        url = self.buildOutputURL()
+
+        self.attempts = 0
+        for delay in self.pollingDelays():
+            # Wait a little time for the request to process
+            if await self.waitForCancel(delay):
+                logger.warning("Job %s cancelled while waiting.", self.jobID)
+                return self.checkOutputs(None)
+
+            self.attempts += 1
+            finished, result = self.handleOutputResponse(
+                *await self.httpGetOutputs(url))
+            if finished:
+                return self.checkOutputs(result)
+
+        # Fail once the polling strategy gives up
+        logger.warning(
+            "Polling strategy exhausted, considering job a failure.")
+        return self.checkOutputs(None)
@@ -1,14 +1,18 @@
-from numpy import maximum
-import osp.core.utils.simple_search as search
 from typing import Any, List
 import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
-from osp.core.cuds import Cuds
+from osp.wrappers.sim_cmcl_mods_wrapper.result_table import Result_Table
+from osp.wrappers.sim_cmcl_mods_wrapper.formulas import Analytic_Model
+from osp.wrappers.sim_cmcl_mods_wrapper.cuds_index import CUDS_Index
+from osp.core.cuds import Cuds, CUDS_NAMESPACE_IRI
 from osp.core.namespaces import mods, cuba
+from osp.core.ontology.datatypes import get_python_datatype
+from rdflib import RDF, Literal, URIRef
 import json
 import logging
 from collections import defaultdict
-from typing import Dict
+from typing import Dict, Optional
 from enum import Enum
+from uuid import UUID, uuid4
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +30,28 @@ class CUDS_Adaptor:
     """Class to handle translation between CUDS and JSON objects."""
 
     @staticmethod
-    def toJSON(root_cuds_object: Cuds, simulation_template: Enum) -> str:
+    def findAll(oclass, root_cuds_object: Cuds,
+                index: Optional[CUDS_Index] = None) -> List[Cuds]:
+        """Finds all CUDS objects of the given oclass related to the root.
+
+        When the root is a Simulation, only its own parts are searched, so
+        that the simulations of a batch sharing one wrapper do not see each
+        other's data. Passing the CUDS_Index of the root lets several
+        lookups share a single traversal.
+        """
+        if index is None:
+            index = CUDS_Index(root_cuds_object)
+        return index.find(oclass)
+
+    @staticmethod
+    def toJSON(root_cuds_object: Cuds, simulation_template: Enum,
+               index: Optional[CUDS_Index] = None) -> str:
         """Translates the input CUDS object to a JSON object matching the
-        INPUT format of the remote MoDS simulation."""
+        INPUT format of the remote MoDS simulation.
+
+        The root is indexed once (unless its CUDS_Index is given) and all
+        the lookups of the translation are answered from the index.
+        """
 
         # NOTE - This translation relies heavily on the structure of the CUDS data,
         # which is defined by the ontology. If the ontology changes, it is likely
@@ -46,30 +69,34 @@ class CUDS_Adaptor:
             logger.info("Registering inputs")
 
             jsonData[SIM_TYPE_KEY] = simulation_template.name
+            if index is None:
+                index = CUDS_Index(root_cuds_object)
 
             CUDS_Adaptor.algorithmsCUDStoJSON(
                 root_cuds_object=root_cuds_object,
                 jsonData=jsonData,
+                index=index,
             )
 
             CUDS_Adaptor.inputDataCUDStoJSON(
                 root_cuds_object=root_cuds_object,
                 jsonData=jsonData,
+                index=index,
             )
 
             CUDS_Adaptor.inputAnalyticModelCUDStoJSON(
                 root_cuds_object=root_cuds_object,
                 jsonData=jsonData,
+                index=index,
             )
 
         jsonDataStr = json.dumps(jsonData)
         return jsonDataStr
 
     @staticmethod
-    def algorithmsCUDStoJSON(root_cuds_object, jsonData):
-        algorithms: List[Cuds] = search.find_cuds_objects_by_oclass(
-            mods.Algorithm, root_cuds_object, rel=None
-        )  # type: ignore
+    def algorithmsCUDStoJSON(root_cuds_object, jsonData, index=None):
+        algorithms: List[Cuds] = CUDS_Adaptor.findAll(
+            mods.Algorithm, root_cuds_object, index)
 
         logger.info("Registering simulation algorithms.")
         if not algorithms:
@@ -112,16 +139,15 @@ class CUDS_Adaptor:
             jsonData[ALGORITHMS_KEY].append(json_item)
 
     @staticmethod
-    def inputDataCUDStoJSON(root_cuds_object, jsonData):
-        dataPoints: List[Cuds] = search.find_cuds_objects_by_oclass(
-            mods.DataPoint, root_cuds_object, rel=None
-        )  # type: ignore
-        surrogateToLoad: List[Cuds] = search.find_cuds_objects_by_oclass(
-            mods.Algorithm, root_cuds_object, rel=None
-        )[0].surrogateToLoad  # type: ignore
+    def inputDataCUDStoJSON(root_cuds_object, jsonData, index=None):
+        if index is None:
+            index = CUDS_Index(root_cuds_object)
+        columns = CUDS_Adaptor.dataPointColumns(root_cuds_object, index)
 
         logger.info("Registering simulation data points.")
-        if not dataPoints and not surrogateToLoad:
+        if not columns and not CUDS_Adaptor.findAll(
+            mods.Algorithm, root_cuds_object, index
+        )[0].surrogateToLoad:  # type: ignore
             raise ValueError(
                 (
                     "Missing DataPoint specification. "
@@ -129,10 +155,34 @@ class CUDS_Adaptor:
                 )
             )
 
-        json_items = defaultdict(list)
-        for datum in dataPoints:
-            datum_items = datum.get(oclass=mods.DataPointItem)
-            if not datum_items:
+        for name, values in columns.items():
+            jsonData[INPUTS_KEY].append({'name': name, 'values': values})
+
+    @staticmethod
+    def dataPointColumns(root_cuds_object: Cuds,
+                         index: Optional[CUDS_Index] = None
+                         ) -> Dict[str, List[Any]]:
+        """Collects the DataPointItems of all DataPoints related to the root
+        into one column of values per item name.
+
+        The DataPoints are taken from the CUDS_Index of the root, in the same
+        order as findAll and Cuds.get visit them, and their items are read
+        straight from the session's RDF graph, without materialising a Cuds
+        object (and its attribute lookups) for every DataPoint and
+        DataPointItem.
+        """
+        if index is None:
+            index = CUDS_Index(root_cuds_object)
+        graph = index.graph
+        hasPart = mods.hasPart.iri
+        name, value = mods.name.iri, mods.value.iri
+        itemClasses = {oclass.iri for oclass in mods.DataPointItem.subclasses}
+
+        columns: Dict[str, List[Any]] = defaultdict(list)
+        for dataPoint in index.iris(mods.DataPoint):
+            items = [item for item in graph.objects(dataPoint, hasPart)
+                     if not itemClasses.isdisjoint(graph.objects(item, RDF.type))]
+            if not items:
                 raise ValueError(
                     (
                         "Missing DataPointItem specification. "
@@ -141,17 +191,25 @@ class CUDS_Adaptor:
                     )
                 )
 
-            for dat_item in datum_items:  # type: ignore
-                json_items[dat_item.name].append(dat_item.value)
+            for item in items:
+                itemName = graph.value(item, name)
+                if itemName is None:
+                    raise ValueError(
+                        (
+                            "Missing DataPointItem name. "
+                            "Every DataPointItem CUDS must be named."
+                        )
+                    )
+                itemValue = graph.value(item, value)
+                columns[itemName.toPython()].append(
+                    None if itemValue is None else itemValue.toPython())
 
-        for name, values in json_items.items():
-            jsonData[INPUTS_KEY].append({'name': name, 'values': values})
+        return columns
 
     @staticmethod
-    def inputAnalyticModelCUDStoJSON(root_cuds_object, jsonData):
-        analyticModels: List[Cuds] = search.find_cuds_objects_by_oclass(
-            mods.AnalyticModel, root_cuds_object, rel=None
-        )  # type: ignore
+    def inputAnalyticModelCUDStoJSON(root_cuds_object, jsonData, index=None):
+        analyticModels: List[Cuds] = CUDS_Adaptor.findAll(
+            mods.AnalyticModel, root_cuds_object, index)
 
         logger.info("Registering simulation analytic models.")
         for model in analyticModels:
@@ -163,58 +221,89 @@ class CUDS_Adaptor:
                 jsonData[INPUTS_KEY].append(
                     {'name': func_item.name, 'formula': func_item.formula})
 
+    @staticmethod
+    def analyticModel(root_cuds_object: Cuds,
+                      index: Optional[CUDS_Index] = None) -> Analytic_Model:
+        """Returns the functions of all AnalyticModels related to the root,
+        compiled for local evaluation."""
+        return Analytic_Model({
+            func_item.name: func_item.formula
+            for model in CUDS_Adaptor.findAll(
+                mods.AnalyticModel, root_cuds_object, index)
+            for func_item in model.get(oclass=mods.Function)  # type: ignore
+        })
+
+    @staticmethod
+    def evaluateAnalyticModel(root_cuds_object: Cuds) -> Dict[str, Any]:
+        """Evaluates the functions of the AnalyticModels related to the root
+        locally, on its input data points.
+
+        Arguments:
+            root_cuds_object -- Root CUDS object (e.g. the Simulation)
+
+        Returns:
+            NumPy array of the values of each function, by name
+        """
+        index = CUDS_Index(root_cuds_object)
+        columns = {
+            name: [float(value) for value in values]
+            for name, values in CUDS_Adaptor.dataPointColumns(
+                root_cuds_object, index).items()
+        }
+        return CUDS_Adaptor.analyticModel(root_cuds_object, index).evaluate(columns)
+
     @staticmethod
     def toCUDS(
-        root_cuds_object, jsonResults: Dict, simulation_template: Enum
-    ) -> None:
-        """Writes JSON output of an engine simulation into CUDS."""
+        root_cuds_object, jsonResults: Dict, simulation_template: Enum,
+        lazy: bool = False
+    ) -> Optional[Result_Table]:
+        """Writes JSON output of an engine simulation into CUDS.
+
+        If lazy is set, the output data points of MOO, MOOonly, MCDM and
+        Evaluate simulations are kept in a Result_Table instead, which builds
+        their CUDS on demand.
+
+        Returns:
+            The Result_Table holding the output data points (None unless lazy)
+        """
 
         logger.info("Converting JSON output to CUDS")
         if not jsonResults:
             logger.warning("Empty JSON output. Nothing to convert.")
-            return
+            return None
 
-        simulation = root_cuds_object.get(
-            oclass=mods.Simulation, rel=cuba.relationship)[0]
+        if root_cuds_object.is_a(mods.Simulation):
+            simulation = root_cuds_object
+        else:
+            simulation = root_cuds_object.get(
+                oclass=mods.Simulation, rel=cuba.relationship)[0]
 
+        table = None
         logger.info("Registering outputs")
-        if simulation_template in {engtempl.Engine_Template.MOO, engtempl.Engine_Template.MOOonly, engtempl.Engine_Template.MCDM}:
+        if lazy and simulation_template in {engtempl.Engine_Template.MOO,
+                                            engtempl.Engine_Template.MOOonly,
+                                            engtempl.Engine_Template.MCDM}:
+            table = Result_Table(
+                jsonResults[OUTPUTS_KEY], simulation,
+                mods.ParetoFront, mods.RankedDataPoint, ranked=True)
 
-            ParetoFront = mods.ParetoFront()
+        elif lazy and simulation_template == engtempl.Engine_Template.Evaluate:
+            table = Result_Table(
+                jsonResults[OUTPUTS_KEY], simulation,
+                mods.OutputData, mods.DataPoint)
 
-            for i in range(0 if len(jsonResults[OUTPUTS_KEY]) == 0 else len(jsonResults[OUTPUTS_KEY][0]["values"])):
-                data_point = mods.RankedDataPoint(ranking=i+1)
-                for output in jsonResults[OUTPUTS_KEY]:
-                    out_value = output["values"][i]
-                    out_name = output["name"]
+        elif simulation_template in {engtempl.Engine_Template.MOO, engtempl.Engine_Template.MOOonly, engtempl.Engine_Template.MCDM}:
 
-                    data_point.add(
-                        mods.DataPointItem(name=out_name, value=out_value),
-                        rel=mods.hasPart,
-                    )
-
-                ParetoFront.add(data_point)
+            ParetoFront = CUDS_Adaptor.buildDataPoints(
+                simulation, mods.ParetoFront, mods.RankedDataPoint,
+                jsonResults[OUTPUTS_KEY], ranked=True)
 
             simulation.add(ParetoFront)
 
         elif simulation_template == engtempl.Engine_Template.Evaluate:
-            output_data = mods.OutputData()
-
-            num_values = len(jsonResults[OUTPUTS_KEY][0]["values"])
-            for i in range(num_values):
-                data_point = mods.DataPoint()
-                for output in jsonResults[OUTPUTS_KEY]:
-                    out_value = output["values"][i]
-                    out_name = output["name"]
-
-                    data_point.add(
-                        mods.DataPointItem(name=out_name, value=out_value),
-                        rel=mods.hasPart,
-                    )
-                output_data.add(
-                    data_point,
-                    rel=mods.hasPart,
-                )
+            output_data = CUDS_Adaptor.buildDataPoints(
+                simulation, mods.OutputData, mods.DataPoint,
+                jsonResults[OUTPUTS_KEY])
 
             simulation.add(output_data)
 
@@ -244,3 +333,81 @@ class CUDS_Adaptor:
         simulation.add(job_id)
 
         logger.info("All outputs successfully registered.")
+        return table
+
+    @staticmethod
+    def buildDataPoints(
+        root_cuds_object: Cuds, container_oclass, data_point_oclass,
+        jsonOutputs: List[Dict], ranked: bool = False
+    ) -> Cuds:
+        """Builds a container (e.g. ParetoFront, OutputData) holding one data
+        point per row of the given output columns, with a DataPointItem per
+        column, in the session of the root CUDS object.
+
+        The triples of each CUDS object, including its hasPart/isPartOf
+        relationships, are assembled up front so that every object is stored
+        in the session exactly once, instead of being linked by one add() per
+        item and then copied into the session of the root.
+
+        Arguments:
+            root_cuds_object  -- CUDS object whose session the data points
+                                 are built in
+            container_oclass  -- Oclass of the container
+            data_point_oclass -- Oclass of the data points
+            jsonOutputs       -- Output columns ({'name', 'values'} dicts)
+            ranked            -- Whether to set the ranking of the data points
+                                 (1 for the first row)
+
+        Returns:
+            Container CUDS object, to be added to the root
+        """
+        session = root_cuds_object.session
+        hasPart, isPartOf = mods.hasPart.iri, mods.hasPart.inverse.iri
+        item_oclass = mods.DataPointItem
+        (name, NAME), (value, VALUE), (ranking, RANKING) = (
+            (CUDS_Adaptor._literalFactory(attribute), attribute.iri)
+            for attribute in (mods.name, mods.value, mods.ranking))
+
+        # Cuds(extra_triples=...) and CUDS_NAMESPACE_IRI are private to
+        # osp-core: this relies on osp-core==3.8.0, as pinned in setup.py.
+        # test_build_data_points checks the result against Cuds.add.
+        def store(uid: UUID, oclass, triples) -> Cuds:
+            return Cuds(attributes={}, oclass=oclass, session=session,
+                        uid=uid, extra_triples=triples)
+
+        def newIRI():
+            uid = uuid4()
+            return uid, URIRef(CUDS_NAMESPACE_IRI + str(uid))
+
+        container_uid, container = newIRI()
+        names = [name(output["name"]) for output in jsonOutputs]
+        rows = zip(*(output["values"] for output in jsonOutputs))
+
+        container_triples = []
+        for i, row in enumerate(rows):
+            data_point_uid, data_point = newIRI()
+            triples = [(data_point, isPartOf, container)]
+            if ranked:
+                triples.append((data_point, RANKING, ranking(i + 1)))
+
+            for item_name, item_value in zip(names, row):
+                item_uid, item = newIRI()
+                store(item_uid, item_oclass, [
+                    (item, NAME, item_name),
+                    (item, VALUE, value(item_value)),
+                    (item, isPartOf, data_point),
+                ])
+                triples.append((data_point, hasPart, item))
+
+            store(data_point_uid, data_point_oclass, triples)
+            container_triples.append((container, hasPart, data_point))
+
+        return store(container_uid, container_oclass, container_triples)
+
+    @staticmethod
+    def _literalFactory(attribute):
+        """Returns a function converting values to RDF literals of the given
+        attribute, resolving the attribute's datatype only once."""
+        datatype = attribute.datatype
+        python_type = get_python_datatype(datatype)[0]
+        return lambda value: Literal(python_type(value), datatype=datatype)
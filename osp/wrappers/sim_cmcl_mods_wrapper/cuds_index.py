@@ -0,0 +1,98 @@
+from osp.core.cuds import Cuds
+from osp.core.namespaces import mods, from_iri
+from osp.core.ontology.relationship import OntologyRelationship
+from rdflib import RDF, URIRef
+from collections import defaultdict
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CUDS_Index:
+    """Index of the CUDS objects related to a root CUDS object, by oclass.
+
+    The session's RDF graph is walked once, from the root, visiting the
+    objects in the same order as simple_search.find_cuds_objects_by_oclass
+    does. Every lookup (e.g. the Simulation, the Algorithms, the DataPoints
+    and the AnalyticModels of a translation) is then answered from the
+    index, and memoized, instead of walking the whole tree again.
+
+    When the root is a Simulation, only its own parts are indexed, so that
+    the simulations of a batch sharing one wrapper do not see each other's
+    data. The index is a snapshot: it is not updated when CUDS objects are
+    added to or removed from the root afterwards.
+    """
+
+    def __init__(self, root_cuds_object: Cuds):
+        """Walks the graph of the root CUDS object.
+
+        Arguments:
+            root_cuds_object -- Root CUDS object (e.g. the wrapper or the
+                                Simulation)
+        """
+        self.root = root_cuds_object
+        # Cuds._graph (the graph of the session holding the object) is
+        # private to osp-core: this relies on osp-core==3.8.0, as pinned in
+        # setup.py. test_cuds_index checks the index against simple_search.
+        self.graph = root_cuds_object._graph
+        # IRIs of the indexed objects in traversal order, and the positions
+        # of the objects of each oclass in it
+        self._iris: List[URIRef] = []
+        self._positions: Dict[URIRef, List[int]] = defaultdict(list)
+        self._found: Dict[Any, List[Cuds]] = {}
+
+        if root_cuds_object.is_a(mods.Simulation):
+            relationships = {rel.iri for rel in mods.hasPart.subclasses}
+        else:
+            relationships = None
+        isRelationship: Dict[Any, bool] = {}
+
+        def children(node):
+            for predicate, child in self.graph.predicate_objects(node):
+                if relationships is not None:
+                    if predicate in relationships:
+                        yield child
+                    continue
+                if predicate not in isRelationship:
+                    isRelationship[predicate] = isinstance(
+                        from_iri(predicate, raise_error=False),
+                        OntologyRelationship)
+                if isRelationship[predicate]:
+                    yield child
+
+        visited = set()
+        stack = [root_cuds_object.iri]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.extend(reversed(list(children(node))))
+
+            for oclass in self.graph.objects(node, RDF.type):
+                self._positions[oclass].append(len(self._iris))
+            self._iris.append(node)
+
+        logger.debug("Indexed %s CUDS objects of %s oclasses",
+                     len(self._iris), len(self._positions))
+
+    def __len__(self) -> int:
+        return len(self._iris)
+
+    def iris(self, oclass) -> List[URIRef]:
+        """Returns the IRIs of the indexed objects of the given oclass (or
+        of one of its subclasses), in traversal order."""
+        positions = set()
+        for subclass in oclass.subclasses:
+            positions.update(self._positions.get(subclass.iri, ()))
+        return [self._iris[position] for position in sorted(positions)]
+
+    def find(self, oclass) -> List[Cuds]:
+        """Returns the indexed CUDS objects of the given oclass (or of one of
+        its subclasses), in traversal order."""
+        if oclass not in self._found:
+            iris = self.iris(oclass)
+            self._found[oclass] = (
+                list(self.root.session.load_from_iri(*iris)) if iris else [])
+        return list(self._found[oclass])
@@ -0,0 +1,374 @@
+import asyncio
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, Optional, Tuple
+import logging
+from osp.wrappers.sim_cmcl_mods_wrapper.agent_bridge import Agent_Bridge
+from osp.wrappers.sim_cmcl_mods_wrapper.async_agent_bridge import Async_Agent_Bridge
+from osp.wrappers.sim_cmcl_mods_wrapper.job_events import FINAL_STATES, Job_State
+from osp.wrappers.sim_cmcl_mods_wrapper.job_journal import Job_Journal
+from osp.wrappers.sim_cmcl_mods_wrapper.polling_strategies import (
+    Polling_Strategy, Fixed_Polling)
+from osp.wrappers.sim_cmcl_mods_wrapper.result_cache import Result_Cache
+
+try:
+    from importlib.metadata import entry_points
+except ImportError:
+    entry_points = None
+
+logger = logging.getLogger(__name__)
+
+
+class Backend_Metrics:
+    """Latency and throughput of the jobs run by an Execution_Backend."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._first_start: Optional[float] = None
+        self._last_end: Optional[float] = None
+
+    def start(self) -> float:
+        """Records the start of a job.
+
+        Returns:
+            Start time of the job, to pass to finish()
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+            if self._first_start is None:
+                self._first_start = started
+        return started
+
+    def finish(self, started: float, success: bool) -> None:
+        """Records the end of a job.
+
+        Arguments:
+            started -- Start time of the job returned by start()
+            success -- Whether the job returned results
+        """
+        ended = time.perf_counter()
+        latency = ended - started
+        with self._lock:
+            if success:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self._last_end = ended
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns the job counts, the mean and maximum latency of the jobs
+        (seconds), and the throughput (jobs completed per second between the
+        first start and the last end of a job)."""
+        with self._lock:
+            finished = self.completed + self.failed
+            elapsed = (self._last_end - self._first_start
+                       if self._last_end is not None else 0.0)
+            return dict(
+                submitted=self.submitted,
+                completed=self.completed,
+                failed=self.failed,
+                mean_latency=self.total_latency / finished if finished else 0.0,
+                max_latency=self.max_latency,
+                throughput=self.completed / elapsed if elapsed > 0 else 0.0,
+            )
+
+
+class Execution_Backend(ABC):
+    """Base class of the backends running the jobs of a MoDS_Session.
+
+    A backend submits the input JSON of a simulation as a job, polls the
+    state of the job, and fetches its results. run() does all three,
+    waiting between polls as given by the polling strategy, and may be
+    overridden by backends having a more direct way to run a job.
+
+    Backends are registered by name with register(), or under the
+    "sim_cmcl_mods_wrapper.backends" entry point group, and created by
+    name with create().
+    """
+
+    # Name under which the backend is registered
+    NAME: str = ""
+
+    # Strategy deciding the waits between polls in run()
+    POLLING_STRATEGY: Polling_Strategy = Fixed_Polling(0.05, 72000)
+
+    # Environment variable giving the backend used by default
+    BACKEND_ENV_VAR: str = "MODS_EXECUTION_BACKEND"
+
+    # Entry point group of the backends provided by other packages
+    ENTRY_POINT_GROUP: str = "sim_cmcl_mods_wrapper.backends"
+
+    _registry: Dict[str, Callable[..., "Execution_Backend"]] = {}
+
+    def __init__(self):
+        self.metrics = Backend_Metrics()
+
+    @abstractmethod
+    def submit(self, jsonSimCase: str, template) -> Optional[str]:
+        """Submits a job.
+
+        Arguments:
+            jsonSimCase (str) -- Input JSON of the simulation
+            template          -- Engine_Template of the simulation
+
+        Returns:
+            ID of the job (None if it could not be submitted)
+        """
+
+    @abstractmethod
+    def poll(self, jobID: str) -> Job_State:
+        """Returns the current state of a job."""
+
+    @abstractmethod
+    def fetch(self, jobID: str) -> Optional[Dict]:
+        """Returns the results of a finished job, and forgets the job.
+
+        Returns:
+            Resulting JSON data objects (None if the job failed)
+        """
+
+    @abstractmethod
+    def cancel(self, jobID: str) -> None:
+        """Cancels a job, and forgets it."""
+
+    def close(self) -> None:
+        """Releases the resources held by the backend."""
+
+    def pollingDelays(self, template) -> Iterator[float]:
+        """Returns the waits (seconds) between the polls of a new job."""
+        return self.POLLING_STRATEGY.delays()
+
+    def run(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Runs a job until it finishes.
+
+        Arguments:
+            jsonSimCase (str) -- Input JSON of the simulation
+            template          -- Engine_Template of the simulation
+
+        Returns:
+            Resulting JSON data objects (None if the job failed)
+        """
+        jobID = self.submit(jsonSimCase, template)
+        if jobID is None:
+            logger.error("Job was not submitted successfully")
+            return None
+
+        delays = self.pollingDelays(template)
+        while True:
+            state = self.poll(jobID)
+            if state in FINAL_STATES:
+                break
+            delay = next(delays, None)
+            if delay is None:
+                logger.warning(
+                    "Polling strategy exhausted, considering job a failure.")
+                self.cancel(jobID)
+                return None
+            time.sleep(delay)
+        return self.fetch(jobID)
+
+    async def arun(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Awaitable counterpart of run(), running it in the default
+        executor of the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run, jsonSimCase, template)
+
+    def execute(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Runs a job, recording its latency in the metrics of the backend."""
+        started = self.metrics.start()
+        jsonResults = None
+        try:
+            jsonResults = self.run(jsonSimCase, template)
+        finally:
+            self.metrics.finish(started, jsonResults is not None)
+        return jsonResults
+
+    async def aexecute(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Awaitable counterpart of execute()."""
+        started = self.metrics.start()
+        jsonResults = None
+        try:
+            jsonResults = await self.arun(jsonSimCase, template)
+        finally:
+            self.metrics.finish(started, jsonResults is not None)
+        return jsonResults
+
+    @classmethod
+    def register(cls, name: str,
+                 factory: Callable[..., "Execution_Backend"]) -> None:
+        """Registers a backend class (or factory) under a name."""
+        cls._registry[name] = factory
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, **options) -> "Execution_Backend":
+        """Creates a backend by name.
+
+        Arguments:
+            name    -- Name of the backend (defaults to the value of the
+                       MODS_EXECUTION_BACKEND environment variable, or
+                       "http")
+            options -- Keyword arguments of the backend
+
+        Returns:
+            The new backend
+        """
+        if name is None:
+            name = os.environ.get(cls.BACKEND_ENV_VAR, HTTP_Backend.NAME)
+        if name not in cls._registry:
+            cls._loadEntryPoint(name)
+        if name not in cls._registry:
+            raise ValueError(f"Unknown execution backend: {name}")
+        return cls._registry[name](**options)
+
+    @classmethod
+    def _loadEntryPoint(cls, name: str) -> None:
+        if entry_points is None:
+            return
+        points = entry_points()
+        if hasattr(points, "select"):
+            points = points.select(group=cls.ENTRY_POINT_GROUP)
+        else:
+            points = points.get(cls.ENTRY_POINT_GROUP, [])
+        for point in points:
+            if point.name == name:
+                cls.register(name, point.load())
+                return
+
+
+class HTTP_Backend(Execution_Backend):
+    """Runs jobs on the MoDS Agent, with an Agent_Bridge per job (or an
+    Async_Agent_Bridge when run from a coroutine)."""
+
+    NAME = "http"
+
+    def __init__(self, polling_strategy=None,
+                 journal: Optional[Job_Journal] = None, **bridge_options):
+        """Initialises the backend.
+
+        Arguments:
+            polling_strategy -- Polling_Strategy of the bridges, or a
+                                dictionary giving the strategy per
+                                Engine_Template (defaults to Agent_Bridge's)
+            journal          -- Job_Journal recording the jobs, so that
+                                running a simulation whose job is still
+                                unfinished waits for that job instead of
+                                submitting a new one (None to always submit)
+            bridge_options   -- Other keyword arguments of the bridges
+        """
+        super().__init__()
+        self.polling_strategy = polling_strategy
+        self.journal = journal
+        self.bridge_options = bridge_options
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Tuple[Agent_Bridge, Optional[Dict]]] = {}
+
+    def newBridge(self, bridge_class, template) -> Agent_Bridge:
+        """Creates a bridge running a job of the given template.
+
+        Arguments:
+            bridge_class -- Agent_Bridge or Async_Agent_Bridge
+            template     -- Engine_Template of the simulation to run
+        """
+        polling_strategy = self.polling_strategy
+        if isinstance(polling_strategy, dict):
+            polling_strategy = polling_strategy.get(template)
+        return bridge_class(polling_strategy=polling_strategy,
+                            **self.bridge_options)
+
+    def pollingDelays(self, template) -> Iterator[float]:
+        return self.newBridge(Agent_Bridge, template).pollingDelays()
+
+    def submit(self, jsonSimCase: str, template) -> Optional[str]:
+        bridge = self.newBridge(Agent_Bridge, template)
+        if self.journal is not None:
+            bridge.addListener(self.journal.listener(
+                Result_Cache.key(jsonSimCase, template), template))
+        os.environ['NO_PROXY'] = bridge.base_url
+        submit_message = bridge.submitJob(jsonSimCase)
+        if submit_message is None:
+            return None
+        outputs = None
+        if not bridge.acceptSubmission(submit_message):
+            outputs = bridge.finishJob(submit_message)
+        with self._lock:
+            self._jobs[bridge.jobID] = (bridge, outputs)
+        return bridge.jobID
+
+    def poll(self, jobID: str) -> Job_State:
+        with self._lock:
+            bridge, outputs = self._jobs[jobID]
+        if bridge.state in FINAL_STATES:
+            return bridge.state
+
+        bridge.attempts += 1
+        finished, returnedJSON = bridge.handleOutputResponse(
+            *bridge.fetchOutputs(bridge.buildOutputURL()))
+        if not finished:
+            return Job_State.RUNNING
+
+        outputs = bridge.checkOutputs(returnedJSON)
+        with self._lock:
+            self._jobs[jobID] = (bridge, outputs)
+        bridge.finishJob(outputs, bridge.attempts)
+        return bridge.state
+
+    def fetch(self, jobID: str) -> Optional[Dict]:
+        with self._lock:
+            _, outputs = self._jobs.pop(jobID)
+        return outputs
+
+    def cancel(self, jobID: str) -> None:
+        with self._lock:
+            bridge, _ = self._jobs.pop(jobID, (None, None))
+        if bridge is not None:
+            bridge.cancel()
+            bridge.finishJob(None, bridge.attempts)
+
+    def run(self, jsonSimCase: str, template) -> Optional[Dict]:
+        bridge = self.newBridge(Agent_Bridge, template)
+        if self.journal is None:
+            return bridge.runJob(jsonSimCase)
+
+        key = Result_Cache.key(jsonSimCase, template)
+        jobID = self.journal.find(key)
+        if jobID is not None:
+            bridge.addListener(self.journal.listener(key, template))
+            outputs = bridge.resumeJob(jobID)
+            if outputs is not None or bridge.isCancelled():
+                return outputs
+            logger.warning("Could not resume job %s, submitting it again", jobID)
+            bridge = self.newBridge(Agent_Bridge, template)
+
+        bridge.addListener(self.journal.listener(key, template))
+        return bridge.runJob(jsonSimCase)
+
+    async def arun(self, jsonSimCase: str, template) -> Optional[Dict]:
+        bridge = self.newBridge(Async_Agent_Bridge, template)
+        if self.journal is None:
+            return await bridge.runJob(jsonSimCase)
+
+        key = Result_Cache.key(jsonSimCase, template)
+        jobID = self.journal.find(key)
+        if jobID is not None:
+            bridge.addListener(self.journal.listener(key, template))
+            outputs = await bridge.resumeJob(jobID)
+            if outputs is not None or bridge.isCancelled():
+                return outputs
+            logger.warning("Could not resume job %s, submitting it again", jobID)
+            bridge = self.newBridge(Async_Agent_Bridge, template)
+
+        bridge.addListener(self.journal.listener(key, template))
+        return await bridge.runJob(jsonSimCase)
+
+
+Execution_Backend.register(HTTP_Backend.NAME, HTTP_Backend)
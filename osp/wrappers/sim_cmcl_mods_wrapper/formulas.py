@@ -0,0 +1,196 @@
+import ast
+import json
+import operator
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Mapping, Sequence
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+INPUTS_KEY = "Inputs"
+
+# Functions allowed in formulas
+FUNCTIONS: Dict[str, Callable] = {
+    "exp": np.exp,
+    "log": np.log,
+    "ln": np.log,
+    "log10": np.log10,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "pow": np.power,
+    "min": np.minimum,
+    "max": np.maximum,
+}
+
+# Named constants allowed in formulas
+CONSTANTS: Dict[str, float] = {"pi": np.pi, "e": np.e}
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+class Formula:
+    """Formula of an AnalyticModel Function (e.g. "exp(var1)-var2/2.0"),
+    compiled for evaluation with NumPy over whole columns of values.
+
+    Formulas are parsed into a tree of NumPy operations once; only numbers,
+    variables, the arithmetic operators, and the FUNCTIONS and CONSTANTS
+    above are accepted, so that evaluating a formula cannot run arbitrary
+    code.
+    """
+
+    def __init__(self, text: str):
+        """Compiles a formula.
+
+        Arguments:
+            text -- Formula
+
+        Raises:
+            ValueError -- If the formula is invalid
+        """
+        self.text = text
+        try:
+            # "^" is a power in the formula language
+            tree = ast.parse(text.strip().replace("^", "**"), mode="eval")
+        except SyntaxError as error:
+            raise ValueError(f"Invalid formula {text!r}: {error.msg}") from error
+        variables = set()
+        self._evaluate = self._compile(tree.body, variables)
+        self.variables: FrozenSet[str] = frozenset(variables)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def compile(text: str) -> "Formula":
+        """Returns the compiled formula, compiling each formula text once."""
+        return Formula(text)
+
+    def evaluate(self, columns: Mapping[str, Sequence]) -> np.ndarray:
+        """Evaluates the formula.
+
+        Arguments:
+            columns -- Values of the variables of the formula, by name
+
+        Returns:
+            Value of the formula for each row of the columns
+        """
+        missing = self.variables.difference(columns)
+        if missing:
+            raise ValueError(
+                f"Missing variables in formula {self.text!r}: "
+                f"{', '.join(sorted(missing))}")
+        values = {name: np.asarray(columns[name], dtype=float)
+                  for name in self.variables}
+        return np.asarray(self._evaluate(values), dtype=float)
+
+    def _compile(self, node: ast.AST, variables: set) -> Callable:
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            value = float(node.value)
+            return lambda values: value
+
+        if isinstance(node, ast.Name):
+            if node.id in CONSTANTS:
+                value = CONSTANTS[node.id]
+                return lambda values: value
+            name = node.id
+            variables.add(name)
+            return lambda values: values[name]
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            op = _BINARY_OPERATORS[type(node.op)]
+            left = self._compile(node.left, variables)
+            right = self._compile(node.right, variables)
+            return lambda values: op(left(values), right(values))
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            op = _UNARY_OPERATORS[type(node.op)]
+            operand = self._compile(node.operand, variables)
+            return lambda values: op(operand(values))
+
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in FUNCTIONS and not node.keywords):
+            function = FUNCTIONS[node.func.id]
+            arguments = [self._compile(arg, variables) for arg in node.args]
+            return lambda values: function(*(arg(values) for arg in arguments))
+
+        raise ValueError(
+            f"Unsupported expression in formula {self.text!r}: "
+            f"{ast.dump(node)}")
+
+
+class Analytic_Model:
+    """Set of named formulas, evaluated locally on the input data of a
+    simulation."""
+
+    def __init__(self, functions: Mapping[str, str]):
+        """Initialises the model.
+
+        Arguments:
+            functions -- Formula of each output, by name
+        """
+        self.formulas: Dict[str, Formula] = {
+            name: Formula.compile(text) for name, text in functions.items()}
+
+    def evaluate(self, columns: Mapping[str, Sequence]) -> Dict[str, np.ndarray]:
+        """Evaluates the formulas. A formula may use the outputs of the
+        formulas before it.
+
+        Arguments:
+            columns -- Input values, by name
+
+        Returns:
+            Values of each output, by name
+        """
+        available = dict(columns)
+        outputs = {}
+        for name, formula in self.formulas.items():
+            outputs[name] = available[name] = formula.evaluate(available)
+        return outputs
+
+    @staticmethod
+    def fromJSON(jsonSimCase: str) -> "Analytic_Model":
+        """Returns the model made of the formulas of the input JSON of a
+        simulation."""
+        return Analytic_Model({
+            input["name"]: input["formula"]
+            for input in json.loads(jsonSimCase).get(INPUTS_KEY, [])
+            if "formula" in input})
+
+    def prefill(self, jsonSimCase: str) -> str:
+        """Replaces the formulas of the input JSON of a simulation with the
+        columns of values they evaluate to on its input data.
+
+        Arguments:
+            jsonSimCase (str) -- Input JSON of the simulation
+
+        Returns:
+            Input JSON holding values instead of formulas
+        """
+        simCase = json.loads(jsonSimCase)
+        inputs: List[Dict] = simCase.get(INPUTS_KEY, [])
+        columns = {input["name"]: input["values"]
+                   for input in inputs if "values" in input}
+        outputs = self.evaluate(columns)
+
+        for input in inputs:
+            if "formula" in input and input["name"] in outputs:
+                del input["formula"]
+                input["values"] = outputs[input["name"]].tolist()
+        logger.info("Evaluated %s formulas locally", len(outputs))
+        return json.dumps(simCase)
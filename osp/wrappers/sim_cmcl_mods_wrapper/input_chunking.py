@@ -0,0 +1,91 @@
+import json
+from array import array
+from typing import Dict, List, Optional
+import logging
+from osp.wrappers.sim_cmcl_mods_wrapper.json_decoding import typedColumn
+
+logger = logging.getLogger(__name__)
+
+INPUTS_KEY = "Inputs"
+OUTPUTS_KEY = "Outputs"
+
+
+class Input_Chunker:
+    """Splits the input JSON of a simulation into chunks of at most
+    chunk_size data points, each one submitted as its own MoDS job, and
+    stitches the outputs of these jobs back together in the original order.
+    """
+
+    def __init__(self, chunk_size: int):
+        """Initialises the chunker.
+
+        Arguments:
+            chunk_size -- Maximum number of data points per job
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be at least 1")
+        self.chunk_size = chunk_size
+
+    def split(self, jsonSimCase: str) -> List[str]:
+        """Splits the input JSON of a simulation.
+
+        Arguments:
+            jsonSimCase (str) -- Input JSON of the simulation
+
+        Returns:
+            Input JSON of each chunk, sharing everything but the data points
+            (just the input JSON if it does not need splitting). Inputs
+            without values, i.e. AnalyticModel formulas, are copied to every
+            chunk unchanged
+        """
+        simCase = json.loads(jsonSimCase)
+        inputs = simCase.get(INPUTS_KEY, [])
+        num_points = max((len(input["values"]) for input in inputs
+                          if "values" in input), default=0)
+        if num_points <= self.chunk_size:
+            return [jsonSimCase]
+
+        chunks = []
+        for start in range(0, num_points, self.chunk_size):
+            simCase[INPUTS_KEY] = [
+                {**input, "values": input["values"][start:start + self.chunk_size]}
+                if "values" in input else input
+                for input in inputs
+            ]
+            chunks.append(json.dumps(simCase))
+        logger.info("Split %s data points into %s jobs", num_points, len(chunks))
+        return chunks
+
+    def stitch(self, chunkResults: List[Optional[Dict]]) -> Optional[Dict]:
+        """Concatenates the output columns of the jobs of a split simulation.
+
+        Arguments:
+            chunkResults -- JSON results of each chunk, in order
+
+        Returns:
+            JSON results of the simulation, with the job IDs of the chunks
+            separated by commas (None if any chunk failed)
+        """
+        if any(results is None for results in chunkResults):
+            logger.error("%s of %s chunk jobs failed",
+                         sum(results is None for results in chunkResults),
+                         len(chunkResults))
+            return None
+        if len(chunkResults) == 1:
+            return chunkResults[0]
+
+        stitched = dict(chunkResults[0])
+        stitched["jobID"] = ",".join(
+            str(results["jobID"]) for results in chunkResults)
+
+        columns: Dict[str, List] = {}
+        typed = False
+        for results in chunkResults:
+            for output in results.get(OUTPUTS_KEY, []):
+                typed = typed or isinstance(output["values"], array)
+                columns.setdefault(output["name"], []).extend(output["values"])
+        stitched[OUTPUTS_KEY] = [
+            {"name": name, "values": typedColumn(values) if typed else values}
+            for name, values in columns.items()
+        ]
+        return stitched
@@ -0,0 +1,28 @@
+from enum import Enum
+from typing import Callable, NamedTuple, Optional
+
+
+class Job_State(Enum):
+    """States of a MoDS job, as seen by the Agent_Bridge running it."""
+    SUBMITTED = 1
+    RUNNING = 2
+    DONE = 3
+    FAILED = 4
+    CANCELLED = 5
+
+
+# States after which a job does not change anymore
+FINAL_STATES = {Job_State.DONE, Job_State.FAILED, Job_State.CANCELLED}
+
+
+class Job_Event(NamedTuple):
+    """State transition of a MoDS job."""
+    # ID of the job (None if it was never submitted)
+    jobID: Optional[str]
+    # New state of the job
+    state: Job_State
+    # Number of output requests made so far
+    attempt: int = 0
+
+
+Job_Listener = Callable[[Job_Event], None]
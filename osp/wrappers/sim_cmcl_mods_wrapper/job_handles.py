@@ -0,0 +1,192 @@
+import concurrent.futures
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import logging
+from osp.core.cuds import Cuds
+from osp.wrappers.sim_cmcl_mods_wrapper.job_events import (
+    Job_Event, Job_Listener, Job_State)
+
+logger = logging.getLogger(__name__)
+
+
+class Job_Handle:
+    """Future-like handle of a simulation submitted with
+    MoDS_Session.submit().
+
+    The job runs in the background once submitted. result() waits for it
+    and writes its results back to the simulation CUDS, in the calling
+    thread, the first time it is called.
+    """
+
+    def __init__(self, session, simulation: Cuds, template):
+        """Initialises the handle.
+
+        Arguments:
+            session    -- MoDS_Session running the job
+            simulation -- Simulation CUDS object of the session
+            template   -- Engine_Template of the simulation
+        """
+        self.simulation = simulation
+        self.template = template
+        # ID of the job (None until submitted, or if it never runs remotely)
+        self.jobID: Optional[str] = None
+        # Current state of the job (None until submitted)
+        self.state: Optional[Job_State] = None
+        self._session = session
+        self._future: Future = Future()
+        self._listeners: List[Job_Listener] = []
+        self._cancelRequested = threading.Event()
+        # Whether the job has started and can no longer be cancelled
+        self._uncancellable = False
+        self._lock = threading.Lock()
+        self._parsed = False
+
+    def __repr__(self) -> str:
+        return f"<Job_Handle {self.jobID} {getattr(self.state, 'name', None)}>"
+
+    def addListener(self, listener: Job_Listener) -> None:
+        """Registers a callable receiving a Job_Event on every state
+        transition of the job."""
+        self._listeners.append(listener)
+
+    def add_done_callback(self, callback: Callable[["Job_Handle"], None]) -> None:
+        """Registers a callable called with the handle once the job has
+        finished (immediately if it already has)."""
+        self._future.add_done_callback(lambda _: callback(self))
+
+    def done(self) -> bool:
+        """Returns true if the job has finished, successfully or not."""
+        return self._future.done()
+
+    def cancelled(self) -> bool:
+        """Returns true if the job was cancelled."""
+        return self.state == Job_State.CANCELLED
+
+    def cancel(self) -> bool:
+        """Stops waiting for the job, which is reported as CANCELLED, and
+        cancels it on the execution backend. Note that the HTTP backend only
+        stops polling: the remote job keeps running on the agent.
+
+        Shared (coalesced) and split (chunked) jobs cannot be cancelled once
+        they have started.
+
+        Returns:
+            False if the job has already finished or cannot be cancelled
+        """
+        with self._lock:
+            if self.done() or self._uncancellable:
+                return False
+            self._cancelRequested.set()
+            return True
+
+    def startUncancellable(self) -> bool:
+        """Records that the job starts and can no longer be cancelled.
+
+        Returns:
+            False if the job was cancelled before starting
+        """
+        with self._lock:
+            if self._cancelRequested.is_set():
+                return False
+            self._uncancellable = True
+            return True
+
+    def isCancelRequested(self) -> bool:
+        """Returns true if cancel() was called."""
+        return self._cancelRequested.is_set()
+
+    def waitForCancel(self, timeout: float) -> bool:
+        """Waits up to timeout seconds, returning early (and true) if the
+        job is cancelled."""
+        return self._cancelRequested.wait(timeout)
+
+    def result(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Waits for the job and writes its results back to the simulation
+        CUDS (once).
+
+        Arguments:
+            timeout -- Maximum time to wait (seconds, None for no limit)
+
+        Returns:
+            Resulting JSON data objects (None if the job failed or was
+            cancelled)
+
+        Raises:
+            concurrent.futures.TimeoutError -- If the job is not finished
+                                               within the timeout
+        """
+        jsonResults = self._future.result(timeout)
+        with self._lock:
+            if not self._parsed:
+                self._parsed = True
+                if jsonResults is not None:
+                    self._session._parseSubmitted(self, jsonResults)
+        return jsonResults
+
+    def setState(self, state: Job_State, attempt: int = 0) -> None:
+        """Records a state transition of the job and notifies the listeners
+        (nothing happens if the job is already in that state)."""
+        if state == self.state:
+            return
+        self.state = state
+        event = Job_Event(self.jobID, state, attempt)
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.exception("Job listener failed on %s", event)
+
+    def finish(self, jsonResults: Optional[Dict], attempt: int = 0) -> None:
+        """Records the end of the job given its results (None in case of
+        failure or cancellation)."""
+        if jsonResults is not None:
+            self.setState(Job_State.DONE, attempt)
+        elif self.isCancelRequested():
+            self.setState(Job_State.CANCELLED, attempt)
+        else:
+            self.setState(Job_State.FAILED, attempt)
+        self._future.set_result(jsonResults)
+
+    def fail(self, error: BaseException) -> None:
+        """Records the end of the job on an unexpected error, raised again
+        by result()."""
+        self.setState(Job_State.FAILED)
+        self._future.set_exception(error)
+
+
+def as_completed(handles: Iterable[Job_Handle],
+                 timeout: Optional[float] = None) -> Iterator[Job_Handle]:
+    """Yields the handles as their jobs finish.
+
+    Arguments:
+        handles -- Handles returned by MoDS_Session.submit()
+        timeout -- Maximum time to wait for all jobs (seconds, None for no
+                   limit)
+
+    Raises:
+        concurrent.futures.TimeoutError -- If the jobs are not all finished
+                                           within the timeout
+    """
+    futures = {handle._future: handle for handle in handles}
+    for future in concurrent.futures.as_completed(futures, timeout):
+        yield futures[future]
+
+
+def wait_any(handles: Iterable[Job_Handle],
+             timeout: Optional[float] = None) -> Optional[Job_Handle]:
+    """Waits until one of the jobs has finished.
+
+    Arguments:
+        handles -- Handles returned by MoDS_Session.submit()
+        timeout -- Maximum time to wait (seconds, None for no limit)
+
+    Returns:
+        The first finished handle, in the given order (None if none has
+        finished within the timeout)
+    """
+    handles = list(handles)
+    done, _ = concurrent.futures.wait(
+        [handle._future for handle in handles], timeout,
+        return_when=concurrent.futures.FIRST_COMPLETED)
+    return next((handle for handle in handles if handle._future in done), None)
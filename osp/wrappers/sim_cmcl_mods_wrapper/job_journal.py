@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import threading
+import time
+from enum import Enum
+from typing import Dict, List, Optional
+import logging
+from osp.wrappers.sim_cmcl_mods_wrapper.job_events import (
+    FINAL_STATES, Job_Event, Job_Listener, Job_State)
+
+logger = logging.getLogger(__name__)
+
+
+class Job_Journal:
+    """On-disk journal of the jobs submitted to the MoDS Agent, so that a
+    job still running when the client stops can be waited for again instead
+    of being resubmitted.
+
+    Jobs are recorded in a sqlite database under the key of their input
+    JSON and template (see Result_Cache.key), with their job ID and latest
+    state. A bridge records the transitions of its job through the
+    listener().
+    """
+
+    # Name of the sqlite database within the journal directory
+    DATABASE_NAME: str = "mods_jobs.sqlite"
+
+    def __init__(self, directory: str, max_age: Optional[float] = 86400.0):
+        """Initialises the journal.
+
+        Arguments:
+            directory -- Directory of the journal database
+            max_age   -- Age (seconds) after which unfinished jobs are not
+                         resumed anymore (None for no limit)
+        """
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._database = sqlite3.connect(
+            os.path.join(directory, self.DATABASE_NAME),
+            check_same_thread=False)
+        self._database.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "key TEXT PRIMARY KEY, jobID TEXT, template TEXT, state TEXT, "
+            "submitted REAL, updated REAL)")
+        self._database.commit()
+
+    def record(self, key: str, jobID: str, template: Optional[Enum],
+               state: Job_State = Job_State.SUBMITTED) -> None:
+        """Records a newly submitted job, replacing any job recorded under
+        the same key.
+
+        Arguments:
+            key (str)          -- Key of the input JSON and template
+            jobID (str)        -- ID of the job
+            template (Enum)    -- Template of the simulation
+            state (Job_State)  -- State of the job
+        """
+        now = time.time()
+        with self._lock:
+            self._database.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?)",
+                (key, jobID, getattr(template, "name", None), state.name,
+                 now, now))
+            self._database.commit()
+
+    def update(self, key: str, state: Job_State) -> None:
+        """Records a new state of the job recorded under a key."""
+        with self._lock:
+            self._database.execute(
+                "UPDATE jobs SET state = ?, updated = ? WHERE key = ?",
+                (state.name, time.time(), key))
+            self._database.commit()
+
+    def find(self, key: str) -> Optional[str]:
+        """Returns the ID of the unfinished job recorded under a key.
+
+        Arguments:
+            key (str) -- Key of the input JSON and template
+
+        Returns:
+            ID of the job (None if there is no such job, or if it is too old
+            to be resumed)
+        """
+        with self._lock:
+            row = self._database.execute(
+                "SELECT jobID, state, submitted FROM jobs WHERE key = ?",
+                (key,)).fetchone()
+        if row is None or Job_State[row[1]] in FINAL_STATES:
+            return None
+        if self.max_age is not None and time.time() - row[2] > self.max_age:
+            return None
+        return row[0]
+
+    def pending(self) -> List[Dict]:
+        """Returns the unfinished jobs of the journal, oldest first."""
+        with self._lock:
+            rows = self._database.execute(
+                "SELECT key, jobID, template, state, submitted, updated "
+                "FROM jobs ORDER BY submitted").fetchall()
+        return [
+            dict(key=key, jobID=jobID, template=template,
+                 state=Job_State[state], submitted=submitted, updated=updated)
+            for key, jobID, template, state, submitted, updated in rows
+            if Job_State[state] not in FINAL_STATES
+        ]
+
+    def listener(self, key: str, template: Optional[Enum]) -> Job_Listener:
+        """Returns a listener recording the transitions of a bridge's job
+        under the given key."""
+        def recordEvent(event: Job_Event) -> None:
+            if event.state == Job_State.SUBMITTED and event.jobID is not None:
+                self.record(key, event.jobID, template, event.state)
+            else:
+                self.update(key, event.state)
+        return recordEvent
+
+    def close(self) -> None:
+        """Closes the journal database."""
+        with self._lock:
+            self._database.close()
@@ -0,0 +1,231 @@
+import json
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# Key of the output columns in the results of a job
+OUTPUTS_KEY = "Outputs"
+
+
+def _toList(value):
+    if isinstance(value, array):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Json_Backend:
+    """JSON encoder/decoder used for the messages exchanged with the MoDS
+    Agent. The standard json module is used by default; orjson and ujson,
+    when installed, can be selected by name. They decode faster, but orjson
+    has a peak memory about three times higher than the standard module on
+    large results (see benchmarks/json_decoding.py), and neither encodes
+    NaN as the standard module does.
+    """
+
+    # Supported backends
+    BACKENDS = ("json", "orjson", "ujson")
+
+    # Backend used by default (created on first use)
+    _default: Optional["Json_Backend"] = None
+
+    def __init__(self, name: Optional[str] = None):
+        """Initialises the backend.
+
+        Arguments:
+            name -- "json", "orjson" or "ujson" (defaults to "json")
+        """
+        modules = dict(orjson=orjson, ujson=ujson, json=json)
+        if name is None:
+            name = "json"
+        if name not in modules:
+            raise ValueError(f"Unsupported JSON backend: {name}")
+        if modules[name] is None:
+            raise ValueError(f"The {name} JSON backend is not installed")
+        self.name = name
+
+    @classmethod
+    def default(cls) -> "Json_Backend":
+        """Returns the default (standard json module) backend."""
+        if Json_Backend._default is None:
+            Json_Backend._default = cls()
+        return Json_Backend._default
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        """Decodes a JSON document (bytes are decoded as UTF-8)."""
+        if self.name == "orjson":
+            return orjson.loads(data)
+        if self.name == "ujson":
+            return ujson.loads(bytes(data) if isinstance(data, bytearray) else data)
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        """Encodes a value, including typed output columns, to JSON."""
+        if self.name == "orjson":
+            return orjson.dumps(value, default=_toList).decode("utf-8")
+        if self.name == "ujson":
+            return ujson.dumps(value, default=_toList)
+        return json.dumps(value, default=_toList)
+
+
+def typedColumn(values: Iterable) -> Union[array, List]:
+    """Converts the values of an output column to a typed array: 64-bit
+    integers if all values are integers, doubles if they are all numbers.
+    Other columns are returned as a list.
+    """
+    values = values if isinstance(values, list) else list(values)
+    if all(type(value) is int for value in values):
+        try:
+            return array("q", values)
+        except OverflowError:
+            return values
+    if all(type(value) in (int, float) for value in values):
+        return array("d", values)
+    return values
+
+
+class Results_Decoder:
+    """Decodes the results of a job from the chunks of the response body.
+
+    With typed_outputs, the values of each output column are decoded into
+    a typed array (see typedColumn). When ijson is installed (the
+    "streaming" extra) this is done incrementally: the body is never held
+    in memory and the values of one column at a time are held as Python
+    objects. Otherwise the body is read in full and decoded at once, with
+    the same peak memory as decoding the response text.
+    """
+
+    def __init__(self, backend: Optional[Json_Backend] = None,
+                 typed_outputs: bool = False):
+        """Initialises the decoder.
+
+        Arguments:
+            backend       -- JSON backend used to decode the body when it is
+                             not decoded incrementally (defaults to
+                             Json_Backend.default())
+            typed_outputs -- Whether to decode output columns to typed arrays
+        """
+        self.backend = backend or Json_Backend.default()
+        self.typed_outputs = typed_outputs
+
+    def decode(self, chunks: Iterable[bytes]) -> Dict:
+        """Decodes the results of a job.
+
+        Arguments:
+            chunks -- Chunks of the response body
+
+        Returns:
+            JSON results of the job
+        """
+        if self.typed_outputs and ijson is not None:
+            return self._decodeIncrementally(chunks)
+
+        body = b"".join(chunks)
+        results = self.backend.loads(body)
+        del body
+
+        if self.typed_outputs and isinstance(results, dict):
+            outputs = results.get(OUTPUTS_KEY)
+            for output in outputs if isinstance(outputs, list) else ():
+                if isinstance(output, dict) and isinstance(
+                        output.get("values"), list):
+                    output["values"] = typedColumn(output["values"])
+        return results
+
+    def _decodeIncrementally(self, chunks: Iterable[bytes]) -> Dict:
+        OUTPUTS, OUTPUT = OUTPUTS_KEY, OUTPUTS_KEY + ".item"
+        VALUES, VALUE = OUTPUT + ".values", OUTPUT + ".values.item"
+        END_EVENTS = ("end_map", "end_array")
+
+        # Builders of the results (with a placeholder for the output
+        # columns), of the current output and of a container nested in the
+        # values of its column
+        builder = ijson.ObjectBuilder()
+        item: Optional[ijson.ObjectBuilder] = None
+        nested: Optional[ijson.ObjectBuilder] = None
+        outputs: Optional[List] = None
+        column: Optional[List] = None
+        inOutputs = inColumn = False
+
+        for prefix, event, value in ijson.parse(_Chunk_Reader(chunks),
+                                                use_float=True):
+            if not inOutputs:
+                builder.event(event, value)
+                if prefix == OUTPUTS and event == "start_array":
+                    # The array itself is replaced once it is decoded
+                    builder.event("end_array", None)
+                    inOutputs, outputs = True, []
+            elif nested is not None:
+                nested.event(event, value)
+                if prefix == VALUE and event in END_EVENTS:
+                    column.append(nested.value)
+                    nested = None
+            elif inColumn and prefix == VALUE:
+                if event in ("start_map", "start_array"):
+                    nested = ijson.ObjectBuilder()
+                    nested.event(event, value)
+                else:
+                    column.append(value)
+            elif inColumn and prefix == VALUES:
+                # End of the column
+                inColumn = False
+            elif prefix == VALUES and event == "start_array" and column is None:
+                # Placeholder keeping the position of the column
+                item.event("null", None)
+                inColumn, column = True, []
+            elif prefix == OUTPUT:
+                if event in ("start_map", "start_array"):
+                    item, column = ijson.ObjectBuilder(), None
+                    item.event(event, value)
+                elif event in END_EVENTS:
+                    item.event(event, value)
+                    if column is not None:
+                        item.value["values"] = typedColumn(column)
+                    outputs.append(item.value)
+                    item = column = None
+                elif event == "map_key":
+                    item.event(event, value)
+                else:
+                    outputs.append(value)
+            elif prefix == OUTPUTS:
+                # End of the output columns
+                inOutputs = False
+            else:
+                # Other fields of the output (e.g. its name)
+                item.event(event, value)
+
+        results = builder.value
+        if outputs is not None:
+            results[OUTPUTS_KEY] = outputs
+        return results
+
+
+class _Chunk_Reader:
+    """File-like object reading from an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
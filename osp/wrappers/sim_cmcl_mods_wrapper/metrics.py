@@ -0,0 +1,231 @@
+import bisect
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Label names and values of a series, sorted by name
+Labels = Tuple[Tuple[str, str], ...]
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _formatLabels(labels: Labels, extra: Labels = ()) -> str:
+    labels = labels + extra
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+        for name, value in labels)
+    return "{" + ",".join(f"{name}=\"{value}\"" for name, value in escaped) + "}"
+
+
+def _formatValue(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing count, per combination of label values."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increments the count of the given labels."""
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Returns the count of the given labels."""
+        with self._lock:
+            return self._values.get(_labels(labels), 0)
+
+    def samples(self) -> List[str]:
+        """Returns the lines of the series in the text exposition format."""
+        with self._lock:
+            return [f"{self.name}{_formatLabels(key)} {_formatValue(value)}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """Distribution of observed values over cumulative buckets, per
+    combination of label values."""
+
+    TYPE = "histogram"
+
+    # Default upper bounds of the buckets (seconds)
+    LATENCY_BUCKETS: Tuple[float, ...] = (
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+        60.0, 300.0, 900.0, 3600.0)
+
+    def __init__(self, name: str, help: str,
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Per labels: count per bucket (the last one being +Inf), and sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Records a value for the given labels."""
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels) -> int:
+        """Returns the number of values recorded for the given labels."""
+        with self._lock:
+            counts, _ = self._values.get(_labels(labels), ([], []))
+            return sum(counts)
+
+    def sum(self, **labels) -> float:
+        """Returns the sum of the values recorded for the given labels."""
+        with self._lock:
+            _, total = self._values.get(_labels(labels), ([], [0.0]))
+            return total[0]
+
+    def samples(self) -> List[str]:
+        """Returns the lines of the series in the text exposition format."""
+        lines = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = (("le", _formatValue(float(bound))),)
+                    lines.append(f"{self.name}_bucket{_formatLabels(key, le)} "
+                                 f"{cumulative}")
+                lines.append(f"{self.name}_sum{_formatLabels(key)} "
+                             f"{_formatValue(total[0])}")
+                lines.append(f"{self.name}_count{_formatLabels(key)} "
+                             f"{cumulative}")
+        return lines
+
+
+class Metrics_Registry:
+    """Registry of counters and histograms, exposed in the Prometheus text
+    format with exposition(), dump() (e.g. for the textfile collector of the
+    node exporter) or serve().
+    """
+
+    # Registry shared by all sessions (created on first use)
+    _shared: Optional["Metrics_Registry"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    @classmethod
+    def shared(cls) -> "Metrics_Registry":
+        """Returns the registry shared by all sessions of this process."""
+        with cls._shared_lock:
+            if Metrics_Registry._shared is None:
+                Metrics_Registry._shared = cls()
+            return Metrics_Registry._shared
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        """Returns the counter of the given name, registering it first if
+        needed."""
+        return self._metric(Counter, name, help)
+
+    def histogram(self, name: str, help: str = "",
+                  buckets: Sequence[float] = Histogram.LATENCY_BUCKETS) -> Histogram:
+        """Returns the histogram of the given name, registering it first
+        with the given bucket bounds if needed."""
+        return self._metric(Histogram, name, help, buckets)
+
+    def _metric(self, metric_class, name: str, help: str, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, help, *args)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already a {metric.TYPE}")
+            return metric
+
+    def exposition(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for name, metric in metrics:
+            if metric.help:
+                help = metric.help.replace("\\", "\\\\").replace("\n", "\\n")
+                lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {metric.TYPE}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Writes all metrics to a file in the text exposition format,
+        replacing it atomically."""
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                file.write(self.exposition())
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def serve(self, port: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serves the metrics over HTTP (GET /metrics) from a daemon thread.
+
+        Arguments:
+            port -- Port to listen on (0 for any free port)
+            host -- Address to listen on
+
+        Returns:
+            The server, whose server_address gives the port it listens on,
+            to stop with shutdown()
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.exposition().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("Metrics request: " + format, *args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True,
+                         name="mods-metrics").start()
+        logger.info("Serving metrics on http://%s:%s/metrics",
+                    *server.server_address[:2])
+        return server
@@ -1,11 +1,12 @@
 from osp.core.cuds import Cuds
 from osp.core.namespaces import mods
-import osp.core.utils.simple_search as search
 from osp.wrappers.sim_cmcl_mods_wrapper.cuds_adaptor import CUDS_Adaptor
+from osp.wrappers.sim_cmcl_mods_wrapper.cuds_index import CUDS_Index
+from osp.wrappers.sim_cmcl_mods_wrapper.result_table import Result_Table
 import osp.wrappers.sim_cmcl_mods_wrapper.engine_exceptions as enexc
 import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
 import logging
-from typing import Dict
+from typing import Dict, Optional
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -30,16 +31,24 @@ class MoDS_Engine:
         """
         return self.__class__.__name__
 
-    def determineTemplate(self, root_cuds_object: Cuds) -> None:
-        """Determines which simulation template to use based on the modelFlag."""
+    def determineTemplate(self, root_cuds_object: Cuds,
+                          index: Optional[CUDS_Index] = None) -> Optional[Enum]:
+        """Determines which simulation template to use based on the modelFlag.
 
-        simulation_list = search.find_cuds_objects_by_oclass(
-            mods.Simulation, root_cuds_object, rel=None)  # type: ignore
+        The CUDS_Index of the root can be given, to share its traversal with
+        generateJSON.
+
+        Returns:
+            The detected simulation template (None if it cannot be determined)
+        """
+
+        simulation_list = CUDS_Adaptor.findAll(
+            mods.Simulation, root_cuds_object, index)
 
         if len(simulation_list) != 1:
             logger.error("Invalid number of simulations defined: %s",
                          str(len(simulation_list)))
-            return
+            return None
 
         simulation_class = simulation_list[0].oclass
 
@@ -60,25 +69,48 @@ class MoDS_Engine:
 
         logger.info("Detected simulation template as %s",
                     self.simulation_template.name)
+        return self.simulation_template
+
+    def generateJSON(self, root_cuds_object: Cuds,
+                     simulation_template: Optional[Enum] = None,
+                     index: Optional[CUDS_Index] = None) -> str:
+        """Generates JSON input string from CUDS.
 
-    def generateJSON(self, root_cuds_object: Cuds) -> str:
-        """Generates JSON input string from CUDS."""
+        The current template is used unless a simulation_template is given.
+        The CUDS_Index of the root is built unless it is given.
+        """
 
         self.executed = False
 
+        if simulation_template is None:
+            simulation_template = self.simulation_template
+
         # Build the JSON data from the CUDS objects
-        jsonSimCase = CUDS_Adaptor.toJSON(root_cuds_object, self.simulation_template)
+        jsonSimCase = CUDS_Adaptor.toJSON(
+            root_cuds_object, simulation_template, index)
         logger.info("JSON data successfully generated from CUDS objects.")
         return jsonSimCase
 
-    def parseResults(self, root_cuds_object, jsonResults: Dict) -> None:
+    def parseResults(self, root_cuds_object, jsonResults: Dict,
+                     simulation_template: Optional[Enum] = None,
+                     lazy: bool = False) -> Optional[Result_Table]:
         """Given the results of a remote simulation in JSON form, this
-        function parses them in to CUDS objects."""
+        function parses them in to CUDS objects.
+
+        The current template is used unless a simulation_template is given.
+        If lazy is set, output data points are returned in a Result_Table
+        instead of being built as CUDS.
+        """
+
+        if simulation_template is None:
+            simulation_template = self.simulation_template
 
         # Use the CUDS_Adaptor to fill CUDS objects with results
-        CUDS_Adaptor.toCUDS(root_cuds_object, jsonResults, self.simulation_template)
+        table = CUDS_Adaptor.toCUDS(
+            root_cuds_object, jsonResults, simulation_template, lazy=lazy)
         logger.info("CUDS objects have now been populated with simulation results.")
         self.successful = True
+        return table
 
     def hasExecuted(self) -> bool:
         """Returns true if this engine instance has been executed."""
@@ -1,7 +1,26 @@
+import asyncio
+import contextvars
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from osp.core.session import SimWrapperSession
+from osp.core.session.buffers import BufferContext, EngineContext
 from osp.wrappers.sim_cmcl_mods_wrapper.mods_engine import MoDS_Engine
-from osp.wrappers.sim_cmcl_mods_wrapper import Agent_Bridge
+from osp.wrappers.sim_cmcl_mods_wrapper.cuds_index import CUDS_Index
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Analytic_Model, Async_Agent_Bridge, Execution_Backend, HTTP_Backend,
+    Input_Chunker, Local_Ranker, Process_Pool_Backend, Result_Cache,
+    Result_Table)
+from osp.wrappers.sim_cmcl_mods_wrapper.job_events import (
+    FINAL_STATES, Job_Listener, Job_State)
+from osp.wrappers.sim_cmcl_mods_wrapper.job_handles import Job_Handle
+from osp.wrappers.sim_cmcl_mods_wrapper.metrics import Metrics_Registry
+from osp.wrappers.sim_cmcl_mods_wrapper.tracing import (
+    Memory_Tracer, No_Op_Tracer, currentTracer, useTracer)
+import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
 from osp.core.cuds import Cuds
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,23 +31,456 @@ class MoDS_Session(SimWrapperSession):
     JSON data it has produced to an Agent_Bridge instance that runs the remote
     simulation with the MoDS Suite."""
 
-    def __init__(self, engine=None, **kwargs):
+    # Default number of jobs of a batch run in flight at once
+    MAX_CONCURRENCY: int = 8
+
+    # Maximum number of submitted jobs waited for at once (see submit())
+    MAX_WAITING_JOBS: int = 32
+
+    def __init__(self, engine=None, transport=None, submission_mode=None,
+                 compression=None, polling_strategy=None, cache=None,
+                 coalescer=None, lazy_results=False, typed_outputs=None,
+                 chunk_size=None, surrogates=None, local_formulas=False,
+                 local_ranking=False, backend=None, journal=None, tracer=None,
+                 metrics=None, **kwargs):
         """Initialises the session and creates a new MoDS_Engine instance.
 
         Arguments:
-            engine -- MoDS_Engine instance
-            kwargs -- Keyword arguments
+            engine           -- MoDS_Engine instance
+            transport        -- Agent_Transport used by the bridges of this
+                                session (defaults to the transport shared by
+                                the process)
+            submission_mode  -- Submission_Mode used by the bridges of this
+                                session (defaults to Agent_Bridge's)
+            compression      -- Compression of submission bodies (None,
+                                "gzip" or "zstd")
+            polling_strategy -- Polling_Strategy used by the bridges of this
+                                session, or a dictionary giving the strategy
+                                per Engine_Template (defaults to
+                                Agent_Bridge's)
+            cache            -- Result_Cache returning the results of
+                                simulations already run without a remote job
+                                (None to always run the job)
+            coalescer        -- Request_Coalescer sharing one job between
+                                identical simulations run concurrently, e.g.
+                                Request_Coalescer.shared() (None to always
+                                submit a job)
+            lazy_results     -- Whether to keep the output data points of
+                                the simulations in a Result_Table, see
+                                results(), instead of building their CUDS
+            typed_outputs    -- Whether the bridges decode output columns to
+                                typed arrays (defaults to Agent_Bridge's)
+            chunk_size       -- Maximum number of data points submitted in a
+                                single Evaluate job; larger input data sets
+                                are split into chunks run concurrently
+                                (None to never split)
+            surrogates       -- Surrogate_Store evaluating Evaluate
+                                simulations locally when their surrogate is
+                                available, and exporting the surrogates saved
+                                by the simulations of this session if it
+                                uses export_saved (None to always use the
+                                agent)
+            local_formulas   -- Whether to evaluate the AnalyticModel
+                                functions locally and submit their values
+                                instead of their formulas
+            local_ranking    -- Whether to rank the data points of MOOonly
+                                and MCDM simulations locally, with a
+                                Local_Ranker, instead of in a remote job
+            backend          -- Execution_Backend running the jobs of this
+                                session, or the name of a registered backend
+                                (defaults to the backend named by the
+                                MODS_EXECUTION_BACKEND environment variable,
+                                or "http"; "process" runs the jobs that
+                                can run locally in worker processes, see
+                                Process_Pool_Backend). The transport,
+                                submission_mode, compression,
+                                polling_strategy, typed_outputs and journal
+                                options configure the "http" backend, which
+                                is also the fallback of the "process"
+                                backend; giving them with any other named
+                                backend raises a ValueError.
+            journal          -- Job_Journal recording the remote jobs, so
+                                that a simulation whose job was left
+                                running (e.g. by a client restart) waits for
+                                that job instead of submitting it again
+            tracer           -- Tracer recording the phases of every run
+                                as spans, e.g. a Memory_Tracer or an
+                                OpenTelemetry tracer (None for none; the
+                                profile of the last run is always available
+                                from last_run_profile())
+            metrics          -- Metrics_Registry recording the jobs,
+                                latencies, polls, payload sizes, cache hits
+                                and CUDS objects created by the runs of this
+                                session, e.g. Metrics_Registry.shared()
+                                (None for none)
+            kwargs           -- Keyword arguments
         """
 
         if engine is None:
             engine = MoDS_Engine()
         logger.info(f"Initialise MoDS_Session with the {engine.name} engine")
         super().__init__(engine, **kwargs)
+        self._owns_backend = not isinstance(backend, Execution_Backend)
+        if self._owns_backend:
+            backend = self._createBackend(
+                backend,
+                polling_strategy=polling_strategy,
+                transport=transport,
+                submission_mode=submission_mode,
+                compression=compression,
+                typed_outputs=typed_outputs,
+                journal=journal,
+            )
+        self.backend: Execution_Backend = backend
+        self._cache = cache
+        self._coalescer = coalescer
+        self._lazy_results = lazy_results
+        self._chunker = None if chunk_size is None else Input_Chunker(chunk_size)
+        self._surrogates = surrogates
+        self._local_formulas = local_formulas
+        self._ranker = Local_Ranker() if local_ranking else None
+        self._results: Dict[Any, Result_Table] = {}
+        self._waiters: Optional[ThreadPoolExecutor] = None
+        self.tracer = tracer if tracer is not None else No_Op_Tracer()
+        self._last_profile: Optional[Dict] = None
+        self._metrics: Optional[Metrics_Registry] = metrics
 
     def __str__(self):
         """Returns a textual representation."""
         return "MoDS Wrapper Session"
 
+    def close(self):
+        """Closes the session, and the execution backend it created."""
+        if self._waiters is not None:
+            self._waiters.shutdown(wait=False)
+        if self._owns_backend:
+            self.backend.close()
+        super().close()
+
+    def results(self, simulation: Cuds) -> Optional[Result_Table]:
+        """Returns the output data points of a simulation run with
+        lazy_results, as a Result_Table.
+
+        Arguments:
+            simulation -- Simulation CUDS object of this session
+
+        Returns:
+            The results of the simulation (None if it has none)
+        """
+        return self._results.get(simulation.uid)
+
+    def last_run_profile(self) -> Optional[Dict]:
+        """Returns the profile of the last simulation run by run(), arun()
+        or run_many(): the time spent in each phase of the run (indexCUDS,
+        determineTemplate, generateJSON, execute, and within it encodeURL,
+        submit, poll and download, then toCUDS), the number of times each
+        phase ran (e.g. the number of polls) and the payload sizes, see
+        Memory_Tracer.summary().
+
+        Returns:
+            The profile (None if no simulation has been run)
+        """
+        return self._last_profile
+
+    @contextmanager
+    def _profiling(self, root_cuds_object: Cuds) -> Iterator[Memory_Tracer]:
+        """Records the phases of a run, forwarding them to the tracer of the
+        session, then keeps and logs its profile."""
+        forward = None if isinstance(self.tracer, No_Op_Tracer) else self.tracer
+        profiler = Memory_Tracer(max_spans=None, forward=forward)
+        try:
+            with useTracer(profiler), profiler.start_as_current_span(
+                    "run", attributes={"simulation": str(root_cuds_object.uid)}):
+                yield profiler
+        finally:
+            profile = profiler.summary()
+            profile["simulation"] = str(root_cuds_object.uid)
+            for span in profiler.spans:
+                if span.name == "determineTemplate":
+                    profile["template"] = span.attributes.get("template")
+                elif span.name == "execute":
+                    profile["succeeded"] = span.attributes.get("succeeded", False)
+            self._last_profile = profile
+            if self._metrics is not None:
+                self._recordMetrics(profiler, profile)
+            logger.info("Run profile: %s", json.dumps(profile),
+                        extra={"mods_profile": profile})
+
+    def _recordMetrics(self, profiler: Memory_Tracer, profile: Dict) -> None:
+        """Records the jobs, latencies, polls and payload sizes of a run in
+        the metrics registry of the session."""
+        metrics = self._metrics
+        template = profile.get("template") or "unknown"
+        submits = [span for span in profiler.spans if span.name == "submit"]
+        metrics.counter(
+            "mods_jobs_submitted_total", "Jobs submitted to the MoDS Agent",
+        ).inc(len(submits), template=template)
+        if "succeeded" in profile:
+            outcome = "completed" if profile["succeeded"] else "failed"
+            metrics.counter(
+                f"mods_jobs_{outcome}_total", f"Simulations {outcome}",
+            ).inc(template=template)
+            metrics.histogram(
+                "mods_job_latency_seconds",
+                "Time from submission to results of the simulations",
+            ).observe(profile["phases"]["execute"], template=template)
+        for span in submits:
+            metrics.histogram(
+                "mods_submit_latency_seconds",
+                "Duration of the job submission requests",
+            ).observe(span.duration, template=template)
+        if submits:
+            metrics.histogram(
+                "mods_polls_per_job", "Output requests sent per simulation",
+                buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+            ).observe(profile["counts"].get("poll", 0), template=template)
+        metrics.counter(
+            "mods_sent_bytes_total", "Input JSON bytes submitted",
+        ).inc(profile["sizes"].get("payload_bytes", 0))
+        metrics.counter(
+            "mods_received_bytes_total", "Output response bytes received",
+        ).inc(profile["sizes"].get("response_bytes", 0))
+
+    def _determineTemplate(self, root_cuds_object: Cuds,
+                           index: Optional[CUDS_Index] = None):
+        """Determines the template of a simulation."""
+        with currentTracer().start_as_current_span("determineTemplate") as span:
+            template = self._engine.determineTemplate(root_cuds_object, index)
+            span.set_attribute("template", getattr(template, "name", "unknown"))
+            return template
+
+    def _parseResults(self, root_cuds_object: Cuds, jsonResults: Dict,
+                      template) -> None:
+        """Writes the results of a simulation back to CUDS, keeping the
+        output data points in a Result_Table when lazy_results is set."""
+        with currentTracer().start_as_current_span("toCUDS") as span:
+            created = len(self._registry)
+            table = self._engine.parseResults(
+                root_cuds_object, jsonResults, template, lazy=self._lazy_results)
+            created = len(self._registry) - created
+            span.set_attribute("cuds_created", created)
+        if self._metrics is not None:
+            self._metrics.counter(
+                "mods_cuds_created_total", "CUDS objects created from results",
+            ).inc(max(created, 0))
+        if table is not None:
+            self._results[table.simulation.uid] = table
+
+    @staticmethod
+    def _createBackend(name: Optional[str], **bridge_options) -> Execution_Backend:
+        """Creates the named backend, passing the bridge options to the HTTP
+        backend (the fallback of the process backend)."""
+        if name is None:
+            name = os.environ.get(Execution_Backend.BACKEND_ENV_VAR,
+                                  HTTP_Backend.NAME)
+        if name == HTTP_Backend.NAME:
+            return HTTP_Backend(**bridge_options)
+        if name == Process_Pool_Backend.NAME:
+            return Process_Pool_Backend(fallback=HTTP_Backend(**bridge_options))
+
+        options = sorted(option for option, value in bridge_options.items()
+                         if value is not None)
+        if options:
+            raise ValueError(
+                f"The {', '.join(options)} options do not apply to the "
+                f"{name} execution backend")
+        return Execution_Backend.create(name)
+
+    def _indexCUDS(self, root_cuds_object: Cuds) -> CUDS_Index:
+        """Indexes the CUDS objects of a simulation once, for all the lookups
+        of determineTemplate and generateJSON."""
+        with currentTracer().start_as_current_span("indexCUDS") as span:
+            index = CUDS_Index(root_cuds_object)
+            span.set_attribute("cuds_indexed", len(index))
+        return index
+
+    def _generateJSON(self, root_cuds_object: Cuds, template,
+                      index: Optional[CUDS_Index] = None) -> str:
+        """Generates the input JSON of a simulation, with its formulas
+        evaluated locally when the session uses local_formulas."""
+        with currentTracer().start_as_current_span("generateJSON") as span:
+            jsonSimCase = self._engine.generateJSON(
+                root_cuds_object, template, index)
+            if self._local_formulas:
+                model = Analytic_Model.fromJSON(jsonSimCase)
+                if model.formulas:
+                    jsonSimCase = model.prefill(jsonSimCase)
+            span.set_attribute("json_bytes", len(jsonSimCase or ""))
+        return jsonSimCase
+
+    def _jobKey(self, jsonSimCase: str, template) -> Optional[str]:
+        """Returns the key identifying a simulation in the result cache and
+        among in-flight jobs (None when the session uses neither)."""
+        if self._cache is None and self._coalescer is None:
+            return None
+        return Result_Cache.key(jsonSimCase, template)
+
+    def _cachedResults(self, cacheKey: Optional[str]) -> Optional[Dict]:
+        """Returns the cached results of a simulation (None on a miss)."""
+        if self._cache is None:
+            return None
+        jsonResults = self._cache.get(cacheKey)
+        if jsonResults is not None:
+            logger.info("Results found in cache, no job submitted")
+            if self._metrics is not None:
+                self._metrics.counter(
+                    "mods_cache_hits_total", "Results found in the cache",
+                ).inc()
+        return jsonResults
+
+    def _storeResults(self, cacheKey: Optional[str],
+                      jsonResults: Optional[Dict], template) -> None:
+        """Caches the results of a successful simulation."""
+        if self._cache is not None and jsonResults is not None:
+            self._cache.put(cacheKey, jsonResults, template)
+
+    def _localResults(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Ranks the data points of a MOOonly or MCDM simulation locally, if
+        the session uses local_ranking, or evaluates an Evaluate simulation
+        locally, if the (single) surrogate it loads is available from the
+        surrogate store.
+
+        Returns:
+            Resulting JSON data objects (None if it must run remotely)
+        """
+        if self._ranker is not None and self._ranker.supports(template):
+            return self._ranker.rank(jsonSimCase)
+        if self._surrogates is None or template != engtempl.Engine_Template.Evaluate:
+            return None
+        simCase = json.loads(jsonSimCase)
+        surrogateIDs = [algorithm["surrogateToLoad"]
+                        for algorithm in simCase.get("Algorithms", [])
+                        if algorithm.get("surrogateToLoad")]
+        if not surrogateIDs:
+            return None
+        if len(set(surrogateIDs)) > 1:
+            logger.info("Simulation loads several surrogates, evaluating "
+                        "remotely")
+            return None
+        surrogate = self._surrogates.get(surrogateIDs[0])
+        if surrogate is None:
+            logger.warning("Surrogate %s not available, evaluating remotely",
+                           surrogateIDs[0])
+            return None
+
+        logger.info("Evaluating surrogate %s locally", surrogateIDs[0])
+        outputs = surrogate.evaluate(
+            {input["name"]: input["values"] for input in simCase["Inputs"]})
+        return {
+            "jobID": f"local:{surrogateIDs[0]}",
+            "SimulationType": simCase.get("SimulationType"),
+            "Outputs": [{"name": name, "values": values.tolist()}
+                        for name, values in outputs.items()],
+        }
+
+    def _exportSurrogate(self, jsonSimCase: str,
+                         jsonResults: Optional[Dict]) -> None:
+        """Exports the surrogate saved by a successful simulation to the
+        surrogate store, if it uses export_saved."""
+        if (self._surrogates is None or not self._surrogates.export_saved
+                or jsonResults is None):
+            return
+        simCase = json.loads(jsonSimCase)
+        if any(algorithm.get("saveSurrogate")
+               for algorithm in simCase.get("Algorithms", [])):
+            self._surrogates.export(jsonResults["jobID"])
+
+    def _splitInputs(self, jsonSimCase: str, template) -> List[str]:
+        """Splits the input JSON of an Evaluate simulation into chunks of at
+        most chunk_size data points."""
+        if self._chunker is None or template != engtempl.Engine_Template.Evaluate:
+            return [jsonSimCase]
+        return self._chunker.split(jsonSimCase)
+
+    def _executeJob(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Gets the results of a simulation, running the chunks of a split
+        Evaluate simulation concurrently and stitching their outputs back
+        together.
+
+        Returns:
+            Resulting JSON data objects (or None if error occurs)
+        """
+        jsonResults = self._localResults(jsonSimCase, template)
+        if jsonResults is not None:
+            return jsonResults
+
+        chunks = self._splitInputs(jsonSimCase, template)
+        if len(chunks) == 1:
+            return self._executeChunk(jsonSimCase, template)
+
+        with ThreadPoolExecutor(max_workers=min(
+                self.MAX_CONCURRENCY, len(chunks))) as pool:
+            # Each chunk runs in a copy of the calling context, so that its
+            # requests are traced along with the run
+            chunkResults = list(pool.map(
+                lambda args: args[0].run(self._executeChunk, args[1], template),
+                [(contextvars.copy_context(), chunk) for chunk in chunks]))
+        return self._chunker.stitch(chunkResults)
+
+    async def _aexecuteJob(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Awaitable counterpart of _executeJob()."""
+        # Local results may download a surrogate (blocking I/O) and are
+        # computed in the executor, so that other jobs keep running
+        jsonResults = await asyncio.get_running_loop().run_in_executor(
+            Async_Agent_Bridge.executor(), contextvars.copy_context().run,
+            self._localResults, jsonSimCase, template)
+        if jsonResults is not None:
+            return jsonResults
+
+        chunks = self._splitInputs(jsonSimCase, template)
+        if len(chunks) == 1:
+            return await self._aexecuteChunk(jsonSimCase, template)
+
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+
+        async def run_chunk(chunk):
+            async with semaphore:
+                return await self._aexecuteChunk(chunk, template)
+
+        chunkResults = await asyncio.gather(*(run_chunk(c) for c in chunks))
+        return self._chunker.stitch(chunkResults)
+
+    def _executeChunk(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Gets the results of a simulation from the cache, from an identical
+        job in flight, or else by running a job on the execution backend.
+
+        Returns:
+            Resulting JSON data objects (or None if error occurs)
+        """
+        jobKey = self._jobKey(jsonSimCase, template)
+        jsonResults = self._cachedResults(jobKey)
+        if jsonResults is not None:
+            return jsonResults
+
+        def runJob():
+            jsonResults = self.backend.execute(jsonSimCase, template)
+            self._storeResults(jobKey, jsonResults, template)
+            self._exportSurrogate(jsonSimCase, jsonResults)
+            return jsonResults
+
+        if self._coalescer is None:
+            return runJob()
+        return self._coalescer.run(jobKey, runJob)
+
+    async def _aexecuteChunk(self, jsonSimCase: str, template) -> Optional[Dict]:
+        """Awaitable counterpart of _executeChunk()."""
+        jobKey = self._jobKey(jsonSimCase, template)
+        jsonResults = self._cachedResults(jobKey)
+        if jsonResults is not None:
+            return jsonResults
+
+        async def runJob():
+            jsonResults = await self.backend.aexecute(jsonSimCase, template)
+            self._storeResults(jobKey, jsonResults, template)
+            await asyncio.get_running_loop().run_in_executor(
+                Async_Agent_Bridge.executor(), self._exportSurrogate,
+                jsonSimCase, jsonResults)
+            return jsonResults
+
+        if self._coalescer is None:
+            return await runJob()
+        return await self._coalescer.arun(jobKey, runJob)
+
     def _run(self, root_cuds_object: Cuds):
         """Runs the Agent_Bridge class to execute a remote MoDS simulation.
 
@@ -40,21 +492,296 @@ class MoDS_Session(SimWrapperSession):
         """
         logger.info("===== Start: MoDS_Session =====")
 
-        # Determine template from root CUDS object
-        self._engine.determineTemplate(root_cuds_object)
+        with self._profiling(root_cuds_object):
+            # Determine template from root CUDS object
+            index = self._indexCUDS(root_cuds_object)
+            template = self._determineTemplate(root_cuds_object, index)
 
-        # Use the engine to generate JSON inputs
-        jsonSimCase = self._engine.generateJSON(root_cuds_object)
-        # Run remote simulation (via Agent_Bridge)
-        agentBridge = Agent_Bridge()
-        jsonResults = agentBridge.runJob(jsonSimCase)
+            # Use the engine to generate JSON inputs
+            jsonSimCase = self._generateJSON(root_cuds_object, template, index)
+            # Run remote simulation (via Agent_Bridge)
+            with currentTracer().start_as_current_span("execute") as span:
+                jsonResults = self._executeJob(jsonSimCase, template)
+                span.set_attribute("succeeded", jsonResults is not None)
 
-        # Pass results (in JSON form) back to the engine for parsing
-        # this writes the results back to CUDS
-        self._engine.parseResults(root_cuds_object, jsonResults)
+            # Pass results (in JSON form) back to the engine for parsing
+            # this writes the results back to CUDS
+            self._parseResults(root_cuds_object, jsonResults, template)
 
         logger.info("===== End: MoDS_Session =====")
 
+    async def arun(self):
+        """Awaitable counterpart of run(). The remote simulation is executed
+        via an Async_Agent_Bridge, so that many sessions can have their jobs
+        in flight at once on a single event loop, e.g. with asyncio.gather.
+        """
+        with EngineContext(self):
+            root_obj = self._consumeUserBuffers()
+            await self._arun(root_obj)
+            self._ran = True
+            self.expire_all()
+
+    def run_many(self, simulations: Iterable[Cuds],
+                 max_concurrency: int = MAX_CONCURRENCY) -> List[bool]:
+        """Runs a batch of simulations, each one as its own MoDS job, with up
+        to max_concurrency jobs in flight at once. The results of each job are
+        written back into its simulation CUDS as soon as the job completes;
+        a failing job does not affect the other simulations of the batch.
+
+        Arguments:
+            simulations     -- Simulation CUDS objects of this session (i.e.
+                               as returned by wrapper.add)
+            max_concurrency -- Maximum number of jobs in flight at once
+
+        When called from a running event loop (e.g. in Jupyter), the batch
+        runs on its own loop in a worker thread, blocking the caller until it
+        completes; coroutines should await arun_many() instead.
+
+        Returns:
+            Whether each simulation completed successfully, in input order
+        """
+        batch = self.arun_many(simulations, max_concurrency)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(batch)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(
+                contextvars.copy_context().run, asyncio.run, batch).result()
+
+    async def arun_many(self, simulations: Iterable[Cuds],
+                        max_concurrency: int = MAX_CONCURRENCY) -> List[bool]:
+        """Awaitable counterpart of run_many()."""
+        with EngineContext(self):
+            self._consumeUserBuffers()
+            simulations = [self._sessionCuds(sim) for sim in simulations]
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def run_one(simulation):
+                with self._profiling(simulation):
+                    index = self._indexCUDS(simulation)
+                    template = self._determineTemplate(simulation, index)
+                    if template is None:
+                        raise ValueError(
+                            "Could not determine the simulation template")
+                    jsonSimCase = self._generateJSON(simulation, template, index)
+                    async with semaphore:
+                        return await self._arunJob(
+                            simulation, template, jsonSimCase)
+
+            outcomes = await asyncio.gather(
+                *(run_one(sim) for sim in simulations), return_exceptions=True)
+            self._ran = True
+            self.expire_all()
+
+        successes = []
+        for simulation, outcome in zip(simulations, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("Simulation %s failed: %r", simulation.uid, outcome)
+                outcome = False
+            successes.append(outcome)
+        logger.info("Batch finished: %s of %s simulations successful",
+                    sum(successes), len(successes))
+        return successes
+
+    def submit(self, simulation: Cuds,
+               listener: Optional[Job_Listener] = None) -> Job_Handle:
+        """Submits the job of a simulation and returns without waiting for
+        it. The job is waited for in the background; the results are
+        written back to the simulation CUDS by the handle's result().
+
+        Arguments:
+            simulation -- Simulation CUDS object of this session (i.e. as
+                          returned by wrapper.add)
+            listener   -- Callable receiving a Job_Event on every state
+                          transition of the job (see Job_Handle.addListener)
+
+        Returns:
+            Handle of the job, once it is submitted
+        """
+        with EngineContext(self):
+            self._consumeUserBuffers()
+            self._ran = True
+            simulation = self._sessionCuds(simulation)
+            index = self._indexCUDS(simulation)
+            template = self._engine.determineTemplate(simulation, index)
+            if template is None:
+                raise ValueError("Could not determine the simulation template")
+            jsonSimCase = self._generateJSON(simulation, template, index)
+
+        handle = Job_Handle(self, simulation, template)
+        if listener is not None:
+            handle.addListener(listener)
+
+        jobKey = self._jobKey(jsonSimCase, template)
+        jsonResults = self._localResults(jsonSimCase, template)
+        if jsonResults is None:
+            jsonResults = self._cachedResults(jobKey)
+        if jsonResults is not None:
+            handle.finish(jsonResults)
+            return handle
+
+        if self._coalescer is not None or len(
+                self._splitInputs(jsonSimCase, template)) > 1:
+            # Shared or split jobs are run as usual in the background
+            self._waitingPool().submit(
+                self._executeSubmitted, handle, jsonSimCase, template)
+            return handle
+
+        started = self.backend.metrics.start()
+        handle.jobID = self.backend.submit(jsonSimCase, template)
+        if handle.jobID is None:
+            logger.error("Job was not submitted successfully")
+            self.backend.metrics.finish(started, False)
+            handle.finish(None)
+            return handle
+        handle.setState(Job_State.SUBMITTED)
+        self._waitingPool().submit(
+            self._waitForSubmitted, handle, jsonSimCase, template, jobKey,
+            started)
+        return handle
+
+    def _waitingPool(self) -> ThreadPoolExecutor:
+        """Returns the threads waiting for submitted jobs."""
+        if self._waiters is None:
+            self._waiters = ThreadPoolExecutor(
+                max_workers=self.MAX_WAITING_JOBS,
+                thread_name_prefix="mods-session-wait")
+        return self._waiters
+
+    def _waitForSubmitted(self, handle: Job_Handle, jsonSimCase: str,
+                          template, jobKey: Optional[str],
+                          started: float) -> None:
+        """Polls the backend for a submitted job until it finishes, then
+        completes its handle."""
+        jsonResults = None
+        attempt = 0
+        try:
+            delays = self.backend.pollingDelays(template)
+            state = self.backend.poll(handle.jobID)
+            while state not in FINAL_STATES:
+                handle.setState(state, attempt)
+                delay = next(delays, None)
+                if delay is None:
+                    logger.warning("Polling strategy exhausted, "
+                                   "considering job a failure.")
+                    break
+                if handle.waitForCancel(delay):
+                    break
+                attempt += 1
+                state = self.backend.poll(handle.jobID)
+
+            if state in FINAL_STATES:
+                jsonResults = self.backend.fetch(handle.jobID)
+                self._storeResults(jobKey, jsonResults, template)
+                self._exportSurrogate(jsonSimCase, jsonResults)
+            else:
+                self.backend.cancel(handle.jobID)
+        except Exception as error:
+            logger.exception("Waiting for job %s failed", handle.jobID)
+            self.backend.metrics.finish(started, False)
+            handle.fail(error)
+            return
+        self.backend.metrics.finish(started, jsonResults is not None)
+        handle.finish(jsonResults, attempt)
+
+    def _executeSubmitted(self, handle: Job_Handle, jsonSimCase: str,
+                          template) -> None:
+        """Runs a submitted job that is shared or split, then completes its
+        handle. The job can be cancelled until it starts only, as it may be
+        shared with other simulations."""
+        if not handle.startUncancellable():
+            handle.finish(None)
+            return
+        handle.setState(Job_State.RUNNING)
+        try:
+            jsonResults = self._executeJob(jsonSimCase, template)
+        except Exception as error:
+            logger.exception("Submitted simulation failed")
+            handle.fail(error)
+            return
+        handle.finish(jsonResults)
+
+    def _parseSubmitted(self, handle: Job_Handle, jsonResults: Dict) -> None:
+        """Writes the results of a submitted job back to CUDS."""
+        with EngineContext(self):
+            self._parseResults(handle.simulation, jsonResults, handle.template)
+            self.expire_all()
+
+    async def _arunJob(self, root_cuds_object: Cuds, template,
+                       jsonSimCase: str) -> bool:
+        """Runs the job of a single simulation of a batch and writes its
+        results back to CUDS.
+
+        Returns:
+            True if the job completed successfully
+        """
+        with currentTracer().start_as_current_span("execute") as span:
+            jsonResults = await self._aexecuteJob(jsonSimCase, template)
+            span.set_attribute("succeeded", jsonResults is not None)
+        if jsonResults is None:
+            logger.error("Simulation %s failed, no results to register",
+                         root_cuds_object.uid)
+            return False
+
+        self._parseResults(root_cuds_object, jsonResults, template)
+        return True
+
+    def _consumeUserBuffers(self) -> Cuds:
+        """Applies the changes buffered by the user to the engine, as done by
+        run() before running the simulation.
+
+        Returns:
+            The wrapper CUDS object
+        """
+        self.log_buffer_status(BufferContext.USER)
+        self._check_cardinalities()
+        root_obj = self._registry.get(self.root)
+        added, updated, deleted = self._buffers[BufferContext.USER]
+        if not self._ran:
+            self._initialize(root_obj, added)
+        else:
+            self._apply_added(root_obj, added)
+            self._apply_updated(root_obj, updated)
+            self._apply_deleted(root_obj, deleted)
+        self._reset_buffers(BufferContext.USER)
+        return root_obj
+
+    def _sessionCuds(self, cuds_object: Cuds) -> Cuds:
+        """Returns the copy of the given CUDS object held by this session."""
+        if cuds_object.uid not in self._registry:
+            raise ValueError(
+                f"{cuds_object} is not part of this session, add it to the "
+                "wrapper first.")
+        return self._registry.get(cuds_object.uid)
+
+    async def _arun(self, root_cuds_object: Cuds):
+        """Runs the Async_Agent_Bridge class to execute a remote MoDS
+        simulation without blocking the event loop.
+
+        Arguments:
+            root_cuds_object -- Root CUDS object representing input data
+        """
+        logger.info("===== Start: MoDS_Session (async) =====")
+
+        with self._profiling(root_cuds_object):
+            # Determine template from root CUDS object
+            index = self._indexCUDS(root_cuds_object)
+            template = self._determineTemplate(root_cuds_object, index)
+
+            # Use the engine to generate JSON inputs
+            jsonSimCase = self._generateJSON(root_cuds_object, template, index)
+            # Run remote simulation (via Async_Agent_Bridge)
+            with currentTracer().start_as_current_span("execute") as span:
+                jsonResults = await self._aexecuteJob(jsonSimCase, template)
+                span.set_attribute("succeeded", jsonResults is not None)
+
+            # Pass results (in JSON form) back to the engine for parsing
+            # this writes the results back to CUDS
+            self._parseResults(root_cuds_object, jsonResults, template)
+
+        logger.info("===== End: MoDS_Session (async) =====")
+
     def _apply_added(self, root_obj, buffer):
         """Not used in the this concrete wrapper.
 
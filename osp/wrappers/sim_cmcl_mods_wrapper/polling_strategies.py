@@ -0,0 +1,98 @@
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+
+class Polling_Strategy(ABC):
+    """Base class of the strategies deciding how long Agent_Bridge waits
+    before each request for the outputs of a submitted job.
+
+    A strategy only describes the waits, so a single instance can be shared
+    by any number of bridges and jobs.
+    """
+
+    @abstractmethod
+    def delays(self) -> Iterator[float]:
+        """Yields the time (seconds) to wait before each output request of a
+        new job. The job is considered a failure once the delays run out.
+        """
+
+
+class Fixed_Polling(Polling_Strategy):
+    """Polls at a fixed interval, up to a maximum number of attempts."""
+
+    def __init__(self, interval: float = 10, max_attempts: int = 60):
+        """Initialises the strategy.
+
+        Arguments:
+            interval     -- Time between polls (seconds)
+            max_attempts -- Maximum number of requests when waiting for a job
+                            to finish
+        """
+        self.interval = interval
+        self.max_attempts = max_attempts
+
+    def delays(self) -> Iterator[float]:
+        for _ in range(1, self.max_attempts):
+            yield self.interval
+
+
+class Exponential_Backoff_Polling(Polling_Strategy):
+    """Polls quickly at first, then backs off exponentially with random
+    jitter until a wall-clock deadline is reached.
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 0.5,
+        fast_polls: int = 3,
+        factor: float = 2.0,
+        max_delay: float = 30.0,
+        jitter: float = 0.1,
+        deadline: Optional[float] = 3600.0,
+        seed: Optional[int] = None,
+    ):
+        """Initialises the strategy.
+
+        Arguments:
+            initial_delay -- Time before the first polls (seconds)
+            fast_polls    -- Number of polls made at the initial delay before
+                             backing off
+            factor        -- Growth factor of the delay after each slow poll
+            max_delay     -- Upper bound of the delay (seconds)
+            jitter        -- Relative amplitude of the random jitter applied
+                             to each delay, so that clients do not poll in
+                             lockstep
+            deadline      -- Wall-clock time after which the job is considered
+                             a failure (seconds, None for no deadline)
+            seed          -- Seed of the jitter random generator
+        """
+        if initial_delay <= 0 or factor < 1 or not 0 <= jitter < 1:
+            raise ValueError(
+                "Invalid backoff: initial_delay must be positive, "
+                "factor at least 1 and jitter in [0, 1)")
+        self.initial_delay = initial_delay
+        self.fast_polls = fast_polls
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self._random = random.Random(seed)
+
+    def delays(self) -> Iterator[float]:
+        start = time.monotonic()
+        delay = self.initial_delay
+        poll = 0
+        while True:
+            poll += 1
+            if poll > self.fast_polls:
+                delay = min(delay * self.factor, self.max_delay)
+            wait = delay * self._random.uniform(1 - self.jitter, 1 + self.jitter)
+
+            if self.deadline is not None:
+                remaining = self.deadline - (time.monotonic() - start)
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            yield wait
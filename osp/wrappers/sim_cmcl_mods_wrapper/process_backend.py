@@ -0,0 +1,353 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+import numpy as np
+import logging
+import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
+from osp.wrappers.sim_cmcl_mods_wrapper.execution_backends import (
+    Execution_Backend, HTTP_Backend)
+from osp.wrappers.sim_cmcl_mods_wrapper.formulas import Analytic_Model
+from osp.wrappers.sim_cmcl_mods_wrapper.job_events import Job_State
+from osp.wrappers.sim_cmcl_mods_wrapper.ranking import Local_Ranker
+from osp.wrappers.sim_cmcl_mods_wrapper.surrogates import Surrogate_Store
+
+logger = logging.getLogger(__name__)
+
+INPUTS_KEY = "Inputs"
+OUTPUTS_KEY = "Outputs"
+ALGORITHMS_KEY = "Algorithms"
+SIM_TYPE_KEY = "SimulationType"
+
+# Columns passed between processes: either the arrays themselves, or the
+# name of a shared memory block holding them as the rows of a float64
+# matrix, with the column names and the number of values per column
+Shared_Columns = Union[
+    Tuple[str, Dict[str, np.ndarray]],
+    Tuple[str, str, List[str], int],
+]
+
+# Surrogate stores of the worker processes, by directory
+_worker_stores: Dict[Optional[str], Surrogate_Store] = {}
+
+
+def shareColumns(columns: Mapping[str, np.ndarray],
+                 threshold: int) -> Tuple[Shared_Columns,
+                                          Optional[shared_memory.SharedMemory]]:
+    """Prepares float columns to be sent to another process, copying them
+    into a new shared memory block if they take at least threshold bytes.
+
+    Returns:
+        Description of the columns, and the shared memory block (None if
+        the columns are sent as they are)
+    """
+    names = list(columns)
+    num_values = len(next(iter(columns.values()), ()))
+    size = len(names) * num_values * 8
+    if size == 0 or size < threshold:
+        return ("inline", dict(columns)), None
+
+    block = shared_memory.SharedMemory(create=True, size=size)
+    matrix = np.ndarray((len(names), num_values), dtype=float, buffer=block.buf)
+    for row, name in enumerate(names):
+        matrix[row] = columns[name]
+    del matrix
+    return ("shared", block.name, names, num_values), block
+
+
+def attachColumns(shared: Shared_Columns) -> Tuple[Dict[str, np.ndarray],
+                                                   Optional[shared_memory.SharedMemory]]:
+    """Returns the columns described by shareColumns(), as views of the
+    shared memory block when they were shared, and the attached block (to
+    close once the views are no longer used)."""
+    if shared[0] == "inline":
+        return shared[1], None
+    _, name, names, num_values = shared
+    block = shared_memory.SharedMemory(name=name)
+    matrix = np.ndarray((len(names), num_values), dtype=float, buffer=block.buf)
+    return {name: matrix[row] for row, name in enumerate(names)}, block
+
+
+def runLocalJob(simCase: Dict, shared: Shared_Columns,
+                surrogate_directory: Optional[str],
+                threshold: int) -> Optional[Tuple[Dict, Shared_Columns]]:
+    """Runs a job in a worker process: evaluates the formulas of the
+    simulation, then ranks its data points (MOOonly, MCDM) or evaluates the
+    surrogate it loads (Evaluate).
+
+    Arguments:
+        simCase             -- Input JSON data of the simulation, without
+                               the values of its numeric inputs
+        shared              -- Numeric input columns (see shareColumns())
+        surrogate_directory -- Directory of the exported surrogates
+        threshold           -- Size from which output columns are returned
+                               in shared memory (bytes)
+
+    Returns:
+        The JSON results without their output columns and the output
+        columns, or None if the job cannot run locally
+    """
+    columns, block = attachColumns(shared)
+    try:
+        model = Analytic_Model({input["name"]: input["formula"]
+                                for input in simCase[INPUTS_KEY]
+                                if "formula" in input})
+        columns = {**columns, **model.evaluate(columns)}
+
+        simulationType = simCase.get(SIM_TYPE_KEY)
+        if simulationType in (engtempl.Engine_Template.MOOonly.name,
+                              engtempl.Engine_Template.MCDM.name):
+            results = Local_Ranker().rankColumns(simCase, columns)
+            if results is None:
+                return None
+            outputs = {output["name"]: np.asarray(output["values"], dtype=float)
+                       for output in results.pop(OUTPUTS_KEY)}
+        elif simulationType == engtempl.Engine_Template.Evaluate.name:
+            surrogateIDs = [algorithm["surrogateToLoad"]
+                            for algorithm in simCase.get(ALGORITHMS_KEY, [])
+                            if algorithm.get("surrogateToLoad")]
+            if not surrogateIDs:
+                return None
+            store = _worker_stores.get(surrogate_directory)
+            if store is None:
+                store = _worker_stores[surrogate_directory] = Surrogate_Store(
+                    surrogate_directory)
+            surrogate = store.get(surrogateIDs[0], download=False)
+            if surrogate is None:
+                return None
+            outputs = surrogate.evaluate(columns)
+            results = {"jobID": f"local:{surrogateIDs[0]}",
+                       SIM_TYPE_KEY: simulationType}
+        else:
+            return None
+    finally:
+        del columns
+        if block is not None:
+            block.close()
+
+    sharedOutputs, outputBlock = shareColumns(outputs, threshold)
+    if outputBlock is not None:
+        # The parent process unlinks the block once it has read it (or
+        # cancelled the job, see releaseOutputs())
+        outputBlock.close()
+    return results, sharedOutputs
+
+
+def releaseOutputs(future: Future) -> None:
+    """Unlinks the shared memory block holding the output columns of a
+    finished runLocalJob() whose results are not read."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    outcome = future.result()
+    if outcome is None or outcome[1][0] != "shared":
+        return
+    try:
+        block = shared_memory.SharedMemory(name=outcome[1][1])
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+class Process_Pool_Backend(Execution_Backend):
+    """Runs the jobs that can run locally (MOOonly and MCDM ranking,
+    Evaluate simulations whose surrogate is exported, and AnalyticModel
+    formulas) in a pool of worker processes, and any other job on a
+    fallback backend.
+
+    Jobs are sent to the workers as their input JSON without the numeric
+    input values, which are passed as one float64 matrix in shared memory
+    once they take at least SHARED_MEMORY_THRESHOLD bytes. Output columns
+    are returned the same way.
+
+    The workers are started with START_METHOD rather than the platform's
+    default, as forking a process running the session's threads (polling,
+    background jobs) is unsafe.
+    """
+
+    NAME = "process"
+
+    # Start method of the worker processes
+    START_METHOD: str = "spawn"
+
+    # Size from which columns are passed in shared memory (bytes)
+    SHARED_MEMORY_THRESHOLD: int = 2**20
+
+    # Templates whose jobs may run locally
+    TEMPLATES = {engtempl.Engine_Template.MOOonly,
+                 engtempl.Engine_Template.MCDM,
+                 engtempl.Engine_Template.Evaluate}
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 surrogate_directory: Optional[str] = None,
+                 fallback: Optional[Execution_Backend] = None):
+        """Initialises the backend.
+
+        Arguments:
+            max_workers         -- Number of worker processes (defaults to
+                                   the number of CPUs)
+            surrogate_directory -- Directory of the surrogates exported by a
+                                   Surrogate_Store (None to run Evaluate
+                                   jobs on the fallback backend)
+            fallback            -- Backend running the jobs that cannot run
+                                   locally (defaults to a new HTTP_Backend)
+        """
+        super().__init__()
+        self.max_workers = max_workers or os.cpu_count()
+        self.surrogate_directory = surrogate_directory
+        self.fallback = fallback if fallback is not None else HTTP_Backend()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Tuple[Future, str, object]] = {}
+        self._fallbackJobs: Dict[str, str] = {}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Pool of worker processes (started on first use)."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.START_METHOD))
+            return self._pool
+
+    def close(self) -> None:
+        """Shuts the worker processes down."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def supports(self, template) -> bool:
+        """Returns whether jobs of the template may run locally."""
+        if template == engtempl.Engine_Template.Evaluate:
+            return self.surrogate_directory is not None
+        return template in self.TEMPLATES
+
+    def submit(self, jsonSimCase: str, template) -> Optional[str]:
+        if not self.supports(template):
+            fallbackID = self.fallback.submit(jsonSimCase, template)
+            if fallbackID is None:
+                return None
+            jobID = f"fallback:{fallbackID}"
+            with self._lock:
+                self._fallbackJobs[jobID] = fallbackID
+            return jobID
+
+        jobID = f"process:{uuid.uuid4()}"
+        future = self._submitLocal(jsonSimCase)
+        with self._lock:
+            self._jobs[jobID] = (future, jsonSimCase, template)
+        return jobID
+
+    def poll(self, jobID: str) -> Job_State:
+        with self._lock:
+            fallbackID = self._fallbackJobs.get(jobID)
+            job = self._jobs.get(jobID)
+        if fallbackID is not None:
+            return self.fallback.poll(fallbackID)
+        if job is None:
+            raise KeyError(jobID)
+        future = job[0]
+        if future.cancelled():
+            return Job_State.CANCELLED
+        if not future.done():
+            return Job_State.RUNNING if future.running() else Job_State.SUBMITTED
+        return Job_State.FAILED if future.exception() else Job_State.DONE
+
+    def fetch(self, jobID: str) -> Optional[Dict]:
+        with self._lock:
+            fallbackID = self._fallbackJobs.pop(jobID, None)
+            job = self._jobs.pop(jobID, None)
+        if fallbackID is not None:
+            return self.fallback.fetch(fallbackID)
+        future, jsonSimCase, template = job
+        return self._localResults(future, jsonSimCase, template)
+
+    def cancel(self, jobID: str) -> None:
+        with self._lock:
+            fallbackID = self._fallbackJobs.pop(jobID, None)
+            job = self._jobs.pop(jobID, None)
+        if fallbackID is not None:
+            self.fallback.cancel(fallbackID)
+        elif job is not None and not job[0].cancel():
+            # Already running or finished: its results are never fetched
+            job[0].add_done_callback(releaseOutputs)
+
+    def run(self, jsonSimCase: str, template) -> Optional[Dict]:
+        if not self.supports(template):
+            return self.fallback.run(jsonSimCase, template)
+        future = self._submitLocal(jsonSimCase)
+        return self._localResults(future, jsonSimCase, template)
+
+    async def arun(self, jsonSimCase: str, template) -> Optional[Dict]:
+        if not self.supports(template):
+            return await self.fallback.arun(jsonSimCase, template)
+        future = self._submitLocal(jsonSimCase)
+        await asyncio.wrap_future(future)
+        if future.exception() is None and future.result() is None:
+            # Not runnable locally after all
+            return await self.fallback.arun(jsonSimCase, template)
+        return self._localResults(future, jsonSimCase, template)
+
+    def _submitLocal(self, jsonSimCase: str) -> Future:
+        """Sends a job to the worker processes, with its numeric input
+        columns in shared memory."""
+        simCase = json.loads(jsonSimCase)
+        numeric = {}
+        for input in simCase.get(INPUTS_KEY, []):
+            if "values" not in input:
+                continue
+            try:
+                numeric[input["name"]] = np.asarray(input["values"], dtype=float)
+            except (TypeError, ValueError):
+                continue
+            del input["values"]
+
+        shared, block = shareColumns(numeric, self.SHARED_MEMORY_THRESHOLD)
+        del numeric
+        future = self.pool.submit(runLocalJob, simCase, shared,
+                                  self.surrogate_directory,
+                                  self.SHARED_MEMORY_THRESHOLD)
+        if block is not None:
+            def release(_):
+                block.close()
+                block.unlink()
+            future.add_done_callback(release)
+        return future
+
+    def _localResults(self, future: Future, jsonSimCase: str,
+                      template) -> Optional[Dict]:
+        """Waits for a job sent to the worker processes and returns its
+        results, running the job on the fallback backend if it could not
+        run locally."""
+        try:
+            outcome = future.result()
+        except Exception:
+            logger.exception("Local job failed")
+            return None
+        if outcome is None:
+            logger.info("Job cannot run locally, running it on the %s backend",
+                        self.fallback.NAME)
+            return self.fallback.run(jsonSimCase, template)
+
+        results, sharedOutputs = outcome
+        outputs, block = attachColumns(sharedOutputs)
+        try:
+            results[OUTPUTS_KEY] = [
+                {"name": name, "values": np.asarray(values).tolist()}
+                for name, values in outputs.items()]
+        finally:
+            del outputs
+            if block is not None:
+                block.close()
+                block.unlink()
+        return results
+
+
+Execution_Backend.register(Process_Pool_Backend.NAME, Process_Pool_Backend)
@@ -0,0 +1,191 @@
+import bisect
+import json
+from typing import Dict, List, Mapping, Optional
+import numpy as np
+import logging
+import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
+
+logger = logging.getLogger(__name__)
+
+INPUTS_KEY = "Inputs"
+OUTPUTS_KEY = "Outputs"
+ALGORITHMS_KEY = "Algorithms"
+SIM_TYPE_KEY = "SimulationType"
+
+
+def nonDominated(objectives: np.ndarray) -> np.ndarray:
+    """Finds the points of the Pareto front (all objectives minimised).
+
+    Fronts of 2 objectives are found by sweeping the points in lexicographic
+    order (O(N log N)). Fronts of 3 objectives are found by the same sweep,
+    keeping the staircase of the front so far in sorted lists: O(N log N)
+    comparisons, but O(N^2) list updates in the worst case. Other fronts are
+    found by repeatedly removing the points dominated by a point of the
+    front with NumPy. Identical points are either all on the front or all
+    dominated.
+
+    Arguments:
+        objectives -- (points x objectives) matrix
+
+    Returns:
+        Boolean mask of the non-dominated points
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.ndim != 2:
+        raise ValueError("The objectives must be a (points x objectives) matrix")
+    if len(objectives) == 0 or objectives.shape[1] == 0:
+        return np.ones(len(objectives), dtype=bool)
+
+    unique, inverse = np.unique(objectives, axis=0, return_inverse=True)
+    if unique.shape[1] == 1:
+        front = unique[:, 0] == unique[0, 0]
+    elif unique.shape[1] == 2:
+        front = _front2D(unique)
+    elif unique.shape[1] == 3:
+        front = _front3D(unique)
+    else:
+        front = _frontND(unique)
+    return front[inverse.reshape(-1)]
+
+
+def _front2D(points: np.ndarray) -> np.ndarray:
+    # Points are unique and sorted lexicographically: a point is dominated
+    # iff an earlier point has a second objective at most as large
+    best = np.minimum.accumulate(points[:, 1])
+    front = np.ones(len(points), dtype=bool)
+    front[1:] = points[1:, 1] < best[:-1]
+    return front
+
+
+def _front3D(points: np.ndarray) -> np.ndarray:
+    # Sweep in lexicographic order keeping the staircase of the (f2, f3)
+    # projections of the front so far: f2 increasing, f3 decreasing
+    front = np.zeros(len(points), dtype=bool)
+    stairs2: List[float] = []
+    stairs3: List[float] = []
+    for i, (_, f2, f3) in enumerate(points.tolist()):
+        k = bisect.bisect_right(stairs2, f2)
+        if k and stairs3[k - 1] <= f3:
+            continue
+        front[i] = True
+        end = k
+        while end < len(stairs2) and stairs3[end] >= f3:
+            end += 1
+        stairs2[k:end] = [f2]
+        stairs3[k:end] = [f3]
+    return front
+
+
+def _frontND(points: np.ndarray) -> np.ndarray:
+    # The remaining point with the smallest sum of objectives is never
+    # dominated: move it to the front and drop the points it dominates
+    front = np.zeros(len(points), dtype=bool)
+    index = np.argsort(points.sum(axis=1), kind="stable")
+    remaining = points[index]
+    while len(index):
+        front[index[0]] = True
+        keep = np.any(remaining < remaining[0], axis=1)
+        remaining, index = remaining[keep], index[keep]
+    return front
+
+
+class Local_Ranker:
+    """Runs MOOonly and MCDM simulations locally: the data points supplied
+    as inputs are filtered by the minimum/maximum of the output Variables,
+    reduced to their Pareto front for the Variables with an objective, and
+    ranked by their weighted distance to the ideal point of the front (each
+    objective scaled to [0, 1] over the front).
+    """
+
+    TEMPLATES = {engtempl.Engine_Template.MOOonly, engtempl.Engine_Template.MCDM}
+
+    def supports(self, template) -> bool:
+        """Returns whether simulations of the template can run locally."""
+        return template in self.TEMPLATES
+
+    def rank(self, jsonSimCase: str) -> Optional[Dict]:
+        """Ranks the data points of a simulation.
+
+        Arguments:
+            jsonSimCase (str) -- Input JSON of the simulation
+
+        Returns:
+            Resulting JSON data objects, with the output columns of the
+            ranked data points (None if the simulation defines no objective)
+        """
+        simCase = json.loads(jsonSimCase)
+        columns = {input["name"]: np.asarray(input["values"], dtype=float)
+                   for input in simCase[INPUTS_KEY] if "values" in input}
+        return self.rankColumns(simCase, columns)
+
+    def rankColumns(self, simCase: Dict,
+                    columns: Mapping[str, np.ndarray]) -> Optional[Dict]:
+        """Ranks the data points of a simulation given as columns of values.
+
+        Arguments:
+            simCase -- Input JSON data of the simulation (its input values
+                       are ignored)
+            columns -- Values of the data points, by variable name
+
+        Returns:
+            Resulting JSON data objects (see rank())
+        """
+        algorithm = next((algorithm for algorithm in simCase.get(ALGORITHMS_KEY, [])
+                          if algorithm.get("variables")), None)
+        if algorithm is None:
+            logger.error("No algorithm variables to rank the data points by")
+            return None
+        variables = algorithm["variables"]
+        missing = [variable["name"] for variable in variables
+                   if variable["name"] not in columns]
+        if missing:
+            raise ValueError(f"Missing data for variables: {', '.join(missing)}")
+
+        num_points = len(next(iter(columns.values()), ()))
+        feasible = np.ones(num_points, dtype=bool)
+        objectives, weights = [], []
+        for variable in variables:
+            if variable["type"] != "output":
+                continue
+            values = np.asarray(columns[variable["name"]], dtype=float)
+            if "minimum" in variable:
+                feasible &= values >= float(variable["minimum"])
+            if "maximum" in variable:
+                feasible &= values <= float(variable["maximum"])
+            objective = variable.get("objective", "").lower()
+            if objective.startswith("min"):
+                objectives.append(values)
+            elif objective.startswith("max"):
+                objectives.append(-values)
+            else:
+                continue
+            weights.append(float(variable.get("weight", 1.0)))
+        if not objectives:
+            logger.error("No variable objective to rank the data points by")
+            return None
+
+        points = np.flatnonzero(feasible)
+        matrix = np.column_stack(objectives)[points]
+        mask = nonDominated(matrix)
+        front, points = matrix[mask], points[mask]
+
+        low = front.min(axis=0, initial=np.inf)
+        high = front.max(axis=0, initial=-np.inf)
+        scale = np.where(high > low, high - low, 1.0)
+        distance = np.sqrt(((front - low) / scale) ** 2 @ np.asarray(weights))
+        ranked = points[np.argsort(distance, kind="stable")]
+
+        maxNumberOfResults = algorithm.get("maxNumberOfResults")
+        if maxNumberOfResults is not None:
+            ranked = ranked[:int(maxNumberOfResults)]
+        logger.info("Ranked %s of %s data points locally", len(ranked), num_points)
+
+        return {
+            "jobID": f"local:{simCase.get(SIM_TYPE_KEY)}",
+            SIM_TYPE_KEY: simCase.get(SIM_TYPE_KEY),
+            OUTPUTS_KEY: [
+                {"name": variable["name"],
+                 "values": np.asarray(columns[variable["name"]])[ranked].tolist()}
+                for variable in variables
+            ],
+        }
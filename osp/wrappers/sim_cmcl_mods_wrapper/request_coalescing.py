@@ -0,0 +1,133 @@
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Outcome passed to the callers waiting for a job whose caller was
+# interrupted (e.g. its task cancelled): they run the job again themselves
+_RETRY = object()
+
+
+class Request_Coalescer:
+    """Single-flight deduplication of identical MoDS jobs within a process.
+
+    The first caller running a job for a given key executes it; callers
+    arriving with the same key while it is in flight, from other threads or
+    asyncio tasks, wait for that job instead of submitting their own, and
+    each receives its own copy of the results. Errors raised by the job are
+    raised to every waiting caller, but the cancellation (or interruption)
+    of the caller running it is not: one of the waiting callers runs the
+    job instead.
+    """
+
+    # Coalescer shared by all sessions (created on first use)
+    _shared: Optional["Request_Coalescer"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._stats = dict(executed=0, coalesced=0)
+
+    @classmethod
+    def shared(cls) -> "Request_Coalescer":
+        """Returns the coalescer shared by all sessions of this process."""
+        with cls._shared_lock:
+            if Request_Coalescer._shared is None:
+                Request_Coalescer._shared = cls()
+            return Request_Coalescer._shared
+
+    def run(self, key: str, job: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """Runs the job, unless a job with the same key is already in flight,
+        in which case its results are awaited instead.
+
+        Arguments:
+            key (str)      -- Key identifying the job (e.g. Result_Cache.key)
+            job (Callable) -- Function running the job and returning its
+                              JSON results
+
+        Returns:
+            JSON results of the job
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            result = future.result()
+            if result is not _RETRY:
+                return copy.deepcopy(result)
+
+        try:
+            result = job()
+        except Exception as error:
+            self._finish(key, future, error=error)
+            raise
+        except BaseException:
+            self._finish(key, future, result=_RETRY)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def arun(self, key: str,
+                   job: Callable[[], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+        """Awaitable counterpart of run().
+
+        Arguments:
+            key (str)      -- Key identifying the job (e.g. Result_Cache.key)
+            job (Callable) -- Coroutine function running the job and returning
+                              its JSON results
+
+        Returns:
+            JSON results of the job
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            result = await asyncio.wrap_future(future)
+            if result is not _RETRY:
+                return copy.deepcopy(result)
+
+        try:
+            result = await job()
+        except Exception as error:
+            self._finish(key, future, error=error)
+            raise
+        except BaseException:
+            # e.g. asyncio.CancelledError
+            self._finish(key, future, result=_RETRY)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of jobs executed and of callers that were
+        coalesced onto an in-flight job."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["inflight"] = len(self._inflight)
+        return stats
+
+    def _join(self, key: str):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                logger.info("Identical job in flight, waiting for its results")
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self._stats["executed"] += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result=None, error=None) -> None:
+        with self._lock:
+            del self._inflight[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Dict, Optional, Tuple
+import logging
+from osp.wrappers.sim_cmcl_mods_wrapper.json_decoding import Json_Backend
+
+logger = logging.getLogger(__name__)
+
+
+class Result_Cache:
+    """Opt-in cache of MoDS job results, keyed on a canonical hash of the
+    input JSON generated for a simulation and its simulation template.
+
+    Results are kept in an in-memory LRU tier and, when a directory is
+    given, in a persistent sqlite tier shared between processes and runs.
+    Both tiers are bounded by number of entries and/or total size, and
+    entries older than the time-to-live are discarded.
+    """
+
+    # Name of the sqlite database within the cache directory
+    DATABASE_NAME: str = "mods_results.sqlite"
+
+    # Results are stored with the standard json module, which keeps NaN and
+    # infinite values (orjson would store them as null)
+    JSON_BACKEND: Json_Backend = Json_Backend("json")
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 256,
+        max_bytes: Optional[int] = 256 * 2**20,
+        ttl: Optional[float] = None,
+        directory: Optional[str] = None,
+        max_disk_bytes: Optional[int] = 4 * 2**30,
+    ):
+        """Initialises the cache.
+
+        Arguments:
+            max_entries    -- Maximum number of results kept in memory
+                              (None for no limit)
+            max_bytes      -- Maximum total size of the results kept in
+                              memory (None for no limit)
+            ttl            -- Time-to-live of the results (seconds, None for
+                              no expiry)
+            directory      -- Directory of the persistent tier (None for a
+                              memory only cache)
+            max_disk_bytes -- Maximum total size of the persistent tier
+                              (None for no limit)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        # key -> (creation time, serialised results)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._stats = dict(memory_hits=0, disk_hits=0, misses=0, evictions=0)
+
+        self._database = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._database = sqlite3.connect(
+                os.path.join(directory, self.DATABASE_NAME),
+                check_same_thread=False)
+            self._database.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, template TEXT, value TEXT, "
+                "size INTEGER, created REAL, accessed REAL)")
+            self._database.commit()
+
+    @staticmethod
+    def key(jsonString: str, simulation_template: Enum) -> str:
+        """Returns the cache key of a simulation.
+
+        Arguments:
+            jsonString (str)           -- Input JSON generated for the
+                                          simulation
+            simulation_template (Enum) -- Template of the simulation
+
+        Returns:
+            Hex digest identifying the simulation
+        """
+        canonical = json.dumps(
+            json.loads(jsonString), sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(simulation_template.name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(canonical.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Returns the results cached under the given key.
+
+        Arguments:
+            key (str) -- Cache key
+
+        Returns:
+            A fresh copy of the cached JSON results (None on a miss)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._expired(entry[0], now):
+                self._discard(key)
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self.JSON_BACKEND.loads(entry[1])
+
+            entry = self._diskGet(key, now)
+            if entry is not None:
+                self._stats["disk_hits"] += 1
+                self._memoryPut(key, *entry)
+                return self.JSON_BACKEND.loads(entry[1])
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, results: Dict,
+            simulation_template: Optional[Enum] = None) -> None:
+        """Stores the results of a simulation.
+
+        Arguments:
+            key (str)                  -- Cache key
+            results (dict)             -- JSON results of the simulation
+            simulation_template (Enum) -- Template of the simulation
+        """
+        value = self.JSON_BACKEND.dumps(results)
+        now = time.time()
+        with self._lock:
+            self._memoryPut(key, now, value)
+            if self._database is not None:
+                self._database.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, getattr(simulation_template, "name", None), value,
+                     len(value), now, now))
+                self._diskEvict(now)
+                self._database.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit/miss statistics and current size of the cache."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+            stats["entries"] = len(self._memory)
+            stats["bytes"] = self._memory_bytes
+            if self._database is not None:
+                stats["disk_entries"], stats["disk_bytes"] = self._database.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+        return stats
+
+    def clear(self) -> None:
+        """Removes all results from the cache."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._database is not None:
+                self._database.execute("DELETE FROM results")
+                self._database.commit()
+
+    def close(self) -> None:
+        """Closes the persistent tier."""
+        if self._database is not None:
+            self._database.close()
+            self._database = None
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _discard(self, key: str) -> None:
+        _, value = self._memory.pop(key)
+        self._memory_bytes -= len(value)
+
+    def _memoryPut(self, key: str, created: float, value: str) -> None:
+        if key in self._memory:
+            self._discard(key)
+        self._memory[key] = (created, value)
+        self._memory_bytes += len(value)
+        while self._memory and (
+            (self.max_entries is not None and len(self._memory) > self.max_entries)
+            or (self.max_bytes is not None and self._memory_bytes > self.max_bytes)
+        ):
+            self._discard(next(iter(self._memory)))
+            self._stats["evictions"] += 1
+
+    def _diskGet(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        if self._database is None:
+            return None
+        row = self._database.execute(
+            "SELECT created, value FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if self._expired(row[0], now):
+            self._database.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._database.commit()
+            return None
+        self._database.execute(
+            "UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        self._database.commit()
+        return row[0], row[1]
+
+    def _diskEvict(self, now: float) -> None:
+        if self.ttl is not None:
+            self._database.execute(
+                "DELETE FROM results WHERE created < ?", (now - self.ttl,))
+        if self.max_disk_bytes is None:
+            return
+        total, = self._database.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        for key, size in self._database.execute(
+                "SELECT key, size FROM results ORDER BY accessed").fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            self._database.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._stats["evictions"] += 1
+            total -= size
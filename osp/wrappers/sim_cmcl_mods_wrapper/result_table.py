@@ -0,0 +1,114 @@
+from osp.core.cuds import Cuds
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Result_Table:
+    """Array-backed view of the output columns returned by a MoDS job.
+
+    It is kept instead of the ParetoFront/OutputData CUDS when a MoDS_Session
+    runs with lazy_results: each output is held as a single NumPy array, and
+    the data point CUDS are only built if toCUDS() is called.
+    """
+
+    def __init__(
+        self,
+        jsonOutputs: List[Dict],
+        simulation: Optional[Cuds] = None,
+        container_oclass=None,
+        data_point_oclass=None,
+        ranked: bool = False,
+    ):
+        """Initialises the table.
+
+        Arguments:
+            jsonOutputs       -- Output columns of the job ({'name', 'values'}
+                                 dicts)
+            simulation        -- Simulation CUDS the results belong to
+            container_oclass  -- Oclass of the container built by toCUDS()
+            data_point_oclass -- Oclass of the data points built by toCUDS()
+            ranked            -- Whether the rows are ranked (1 for the first)
+        """
+        self._columns: Dict[str, np.ndarray] = {
+            output["name"]: np.asarray(output["values"])
+            for output in jsonOutputs
+        }
+        self.simulation = simulation
+        self.container_oclass = container_oclass
+        self.data_point_oclass = data_point_oclass
+        self.ranked = ranked
+        self._container: Optional[Cuds] = None
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the outputs, in the order returned by the job."""
+        return list(self._columns)
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Output arrays by name."""
+        return dict(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the output arrays."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def __len__(self) -> int:
+        """Returns the number of rows (data points)."""
+        return len(next(iter(self._columns.values()), ()))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Returns the values of the named output."""
+        return self._columns[name]
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Returns the output values of a single data point."""
+        return {name: column[index].item()
+                for name, column in self._columns.items()}
+
+    def toArray(self) -> np.ndarray:
+        """Returns the outputs as a (data points x outputs) matrix."""
+        return np.column_stack(list(self._columns.values())) \
+            if self._columns else np.empty((0, 0))
+
+    def toDataFrame(self):
+        """Returns the outputs as a pandas DataFrame (requires pandas)."""
+        try:
+            import pandas
+        except ImportError as error:
+            raise ImportError(
+                "pandas is required to convert results to a DataFrame"
+            ) from error
+        return pandas.DataFrame(self._columns)
+
+    def toJSON(self) -> List[Dict]:
+        """Returns the output columns in the JSON form returned by the job."""
+        return [{"name": name, "values": column.tolist()}
+                for name, column in self._columns.items()]
+
+    def toCUDS(self) -> Cuds:
+        """Builds the container of data point CUDS holding the results and
+        adds it to the simulation, on the first call only.
+
+        Returns:
+            Container CUDS object (e.g. ParetoFront, OutputData)
+        """
+        if self._container is None:
+            from osp.wrappers.sim_cmcl_mods_wrapper.cuds_adaptor import CUDS_Adaptor
+
+            logger.info("Building CUDS data points for %s results", len(self))
+            container = CUDS_Adaptor.buildDataPoints(
+                self.simulation, self.container_oclass,
+                self.data_point_oclass, self.toJSON(), ranked=self.ranked)
+            self._container = self.simulation.add(container)
+        return self._container
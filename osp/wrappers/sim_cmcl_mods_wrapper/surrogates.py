@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Sequence
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HDMR_Surrogate:
+    """HDMR surrogate exported by the MoDS Agent, evaluated locally.
+
+    Each output is a truncated HDMR expansion of the inputs, scaled to [0, 1]
+    by their ranges: a constant f0 plus a sum of terms, each one a
+    coefficient times a product of powers of (one or more) scaled inputs.
+    The export is a JSON object of the form:
+
+        {"surrogateID": "mods-sim-1",
+         "inputs": [{"name": "var1", "minimum": 0.0, "maximum": 1.0}, ...],
+         "outputs": [{"name": "var3", "f0": 1.5,
+                      "terms": [{"variables": ["var1", "var2"],
+                                 "orders": [1, 2],
+                                 "coefficient": 0.3}, ...]}, ...]}
+    """
+
+    def __init__(self, export: Dict):
+        """Initialises the surrogate.
+
+        Arguments:
+            export -- Surrogate exported by the MoDS Agent
+        """
+        self.surrogateID = export.get("surrogateID")
+        self.inputs: List[str] = [input["name"] for input in export["inputs"]]
+        self._minimum = np.array(
+            [input["minimum"] for input in export["inputs"]], dtype=float)
+        ranges = np.array([input["maximum"] for input in export["inputs"]],
+                          dtype=float) - self._minimum
+        self._scale = np.where(ranges == 0, 1.0, ranges)
+        self.outputs: List[str] = [output["name"] for output in export["outputs"]]
+
+        index = {name: i for i, name in enumerate(self.inputs)}
+        self._f0 = np.array([output["f0"] for output in export["outputs"]],
+                            dtype=float)
+        self._max_order = 1
+        # Terms grouped by number of variables: (variable indices, orders,
+        # coefficient per output) arrays, so that each group is evaluated as
+        # a single matrix product
+        groups: Dict[int, Dict] = {}
+        for k, output in enumerate(export["outputs"]):
+            for term in output["terms"]:
+                group = groups.setdefault(
+                    len(term["variables"]),
+                    dict(variables=[], orders=[], coefficients=[]))
+                group["variables"].append([index[name] for name in term["variables"]])
+                group["orders"].append(term["orders"])
+                coefficients = np.zeros(len(self.outputs))
+                coefficients[k] = term["coefficient"]
+                group["coefficients"].append(coefficients)
+                self._max_order = max(self._max_order, *term["orders"])
+        self._groups = [
+            (np.array(group["variables"]), np.array(group["orders"]),
+             np.array(group["coefficients"]))
+            for group in groups.values()
+        ]
+
+    def evaluate(self, inputs: Mapping[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+        """Evaluates the surrogate at a set of data points.
+
+        Arguments:
+            inputs -- Values of each input of the surrogate, by name
+
+        Returns:
+            Values of each output, by name
+        """
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise ValueError(f"Missing surrogate inputs: {', '.join(missing)}")
+
+        x = np.column_stack([np.asarray(inputs[name], dtype=float)
+                             for name in self.inputs])
+        x = (x - self._minimum) / self._scale
+        # powers[:, i, k] = x_i ** k
+        powers = x[:, :, None] ** np.arange(self._max_order + 1)
+
+        y = np.tile(self._f0, (len(x), 1))
+        for variables, orders, coefficients in self._groups:
+            terms = np.prod(powers[:, variables, orders], axis=2)
+            y += terms @ coefficients
+        return {name: y[:, k] for k, name in enumerate(self.outputs)}
+
+
+class Surrogate_Store:
+    """Keeps the surrogates exported by the MoDS Agent, so that Evaluate
+    simulations loading them can run locally instead of as remote jobs.
+
+    Exports are downloaded once through an Agent_Bridge and, when a
+    directory is given, saved there as <surrogateID>.json. Loaded
+    surrogates are kept in an LRU cache, and the surrogates that could not
+    be downloaded are not requested again.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 32,
+                 bridge=None, export_saved: bool = False):
+        """Initialises the store.
+
+        Arguments:
+            directory    -- Directory of the exported surrogates (None to
+                            keep them in memory only)
+            max_entries  -- Maximum number of surrogates kept loaded
+            bridge       -- Agent_Bridge downloading the exports (defaults to
+                            a new Agent_Bridge)
+            export_saved -- Whether sessions export the surrogates saved by
+                            their simulations as soon as they finish (the
+                            agent must support surrogate downloads)
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.export_saved = export_saved
+        self._bridge = bridge
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[str, HDMR_Surrogate]" = OrderedDict()
+        self._unavailable = set()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, surrogateID: str, download: bool = True) -> Optional[HDMR_Surrogate]:
+        """Returns a surrogate, loading or downloading it if needed.
+
+        Arguments:
+            surrogateID (str) -- ID of the surrogate (i.e. the job ID of the
+                                 simulation that saved it)
+            download (bool)   -- Whether to download surrogates that were not
+                                 exported yet
+
+        Returns:
+            The surrogate (None if it is not available)
+        """
+        with self._lock:
+            surrogate = self._loaded.get(surrogateID)
+            if surrogate is not None:
+                self._loaded.move_to_end(surrogateID)
+                return surrogate
+
+        export = self._readExport(surrogateID)
+        if export is None and download:
+            export = self.export(surrogateID)
+        if export is None:
+            return None
+
+        surrogate = HDMR_Surrogate(export)
+        with self._lock:
+            self._loaded[surrogateID] = surrogate
+            while len(self._loaded) > self.max_entries:
+                self._loaded.popitem(last=False)
+        return surrogate
+
+    def export(self, surrogateID: str) -> Optional[Dict]:
+        """Downloads a surrogate from the MoDS Agent and saves it in the
+        directory of the store.
+
+        Arguments:
+            surrogateID (str) -- ID of the surrogate
+
+        Returns:
+            The exported surrogate (None if the download failed, now or
+            before)
+        """
+        with self._lock:
+            if surrogateID in self._unavailable:
+                return None
+        if self._bridge is None:
+            from osp.wrappers.sim_cmcl_mods_wrapper.agent_bridge import Agent_Bridge
+            self._bridge = Agent_Bridge()
+        export = self._bridge.downloadSurrogate(surrogateID)
+        if export is None:
+            with self._lock:
+                self._unavailable.add(surrogateID)
+            return None
+        if self.directory is not None:
+            with open(self._path(surrogateID), "w") as exportFile:
+                json.dump(export, exportFile)
+        logger.info("Surrogate %s exported", surrogateID)
+        return export
+
+    def _readExport(self, surrogateID: str) -> Optional[Dict]:
+        if self.directory is None or not os.path.exists(self._path(surrogateID)):
+            return None
+        with open(self._path(surrogateID)) as exportFile:
+            return json.load(exportFile)
+
+    def _path(self, surrogateID: str) -> str:
+        return os.path.join(
+            self.directory, os.path.basename(surrogateID) + ".json")
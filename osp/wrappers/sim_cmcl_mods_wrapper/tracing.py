@@ -0,0 +1,174 @@
+import contextvars
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+# Spans are opened with the method names of OpenTelemetry tracers
+# (start_as_current_span, set_attribute), so that an OpenTelemetry tracer,
+# e.g. opentelemetry.trace.get_tracer(__name__), can be used wherever a
+# tracer of this module is expected.
+
+
+class No_Op_Span:
+    """Span recording nothing."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "No_Op_Span":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+class No_Op_Tracer:
+    """Tracer recording nothing, used by default."""
+
+    _span = No_Op_Span()
+
+    def start_as_current_span(self, name: str,
+                              attributes: Optional[Mapping[str, Any]] = None,
+                              **kwargs) -> No_Op_Span:
+        return self._span
+
+
+class Span_Record:
+    """Span recorded by a Memory_Tracer."""
+
+    def __init__(self, name: str, traceID: str, parent: Optional["Span_Record"],
+                 attributes: Optional[Mapping[str, Any]] = None):
+        self.name = name
+        self.traceID = traceID
+        self.spanID = uuid.uuid4().hex[:16]
+        self.parentID = parent.spanID if parent is not None else None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration of the span (seconds, None until it ends)."""
+        return None if self.end is None else self.end - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __repr__(self) -> str:
+        return f"<Span_Record {self.name} {self.duration}>"
+
+
+class Memory_Tracer:
+    """Tracer keeping the spans it records in memory, and optionally
+    forwarding them to another tracer (e.g. an OpenTelemetry one).
+    """
+
+    def __init__(self, max_spans: Optional[int] = 10000, forward=None):
+        """Initialises the tracer.
+
+        Arguments:
+            max_spans -- Maximum number of finished spans kept (the oldest
+                         ones are dropped first, None for no limit)
+            forward   -- Tracer also recording every span (None for none)
+        """
+        self.forward = forward
+        self._lock = threading.Lock()
+        self._spans: "deque[Span_Record]" = deque(maxlen=max_spans)
+        self._current: contextvars.ContextVar = contextvars.ContextVar(
+            f"current_span_{id(self)}", default=None)
+
+    @contextmanager
+    def start_as_current_span(self, name: str,
+                              attributes: Optional[Mapping[str, Any]] = None,
+                              **kwargs) -> Iterator[Span_Record]:
+        """Records a span lasting until the end of the with block, child of
+        the span current in the calling context."""
+        parent = self._current.get()
+        traceID = parent.traceID if parent is not None else uuid.uuid4().hex
+        span = Span_Record(name, traceID, parent, attributes)
+        token = self._current.set(span)
+        try:
+            if self.forward is None:
+                yield span
+            else:
+                with self.forward.start_as_current_span(
+                        name, attributes=attributes, **kwargs) as forwarded:
+                    yield _Forwarding_Span(span, forwarded)
+        finally:
+            self._current.reset(token)
+            span.end = time.perf_counter()
+            with self._lock:
+                self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span_Record]:
+        """Finished spans, in the order they ended."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        """Forgets all finished spans."""
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarises the finished spans.
+
+        Returns:
+            Dictionary of the total duration of the root spans ("total",
+            seconds), of the total duration ("phases", seconds) and number
+            ("counts") of the spans of each name, and of the sizes recorded
+            by the spans (attributes named *_bytes) summed by name ("sizes")
+        """
+        phases: Dict[str, float] = defaultdict(float)
+        counts: Dict[str, int] = defaultdict(int)
+        sizes: Dict[str, int] = defaultdict(int)
+        total = 0.0
+        for span in self.spans:
+            phases[span.name] += span.duration
+            counts[span.name] += 1
+            if span.parentID is None:
+                total += span.duration
+            for key, value in span.attributes.items():
+                if key.endswith("_bytes"):
+                    sizes[key] += value
+        return dict(total=total, phases=dict(phases), counts=dict(counts),
+                    sizes=dict(sizes))
+
+
+class _Forwarding_Span:
+    """Span of a Memory_Tracer forwarding its attributes to the span of
+    another tracer."""
+
+    def __init__(self, record: Span_Record, forwarded):
+        self._record = record
+        self._forwarded = forwarded
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._record.set_attribute(key, value)
+        self._forwarded.set_attribute(key, value)
+
+
+_default_tracer = No_Op_Tracer()
+_current_tracer: contextvars.ContextVar = contextvars.ContextVar(
+    "mods_tracer", default=_default_tracer)
+
+
+def currentTracer():
+    """Returns the tracer of the calling context (a No_Op_Tracer unless set
+    with useTracer())."""
+    return _current_tracer.get()
+
+
+@contextmanager
+def useTracer(tracer) -> Iterator[None]:
+    """Makes a tracer the current tracer of the calling context (and of the
+    tasks and copied contexts it starts) until the end of the with block."""
+    token = _current_tracer.set(tracer)
+    try:
+        yield
+    finally:
+        _current_tracer.reset(token)
@@ -23,6 +23,10 @@ setup(
     install_requires=[
         "osp-core==3.8.0",
     ],
+    extras_require={
+        # Incremental decoding of the output columns (typed_outputs)
+        "streaming": ["ijson"],
+    },
     packages=find_packages(exclude=["mods_mock_agent"]),
     test_suite="tests",
     entry_points={
@@ -3,6 +3,7 @@ import subprocess
 import signal
 import os
 import pytest
+import requests
 from osp.core.namespaces import mods
 
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -79,8 +80,35 @@ def mods_mock_agent():
     else:
         os.killpg(os.getpgid(agent_proc.pid), signal.SIGTERM)
 
+@pytest.fixture()
+def mock_agent_config():
+    """Returns a function changing the settings of the mock agent (see
+    mods_mock_agent/api/config.py), which are restored after the test."""
+    config_url = f"{os.environ['MODS_AGENT_BASE_URL']}/admin/config"
+
+    def configure(**settings):
+        response = requests.post(config_url, json=settings)
+        response.raise_for_status()
+        return response.json()
+
+    yield configure
+    requests.post(f"{config_url}/reset")
+
+@pytest.fixture()
+def slow_jobs(mock_agent_config):
+    """Makes the mock agent report jobs as running for one second."""
+    mock_agent_config(JOB_DURATION=1.0)
+    yield 1.0
+
 @pytest.fixture()
 def moo_data():
+    return make_moo_data()
+
+@pytest.fixture()
+def moo_batch():
+    return [make_moo_data() for _ in range(4)]
+
+def make_moo_data():
     moo_simulation = mods.MultiObjectiveSimulation()
     moo_algorithm = mods.Algorithm(name="algorithm1", type="MOO", maxNumberOfResults= 10)
     moo_algorithm.add(
@@ -120,6 +148,61 @@ def moo_data():
     moo_simulation.add(input_data)
     return moo_simulation
 
+@pytest.fixture()
+def evaluate_data():
+    return make_evaluate_data(25)
+
+def make_evaluate_data(num_points):
+    evaluate_simulation = mods.EvaluateSurrogate()
+    evaluate_simulation.add(
+        mods.Algorithm(name="algorithm1", type="GenSurrogateAlg",
+                       surrogateToLoad="mods-sim-1", saveSurrogate=False))
+    evaluate_algorithm = mods.Algorithm(
+        name="algorithm2", type="SamplingAlg", saveSurrogate=False)
+    evaluate_algorithm.add(
+        mods.Variable(name="var1", type="input"),
+        mods.Variable(name="var2", type="input"),
+        mods.Variable(name="var3", type="output"),
+    )
+    evaluate_simulation.add(evaluate_algorithm)
+
+    input_data = mods.InputData()
+    for i in range(num_points):
+        data_point = mods.DataPoint()
+        data_point.add(
+            mods.DataPointItem(name="var1", value=i),
+            mods.DataPointItem(name="var2", value=i + 0.5),
+            rel=mods.hasPart,
+        )
+        input_data.add(data_point, rel=mods.hasPart)
+
+    evaluate_simulation.add(input_data)
+    return evaluate_simulation
+
+@pytest.fixture()
+def mcdm_data():
+    mcdm_simulation = mods.MultiCriteriaDecisionMaking()
+    mcdm_algorithm = mods.Algorithm(name="algorithm1", type="MCDM")
+    mcdm_algorithm.add(
+        mods.Variable(name="ModelId", type="input"),
+        mods.Variable(name="Cost1", type="output",
+                      objective="Minimise", maximum="18.0", weight="1"),
+        mods.Variable(name="Cost2", type="output",
+                      objective="Minimise", maximum="0.1", weight="3"),
+    )
+    mcdm_simulation.add(mcdm_algorithm)
+
+    input_data = mods.InputData()
+    for row in [[1.0, 20.0, 0.001], [2.0, 17.0, 0.003], [3.0, 16.0, 0.03],
+                [4.0, 10.0, 0.09], [5.0, 5.0, 0.1], [6.0, 12.0, 0.095]]:
+        data_point = mods.DataPoint()
+        for header, value in zip(["ModelId", "Cost1", "Cost2"], row):
+            data_point.add(mods.DataPointItem(name=header, value=value),
+                           rel=mods.hasPart)
+        input_data.add(data_point, rel=mods.hasPart)
+    mcdm_simulation.add(input_data)
+    return mcdm_simulation
+
 @pytest.fixture()
 def moo_analytic_data():
     moo_simulation = mods.MultiObjectiveSimulation()
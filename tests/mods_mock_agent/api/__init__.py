@@ -1,7 +1,9 @@
 """This module defines flask app factory method"""
 
 import logging
-from flask import Flask
+from flask import Config, Flask
+from jobs import Job_Store
+from settings import createRandom
 from routes.public import mods_mock_agent_bp
 from routes.admin import admin_api
 
@@ -18,11 +20,22 @@ def create_app(config=None):
     """Create and configure an instance of the Flask application."""
     app = Flask(__name__)
 
+    app.config.from_pyfile("config.py", silent=False)
     if config is not None:
         # load the test config if passed in
         app.config.from_mapping(config)
-    else:
-        app.config.from_pyfile("config.py", silent=False)
+
+    # Settings restored by POST /admin/config/reset
+    defaults = Config(app.root_path)
+    defaults.from_pyfile("config.py", silent=False)
+    app.extensions["mods_defaults"] = {
+        key: app.config[key] for key in defaults}
+
+    # Settings changed at run time are kept in the job store, shared by the
+    # workers; those of a former run of the agent are discarded
+    app.extensions["mods_jobs"] = Job_Store(app.config["JOB_STORE"])
+    app.extensions["mods_jobs"].resetSettings()
+    app.extensions["mods_random"] = createRandom()
 
     # Register Blueprints
     app.register_blueprint(mods_mock_agent_bp, url_prefix="/")
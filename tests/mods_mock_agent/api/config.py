@@ -0,0 +1,46 @@
+import os
+
+# Every setting can be given as an environment variable (MODS_MOCK_<NAME>),
+# and changed while the agent runs with POST /admin/config.
+
+# Mean time (seconds) a submitted job takes before its outputs are available
+JOB_DURATION = float(os.environ.get("MODS_MOCK_JOB_DURATION", 0))
+
+# Distribution of the job durations: "fixed", "uniform" (JOB_DURATION plus
+# or minus JOB_DURATION_SPREAD), "exponential" or "lognormal" (with a
+# standard deviation of JOB_DURATION_SPREAD for the log of the duration)
+JOB_DURATION_DISTRIBUTION = os.environ.get(
+    "MODS_MOCK_JOB_DURATION_DISTRIBUTION", "fixed")
+JOB_DURATION_SPREAD = float(os.environ.get("MODS_MOCK_JOB_DURATION_SPREAD", 0))
+
+# Number of data points returned by MOO, MOOonly, MCDM and HDMR jobs
+PARETO_POINTS = int(os.environ.get("MODS_MOCK_PARETO_POINTS", 10))
+
+# Number of data points returned by Evaluate jobs (0 for as many as the
+# job has input data points, echoing them)
+EVALUATE_POINTS = int(os.environ.get("MODS_MOCK_EVALUATE_POINTS", 0))
+
+# Highest order of the sensitivities returned by Sensitivity jobs (1 or 2)
+SENSITIVITY_ORDER = int(os.environ.get("MODS_MOCK_SENSITIVITY_ORDER", 1))
+
+# Fractions of the submissions rejected with a 500 error, of the output
+# requests answered with a 503 error, and of the jobs finishing with an
+# error message
+SUBMIT_ERROR_RATE = float(os.environ.get("MODS_MOCK_SUBMIT_ERROR_RATE", 0))
+POLL_ERROR_RATE = float(os.environ.get("MODS_MOCK_POLL_ERROR_RATE", 0))
+JOB_ERROR_RATE = float(os.environ.get("MODS_MOCK_JOB_ERROR_RATE", 0))
+
+# Maximum number of jobs kept (the oldest ones are dropped first), and time
+# (seconds) a job is kept once finished
+MAX_JOBS = int(os.environ.get("MODS_MOCK_MAX_JOBS", 10000))
+JOB_TTL = float(os.environ.get("MODS_MOCK_JOB_TTL", 3600))
+
+# sqlite database holding the jobs and the settings changed at run time,
+# shared by the workers of a multi-worker server, e.g.
+# gunicorn -w 4 --threads 8 --preload '__init__:create_app()' (None to keep
+# them in memory, for a single worker; only read on start up)
+JOB_STORE = os.environ.get("MODS_MOCK_JOB_STORE")
+
+# Seed of the random durations and errors (None for a random seed). With a
+# JOB_STORE, each worker combines it with its process ID
+RANDOM_SEED = os.environ.get("MODS_MOCK_RANDOM_SEED")
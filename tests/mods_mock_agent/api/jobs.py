@@ -0,0 +1,126 @@
+"""This module defines the storage of the mock agent jobs"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class Job_Store:
+    """Jobs of the mock agent, by job ID: the time their outputs become
+    available and the outputs.
+
+    At most max_jobs jobs are kept, the oldest ones being dropped first, and
+    jobs are dropped ttl seconds after finishing. Jobs are kept in memory,
+    or in a sqlite database when a path is given, so that the workers of a
+    multi-worker server share them.
+
+    The settings changed at run time (POST /admin/config) are kept along
+    with the jobs, so that they apply to every worker as well.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        # Settings overriding the defaults, and number of times the random
+        # generators were reseeded
+        self._settings = ({}, 0)
+        if path is not None:
+            with self._connect() as database:
+                database.execute("PRAGMA journal_mode=WAL")
+                database.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs ("
+                    "jobId TEXT PRIMARY KEY, readyTime REAL, outputs TEXT)")
+                database.execute(
+                    "CREATE TABLE IF NOT EXISTS settings ("
+                    "id INTEGER PRIMARY KEY CHECK (id = 0), "
+                    "overrides TEXT, seedVersion INTEGER)")
+                database.execute(
+                    "INSERT OR IGNORE INTO settings VALUES (0, '{}', 0)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def put(self, jobId, readyTime, outputs, maxJobs, ttl):
+        """Stores a job, dropping the expired jobs and the oldest ones
+        beyond maxJobs."""
+        now = time.time()
+        if self.path is None:
+            with self._lock:
+                self._jobs[jobId] = (readyTime, outputs)
+                while self._jobs and (
+                        len(self._jobs) > maxJobs
+                        or next(iter(self._jobs.values()))[0] + ttl < now):
+                    self._jobs.popitem(last=False)
+            return
+
+        with self._connect() as database:
+            database.execute("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)",
+                             (jobId, readyTime, json.dumps(outputs)))
+            database.execute("DELETE FROM jobs WHERE readyTime + ? < ?",
+                             (ttl, now))
+            database.execute(
+                "DELETE FROM jobs WHERE rowid <= "
+                "(SELECT MAX(rowid) FROM jobs) - ?", (maxJobs,))
+
+    def get(self, jobId, ttl):
+        """Returns the ready time and outputs of a job (None if it is
+        unknown or expired)."""
+        if self.path is None:
+            with self._lock:
+                job = self._jobs.get(jobId)
+        else:
+            with self._connect() as database:
+                row = database.execute(
+                    "SELECT readyTime, outputs FROM jobs WHERE jobId = ?",
+                    (jobId,)).fetchone()
+            job = None if row is None else (row[0], json.loads(row[1]))
+        if job is None or job[0] + ttl < time.time():
+            return None
+        return job
+
+    def __len__(self):
+        if self.path is None:
+            with self._lock:
+                return len(self._jobs)
+        with self._connect() as database:
+            return database.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def settings(self):
+        """Returns the settings overriding the defaults, and the number of
+        times the random generators were reseeded."""
+        if self.path is None:
+            with self._lock:
+                overrides, seedVersion = self._settings
+                return dict(overrides), seedVersion
+        with self._connect() as database:
+            overrides, seedVersion = database.execute(
+                "SELECT overrides, seedVersion FROM settings").fetchone()
+        return json.loads(overrides), seedVersion
+
+    def updateSettings(self, update, reseed=False):
+        """Overrides some settings, for every worker; the random generators
+        are reseeded if reseed is set."""
+        self._changeSettings(lambda overrides: {**overrides, **update}, reseed)
+
+    def resetSettings(self):
+        """Restores the defaults of all settings, and reseeds the random
+        generators."""
+        self._changeSettings(lambda overrides: {}, True)
+
+    def _changeSettings(self, change, reseed):
+        if self.path is None:
+            with self._lock:
+                overrides, seedVersion = self._settings
+                self._settings = (change(overrides), seedVersion + reseed)
+            return
+
+        with self._connect() as database:
+            # Read and write the settings in one transaction
+            database.execute("BEGIN IMMEDIATE")
+            overrides, seedVersion = database.execute(
+                "SELECT overrides, seedVersion FROM settings").fetchone()
+            database.execute(
+                "UPDATE settings SET overrides = ?, seedVersion = ?",
+                (json.dumps(change(json.loads(overrides))), seedVersion + reseed))
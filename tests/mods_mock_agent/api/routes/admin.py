@@ -1,4 +1,7 @@
-from flask import Blueprint
+"""Thid module defines the app public and private routes"""
+from flask import Blueprint, current_app, request
+from routes.public import JOB_DURATION_DISTRIBUTIONS
+from settings import agentSettings
 
 admin_api = Blueprint("admin_api", __name__)
 
@@ -6,3 +9,59 @@ admin_api = Blueprint("admin_api", __name__)
 @admin_api.route("/")
 def main():
     return "Hello admin!"
+
+
+def invalidSetting(key, value, default):
+    """Returns why a setting cannot be updated to the given value (None if
+    it can)."""
+    if key == "JOB_STORE":
+        return "JOB_STORE is only read on start up"
+    if isinstance(value, bool):
+        return f"{key} must not be a boolean"
+    if key == "RANDOM_SEED":
+        valid = value is None or isinstance(value, (int, str))
+    elif isinstance(default, float):
+        valid = isinstance(value, (int, float))
+    else:
+        valid = isinstance(value, type(default))
+    if not valid:
+        return f"Invalid {key}: {value!r}"
+    if key == "JOB_DURATION_DISTRIBUTION" and value not in JOB_DURATION_DISTRIBUTIONS:
+        return f"Unknown distribution: {value}"
+    return None
+
+
+@admin_api.route("/config", methods=["GET", "POST"])
+def config():
+    """Shows the mock agent settings, or updates them from a JSON body,
+    e.g. {"JOB_DURATION": 2.5, "JOB_DURATION_DISTRIBUTION": "exponential"}.
+
+    The updates apply to every worker of a multi-worker server."""
+    if request.method == "POST":
+        update = request.get_json(silent=True)
+        if not isinstance(update, dict):
+            return {"error": "Expected a JSON object of settings"}, 400
+        defaults = current_app.extensions["mods_defaults"]
+        unknown = set(update) - set(defaults)
+        if unknown:
+            return {"error": f"Unknown settings: {sorted(unknown)}"}, 400
+        for key, value in update.items():
+            error = invalidSetting(key, value, defaults[key])
+            if error is not None:
+                return {"error": error}, 400
+        current_app.extensions["mods_jobs"].updateSettings(
+            update, reseed="RANDOM_SEED" in update)
+    return agentSettings(), 200
+
+
+@admin_api.route("/config/reset", methods=["POST"])
+def resetConfig():
+    """Restores the settings the mock agent started with."""
+    current_app.extensions["mods_jobs"].resetSettings()
+    return agentSettings(), 200
+
+
+@admin_api.route("/jobs", methods=["GET"])
+def jobs():
+    """Shows the number of jobs stored."""
+    return {"jobs": len(current_app.extensions["mods_jobs"])}, 200
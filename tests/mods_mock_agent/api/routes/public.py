@@ -1,51 +1,183 @@
 import logging
-from flask import Blueprint, request
+from flask import Blueprint, abort, current_app, request
+from settings import agentRandom, agentSettings
+from itertools import combinations
+import gzip
 import json
+import math
+import time
 import uuid
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 # Blueprint Configuration
 mods_mock_agent_bp = Blueprint("mods_mock_agent_bp", __name__)
 
-JOB_INPUTS = {}
+# Values of the columns of the data points returned by MOO, MOOonly, MCDM
+# and HDMR jobs, by input position
+PARETO_VALUES = [2, 1, 5, 7, 1, 0.1]
+
+# Distributions of the job durations (see config.py)
+JOB_DURATION_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+def readQuery():
+    """Reads the job input JSON from the query string (GET) or from the
+    optionally compressed, request body (POST)."""
+    if request.method == "GET":
+        return json.loads(request.args["query"])
+
+    body = request.get_data()
+    encoding = request.headers.get("Content-Encoding")
+    if encoding == "gzip":
+        body = gzip.decompress(body)
+    elif encoding == "zstd":
+        if zstandard is None:
+            abort(415, "zstd encoded requests require the zstandard package")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    return json.loads(body)
+
+
+def jobDuration(config, rng):
+    """Draws the duration of a new job from the configured distribution."""
+    mean = config["JOB_DURATION"]
+    spread = config["JOB_DURATION_SPREAD"]
+    distribution = config["JOB_DURATION_DISTRIBUTION"]
+    if mean <= 0 or distribution == "fixed":
+        return max(mean, 0)
+    if distribution == "uniform":
+        return max(rng.uniform(mean - spread, mean + spread), 0)
+    if distribution == "exponential":
+        return rng.expovariate(1 / mean)
+    if distribution == "lognormal":
+        return rng.lognormvariate(math.log(mean) - spread ** 2 / 2, spread)
+    abort(500, f"Unknown job duration distribution: {distribution}")
+
+
+def paretoOutputs(inputs, numPoints):
+    """Returns numPoints data points of constant values, one column per
+    input."""
+    return [
+        {"name": input["name"],
+         "values": [PARETO_VALUES[k % len(PARETO_VALUES)]] * numPoints}
+        for k, input in enumerate(inputs)
+    ]
+
+
+def evaluateOutputs(inputs, numPoints):
+    """Returns the input data points (identity surrogate), repeated or cut
+    to numPoints data points unless it is 0."""
+    outputs = []
+    for input in inputs:
+        values = [float(value) for value in input.get("values", [])]
+        if numPoints > 0:
+            values = [values[i % len(values)] if values else 0.0
+                      for i in range(numPoints)]
+        outputs.append({"name": input["name"], "values": values})
+    return outputs
+
 
+def sensitivityOutputs(query, order):
+    """Returns the sensitivities of every output variable to the input
+    variables (and to their pairs, from order 2)."""
+    variables = [variable for algorithm in query.get("Algorithms", [])
+                 for variable in algorithm.get("variables", [])]
+    inputNames = [variable["name"] for variable in variables
+                  if variable.get("type") == "input"]
+    if not inputNames:
+        inputNames = [input["name"] for input in query["Inputs"]]
+    outputNames = [variable["name"] for variable in variables
+                   if variable.get("type") == "output"] or ["output"]
 
-# Show an instructional message at the app root
-@mods_mock_agent_bp.route("/request", methods=["GET"])
+    labels = [{"order": 1, "values": inputNames}]
+    if order >= 2:
+        labels.append({"order": 2, "values": [
+            f"{first} {second}" for first, second in combinations(inputNames, 2)]})
+    return [
+        {"name": name,
+         "labels": labels,
+         "values": [{"order": label["order"],
+                     "values": [1 / (k + i + 1) for i in range(len(label["values"]))]}
+                    for label in labels]}
+        for k, name in enumerate(outputNames)
+    ]
+
+
+@mods_mock_agent_bp.route("/request", methods=["GET", "POST"])
 def runSimulation():
-    # logger.info(request.args)
-    query = json.loads(request.args["query"])
+    config = agentSettings()
+    rng = agentRandom()
+    if rng.random() < config["SUBMIT_ERROR_RATE"]:
+        return {"error": "Injected submission error"}, 500
+
+    query = readQuery()
     inputs = query["Inputs"]
+    simulationType = query.get("SimulationType")
 
-    outputs = {}
-    outputs["Outputs"] = []
-    outputs["Outputs"].extend(
-        [
-            {"name": inputs[0]["name"], "values": [2]*10},
-            {"name": inputs[1]["name"], "values": [1]*10},
-            {"name": inputs[2]["name"], "values": [5]*10},
-            {"name": inputs[3]["name"], "values": [7]*10},
-            {"name": inputs[4]["name"], "values": [1]*10},
-            {"name": inputs[5]["name"], "values": [0.1]*10}
-        ]
-    )
     jobId = str(uuid.uuid4())
-    JOB_INPUTS[jobId] = outputs
+    outputs = {"jobID": jobId, "SimulationType": simulationType}
+    if rng.random() < config["JOB_ERROR_RATE"]:
+        outputs["message"] = "Job finished with an error (injected)"
+    elif simulationType == "Evaluate":
+        outputs["Outputs"] = evaluateOutputs(inputs, config["EVALUATE_POINTS"])
+    elif simulationType == "Sensitivity":
+        outputs["Sensitivities"] = sensitivityOutputs(
+            query, config["SENSITIVITY_ORDER"])
+    else:
+        outputs["Outputs"] = paretoOutputs(inputs, config["PARETO_POINTS"])
+
+    readyTime = time.time() + jobDuration(config, rng)
+    current_app.extensions["mods_jobs"].put(
+        jobId, readyTime, outputs, config["MAX_JOBS"], config["JOB_TTL"])
     return {"jobID": jobId}, 200
 
 
-# Show an instructional message at the app root
 @mods_mock_agent_bp.route("/output/request", methods=["GET"])
 def getOutputs():
-    # logger.info(request.args)
+    config = agentSettings()
+    if agentRandom().random() < config["POLL_ERROR_RATE"]:
+        return {"error": "Injected output request error"}, 503
+
     query = json.loads(request.args["query"])
-    jobId = query["jobID"]
-    outputs = {}
-    try:
-        outputs = JOB_INPUTS[jobId]
-    except LookupError:
+    job = current_app.extensions["mods_jobs"].get(query["jobID"], config["JOB_TTL"])
+    if job is None:
         logger.error("Incorrect jobId.")
-        return outputs, 400
+        return {}, 400
+    readyTime, outputs = job
+    if time.time() < readyTime:
+        # Job still running
+        return "", 204
     return outputs, 200
+
+
+# Export of the surrogate saved by any job: var3 = 1 + 2 var1 - 0.5 var2^2
+# + 0.25 var1 var2, with var1 and var2 in [0, 1]
+SURROGATE_EXPORT = {
+    "inputs": [
+        {"name": "var1", "minimum": 0.0, "maximum": 1.0},
+        {"name": "var2", "minimum": 0.0, "maximum": 1.0},
+    ],
+    "outputs": [
+        {
+            "name": "var3",
+            "f0": 1.0,
+            "terms": [
+                {"variables": ["var1"], "orders": [1], "coefficient": 2.0},
+                {"variables": ["var2"], "orders": [2], "coefficient": -0.5},
+                {"variables": ["var1", "var2"], "orders": [1, 1], "coefficient": 0.25},
+            ],
+        }
+    ],
+}
+
+
+@mods_mock_agent_bp.route("/surrogate/request", methods=["GET"])
+def getSurrogate():
+    query = json.loads(request.args["query"])
+    return {"surrogateID": query["surrogateID"], **SURROGATE_EXPORT}, 200
@@ -0,0 +1,45 @@
+"""This module defines the settings of the mock agent, shared by its workers"""
+import os
+import random
+import threading
+from flask import current_app
+
+
+def createRandom():
+    """Returns the random generator state of a worker, seeded on first use
+    (see agentSettings)."""
+    return {"random": random.Random(), "seedVersion": None,
+            "lock": threading.Lock()}
+
+
+def workerSeed(settings):
+    """Returns the seed of the random generator of this worker. The workers
+    of a multi-worker server (sharing a JOB_STORE) combine the seed with
+    their process ID, so that they do not all draw the same sequence."""
+    seed = settings["RANDOM_SEED"]
+    if seed is None or settings["JOB_STORE"] is None:
+        return seed
+    return f"{seed}:{os.getpid()}"
+
+
+def agentSettings():
+    """Returns the current settings of the mock agent: the settings it
+    started with (see config.py), updated by POST /admin/config.
+
+    The updates are read from the job store, so that every worker of a
+    multi-worker server sees them, and the random generator of the worker
+    is reseeded when the seed was changed or the settings reset.
+    """
+    overrides, seedVersion = current_app.extensions["mods_jobs"].settings()
+    settings = {**current_app.extensions["mods_defaults"], **overrides}
+    state = current_app.extensions["mods_random"]
+    with state["lock"]:
+        if state["seedVersion"] != seedVersion:
+            state["random"].seed(workerSeed(settings))
+            state["seedVersion"] = seedVersion
+    return settings
+
+
+def agentRandom():
+    """Returns the random generator of this worker."""
+    return current_app.extensions["mods_random"]["random"]
@@ -0,0 +1,62 @@
+import json
+import pytest
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Agent_Transport, Submission_Mode)
+
+INPUTS = {
+    "SimulationType": "MOO",
+    "Inputs": [{"name": f"var{i}", "values": [0.1]} for i in range(1, 7)],
+}
+
+
+def test_transport_reuses_connections(monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLL_INTERVAL", 0)
+    transport = Agent_Transport(max_connections_per_host=2)
+
+    for _ in range(3):
+        outputs = Agent_Bridge(transport).runJob(json.dumps(INPUTS))
+        assert len(outputs["Outputs"]) == 6
+
+    stats = transport.stats()
+    assert stats["requests"] == 6
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 5
+    transport.close()
+
+
+def test_shared_transport():
+    assert Agent_Bridge().transport is Agent_Transport.shared()
+
+
+@pytest.mark.parametrize(
+    "submission_mode, compression",
+    [
+        (Submission_Mode.QUERY, None),
+        (Submission_Mode.BODY, None),
+        (Submission_Mode.BODY, "gzip"),
+        (Submission_Mode.AUTO, "gzip"),
+    ]
+)
+def test_submission_modes(submission_mode, compression, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLL_INTERVAL", 0)
+    monkeypatch.setattr(Agent_Bridge, "MAX_QUERY_URL_SIZE", 10)
+    bridge = Agent_Bridge(
+        submission_mode=submission_mode, compression=compression)
+
+    outputs = bridge.runJob(json.dumps(INPUTS))
+    assert [output["name"] for output in outputs["Outputs"]] == [
+        item["name"] for item in INPUTS["Inputs"]]
+
+
+def test_auto_submission_url_size(monkeypatch):
+    bridge = Agent_Bridge(submission_mode=Submission_Mode.AUTO)
+    jsonString = json.dumps(INPUTS)
+    url = bridge.buildSubmissionURL(jsonString)
+    # The URL is longer than the JSON, as both the base URL and the
+    # percent-encoding of the JSON count
+    monkeypatch.setattr(Agent_Bridge, "MAX_QUERY_URL_SIZE", len(url) - 1)
+    assert len(jsonString) < Agent_Bridge.MAX_QUERY_URL_SIZE
+    assert bridge.useRequestBody(url)
+
+    monkeypatch.setattr(Agent_Bridge, "MAX_QUERY_URL_SIZE", len(url))
+    assert not bridge.useRequestBody(url)
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import threading
+from osp.core.namespaces import mods, cuba
+import osp.core.utils.simple_search as search
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import Async_Agent_Bridge
+
+# Set the level of the logger in OSP Core
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def test_moo_async(moo_data, monkeypatch):
+    logger.info("################  Start: MoDS MOO Async Example ################")
+    monkeypatch.setattr(Async_Agent_Bridge, "POLL_INTERVAL", 0)
+
+    async def run_sessions(num_sessions):
+        sessions = [ms.MoDS_Session() for _ in range(num_sessions)]
+        wrappers = []
+        for session in sessions:
+            wrapper = cuba.wrapper(session=session)
+            wrapper.add(moo_data, rel=cuba.relationship)
+            wrappers.append(wrapper)
+        await asyncio.gather(*(session.arun() for session in sessions))
+        return wrappers
+
+    wrappers = asyncio.run(run_sessions(3))
+
+    for wrapper in wrappers:
+        pareto_front = search.find_cuds_objects_by_oclass(
+            mods.ParetoFront, wrapper, rel=None
+        )
+        assert len(pareto_front[0].get(oclass=mods.DataPoint)) == 10
+
+
+def test_shared_executor(monkeypatch):
+    monkeypatch.setattr(Async_Agent_Bridge, "_executor", None)
+    barrier = threading.Barrier(8)
+    executors = []
+
+    def first_call():
+        barrier.wait()
+        executors.append(Async_Agent_Bridge.executor())
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Concurrent first calls share a single executor
+    assert len({id(executor) for executor in executors}) == 1
+    executors[0].shutdown()
@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from osp.core.namespaces import mods, cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import Agent_Bridge, Fixed_Polling
+
+# Set the level of the logger in OSP Core
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def test_run_many(moo_batch, monkeypatch):
+    logger.info("################  Start: MoDS MOO Batch Example ################")
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", Fixed_Polling(0.1, 60))
+
+    # A simulation without Algorithm fails to translate
+    invalid_simulation = mods.MultiObjectiveSimulation()
+    invalid_simulation.add(mods.InputData())
+
+    with ms.MoDS_Session() as session:
+        wrapper = cuba.wrapper(session=session)
+        simulations = wrapper.add(
+            *moo_batch, invalid_simulation, rel=cuba.relationship)
+        successes = session.run_many(simulations, max_concurrency=2)
+
+        assert successes == [True] * len(moo_batch) + [False]
+        for simulation in simulations[:-1]:
+            pareto_front = simulation.get(oclass=mods.ParetoFront)
+            assert len(pareto_front) == 1
+            assert len(pareto_front[0].get(oclass=mods.DataPoint)) == 10
+            assert len(simulation.get(oclass=mods.JobID)) == 1
+        assert not simulations[-1].get(oclass=mods.ParetoFront)
+
+        job_ids = {
+            simulation.get(oclass=mods.JobID)[0].get(oclass=mods.JobIDItem)[0].name
+            for simulation in simulations[:-1]
+        }
+        assert len(job_ids) == len(moo_batch)
+
+
+def test_run_many_in_event_loop(moo_batch, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", Fixed_Polling(0.1, 60))
+
+    async def notebook_cell():
+        # e.g. Jupyter, which runs the cells in an event loop
+        with ms.MoDS_Session() as session:
+            wrapper = cuba.wrapper(session=session)
+            simulations = wrapper.add(*moo_batch, rel=cuba.relationship)
+            return session.run_many(simulations)
+
+    assert asyncio.run(notebook_cell()) == [True] * len(moo_batch)
@@ -36,3 +36,173 @@ def test_cuds_adaptor(cuds: Cuds, ref_data_path: str):
     #json.dump(json_data_dict, open(ref_data_path, 'w'), indent=4)
 
     assert json_data_dict == json_ref_data_dict
+
+
+@pytest.mark.parametrize(
+    "cuds", [lazy_fixture("moo_data"), lazy_fixture("moo_analytic_data")]
+)
+def test_data_point_columns(cuds: Cuds):
+    from collections import defaultdict
+    from osp.core.namespaces import mods
+
+    # Table built item by item through the Cuds API
+    expected = defaultdict(list)
+    for datum in cuds_adaptor.CUDS_Adaptor.findAll(mods.DataPoint, cuds):
+        for item in datum.get(oclass=mods.DataPointItem):
+            expected[item.name].append(item.value)
+
+    columns = cuds_adaptor.CUDS_Adaptor.dataPointColumns(cuds)
+
+    assert json.dumps(columns) == json.dumps(expected)
+
+
+def test_data_point_columns_unnamed_item():
+    from osp.core.namespaces import mods
+
+    simulation = mods.MultiObjectiveSimulation()
+    input_data = mods.InputData()
+    data_point = mods.DataPoint()
+    item = mods.DataPointItem(name="var1", value=0.5)
+    data_point.add(item, rel=mods.hasPart)
+    input_data.add(data_point, rel=mods.hasPart)
+    simulation.add(input_data)
+    # e.g. an item loaded from a graph where its name is missing
+    simulation.session.graph.remove((item.iri, mods.name.iri, None))
+
+    with pytest.raises(ValueError, match="DataPointItem name"):
+        cuds_adaptor.CUDS_Adaptor.dataPointColumns(simulation)
+
+
+@pytest.mark.parametrize(
+    "template, container_oclass",
+    [
+        (engtempl.Engine_Template.MOO, "ParetoFront"),
+        (engtempl.Engine_Template.Evaluate, "OutputData"),
+    ]
+)
+def test_to_cuds_data_points(moo_data: Cuds, template, container_oclass: str):
+    from osp.core.namespaces import mods
+
+    json_results = {
+        "jobID": "job",
+        "Outputs": [
+            {"name": "var4", "values": [0.1, 0.2, 0.3]},
+            {"name": "var5", "values": [1.1, 1.2, 1.3]},
+        ],
+    }
+    cuds_adaptor.CUDS_Adaptor.toCUDS(moo_data, json_results, template)
+
+    container, = moo_data.get(oclass=getattr(mods, container_oclass))
+    data_points = container.get(oclass=mods.DataPoint, rel=mods.hasPart)
+    rows = []
+    for data_point in data_points:
+        assert data_point.get(rel=mods.isPartOf) == [container]
+        items = {item.name: item.value
+                 for item in data_point.get(oclass=mods.DataPointItem)}
+        ranking = data_point.ranking if template == engtempl.Engine_Template.MOO else None
+        rows.append((ranking, items["var4"], items["var5"]))
+
+    if template == engtempl.Engine_Template.MOO:
+        assert sorted(rows) == [
+            (1, "0.1", "1.1"), (2, "0.2", "1.2"), (3, "0.3", "1.3")]
+    else:
+        assert sorted(rows) == [
+            (None, "0.1", "1.1"), (None, "0.2", "1.2"), (None, "0.3", "1.3")]
+
+
+
+@pytest.mark.parametrize(
+    "container_oclass, data_point_oclass, ranked",
+    [
+        ("ParetoFront", "RankedDataPoint", True),
+        ("OutputData", "DataPoint", False),
+    ]
+)
+def test_build_data_points(container_oclass: str, data_point_oclass: str,
+                           ranked: bool):
+    from rdflib import BNode, Graph
+    from rdflib.compare import isomorphic
+    from osp.core.namespaces import mods
+
+    json_outputs = [
+        {"name": "var4", "values": [0.1, 0.2, 0.3]},
+        {"name": "var5", "values": [1.1, 1.2, 1.3]},
+    ]
+
+    def subtree(simulation, container):
+        """Triples of the container and its parts, with blank nodes in
+        place of the CUDS IRIs."""
+        session_graph = simulation.session.graph
+        nodes = {simulation.iri: BNode()}
+        stack = [container.iri]
+        while stack:
+            node = stack.pop()
+            nodes[node] = BNode()
+            stack.extend(session_graph.objects(node, mods.hasPart.iri))
+        graph = Graph()
+        for node in nodes:
+            if node == simulation.iri:
+                continue
+            for _, predicate, obj in session_graph.triples((node, None, None)):
+                graph.add((nodes[node], predicate, nodes.get(obj, obj)))
+        return graph
+
+    # Built through the Cuds API, as toCUDS did before the triples were
+    # assembled up front
+    container_oclass = getattr(mods, container_oclass)
+    data_point_oclass = getattr(mods, data_point_oclass)
+    expected_simulation = mods.MultiObjectiveSimulation()
+    expected = container_oclass()
+    for i, row in enumerate(zip(*(output["values"] for output in json_outputs))):
+        data_point = (data_point_oclass(ranking=i + 1) if ranked
+                      else data_point_oclass())
+        for output, value in zip(json_outputs, row):
+            data_point.add(mods.DataPointItem(name=output["name"], value=value),
+                           rel=mods.hasPart)
+        expected.add(data_point)
+    expected = expected_simulation.add(expected)
+
+    simulation = mods.MultiObjectiveSimulation()
+    container = simulation.add(cuds_adaptor.CUDS_Adaptor.buildDataPoints(
+        simulation, container_oclass, data_point_oclass, json_outputs, ranked))
+
+    assert isomorphic(subtree(simulation, container),
+                      subtree(expected_simulation, expected))
+
+
+@pytest.mark.parametrize(
+    "cuds", [lazy_fixture("moo_data"), lazy_fixture("moo_analytic_data")]
+)
+def test_cuds_index(cuds: Cuds):
+    import osp.core.utils.simple_search as search
+    from osp.core.namespaces import mods
+    from osp.wrappers.sim_cmcl_mods_wrapper import CUDS_Index
+
+    # One traversal answers every lookup, in the order of simple_search
+    index = CUDS_Index(cuds)
+    for oclass in (mods.Simulation, mods.Algorithm, mods.Variable,
+                   mods.DataPoint, mods.DataPointItem, mods.AnalyticModel):
+        expected = search.find_cuds_objects_by_oclass(oclass, cuds, rel=mods.hasPart)
+        assert [item.uid for item in index.find(oclass)] == [
+            item.uid for item in expected]
+    assert index.find(mods.DataPoint) == index.find(mods.DataPoint)
+    assert index.iris(mods.Simulation) == [cuds.iri]
+
+
+def test_cuds_index_wrapper(moo_batch):
+    import osp.core.utils.simple_search as search
+    from osp.core.namespaces import cuba, mods
+    import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+    from osp.wrappers.sim_cmcl_mods_wrapper import CUDS_Index
+
+    # From a wrapper root, every relationship is followed
+    with ms.MoDS_Session() as session:
+        wrapper = cuba.wrapper(session=session)
+        wrapper.add(*moo_batch, rel=cuba.relationship)
+        index = CUDS_Index(wrapper)
+        for oclass in (mods.Simulation, mods.Algorithm, mods.DataPoint,
+                       mods.DataPointItem):
+            expected = search.find_cuds_objects_by_oclass(
+                oclass, wrapper, rel=cuba.relationship)
+            assert [item.uid for item in index.find(oclass)] == [
+                item.uid for item in expected]
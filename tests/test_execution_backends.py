@@ -0,0 +1,100 @@
+import json
+import pytest
+from osp.core.namespaces import mods, cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Execution_Backend, Fixed_Polling, HTTP_Backend, Job_State,
+    Process_Pool_Backend)
+
+INPUTS = {
+    "SimulationType": "MOO",
+    "Inputs": [{"name": f"var{i}", "values": [0.1]} for i in range(1, 7)],
+}
+
+
+class Constant_Backend(Execution_Backend):
+    """Returns the same outputs for every job, after a single poll."""
+
+    NAME = "constant"
+
+    def __init__(self):
+        super().__init__()
+        self.jobs = {}
+
+    def submit(self, jsonSimCase, template):
+        jobID = str(len(self.jobs))
+        self.jobs[jobID] = Job_State.SUBMITTED
+        return jobID
+
+    def poll(self, jobID):
+        state = self.jobs[jobID]
+        self.jobs[jobID] = Job_State.DONE
+        return state
+
+    def fetch(self, jobID):
+        del self.jobs[jobID]
+        return {
+            "jobID": f"constant-{jobID}",
+            "SimulationType": "MOO",
+            "Outputs": [{"name": f"var{i}", "values": [float(i)] * 3}
+                        for i in range(1, 7)],
+        }
+
+    def cancel(self, jobID):
+        self.jobs.pop(jobID, None)
+
+
+@pytest.fixture()
+def constant_backend(monkeypatch):
+    """Registers Constant_Backend, for the duration of the test."""
+    monkeypatch.setitem(Execution_Backend._registry, Constant_Backend.NAME,
+                        Constant_Backend)
+    return Constant_Backend
+
+
+def test_http_backend_steps(slow_jobs):
+    backend = HTTP_Backend(Fixed_Polling(0.01, 10000))
+    jobID = backend.submit(json.dumps(INPUTS), None)
+    assert backend.poll(jobID) == Job_State.RUNNING
+    backend.cancel(jobID)
+    with pytest.raises(KeyError):
+        backend.poll(jobID)
+
+    # The generic run() loop, rather than the bridge's
+    outputs = Execution_Backend.run(backend, json.dumps(INPUTS), None)
+    assert len(outputs["Outputs"]) == 6
+    assert not backend._jobs
+
+
+def test_registered_backend(moo_data, constant_backend, monkeypatch):
+    monkeypatch.setenv(Execution_Backend.BACKEND_ENV_VAR, Constant_Backend.NAME)
+    with pytest.raises(ValueError):
+        Execution_Backend.create("unknown")
+
+    with ms.MoDS_Session() as session:
+        assert isinstance(session.backend, Constant_Backend)
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(moo_data, rel=cuba.relationship)
+        session.run()
+
+        pareto_front = simulation.get(oclass=mods.ParetoFront)[0]
+        assert len(pareto_front.get(oclass=mods.RankedDataPoint)) == 3
+
+    metrics = session.backend.metrics.snapshot()
+    assert metrics["submitted"] == metrics["completed"] == 1
+    assert metrics["failed"] == 0
+    assert metrics["mean_latency"] > 0
+
+
+def test_backend_options(constant_backend):
+    polling = Fixed_Polling(0.01, 10)
+    with ms.MoDS_Session(backend="process", polling_strategy=polling,
+                         compression="gzip") as session:
+        assert isinstance(session.backend, Process_Pool_Backend)
+        fallback = session.backend.fallback
+        assert fallback.polling_strategy is polling
+        assert fallback.bridge_options["compression"] == "gzip"
+
+    with pytest.raises(ValueError, match="compression, polling_strategy"):
+        ms.MoDS_Session(backend=constant_backend.NAME, polling_strategy=polling,
+                        compression="gzip")
@@ -0,0 +1,43 @@
+import json
+import numpy as np
+import pytest
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Analytic_Model, CUDS_Adaptor, Formula, MoDS_Engine)
+from osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates import Engine_Template
+
+MOO = Engine_Template.MOO
+
+
+def test_formula():
+    formula = Formula.compile("exp(var1)-var2/2.0")
+    assert formula is Formula.compile("exp(var1)-var2/2.0")
+    assert formula.variables == {"var1", "var2"}
+
+    values = formula.evaluate({"var1": [0.0, 1.0], "var2": [1.0, 2.0]})
+    assert np.allclose(values, [0.5, np.e - 1.0])
+    assert np.allclose(Formula("-var1^2 + pi").evaluate({"var1": [2.0]}),
+                       [np.pi - 4.0])
+
+    with pytest.raises(ValueError):
+        formula.evaluate({"var1": [0.0]})
+    for text in ("__import__('os')", "var1.real", "var1 if var2 else 0",
+                 "'a' * 3", "exp(var1"):
+        with pytest.raises(ValueError):
+            Formula(text)
+
+
+def test_analytic_model(moo_analytic_data):
+    outputs = CUDS_Adaptor.evaluateAnalyticModel(moo_analytic_data)
+    jsonSimCase = MoDS_Engine().generateJSON(moo_analytic_data, MOO)
+
+    columns = CUDS_Adaptor.dataPointColumns(moo_analytic_data)
+    var1, var2, var3 = (np.array(columns[name], dtype=float)
+                        for name in ("var1", "var2", "var3"))
+    assert np.allclose(outputs["var4"], var1 * var2)
+    assert np.allclose(outputs["var5"], var1 + var3)
+    assert np.allclose(outputs["var6"], np.exp(var1) - var2 / 2.0)
+
+    prefilled = json.loads(Analytic_Model.fromJSON(jsonSimCase).prefill(jsonSimCase))
+    inputs = {input["name"]: input for input in prefilled["Inputs"]}
+    assert not any("formula" in input for input in inputs.values())
+    assert np.allclose(inputs["var6"]["values"], outputs["var6"])
@@ -0,0 +1,57 @@
+import json
+from osp.core.namespaces import mods, cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import Agent_Bridge, Input_Chunker
+
+SIM_CASE = {
+    "SimulationType": "Evaluate",
+    "Algorithms": [{"name": "algorithm1", "surrogateToLoad": "mods-sim-1"}],
+    "Inputs": [
+        {"name": "var1", "values": list(range(5))},
+        {"name": "var2", "values": list(range(10, 15))},
+    ],
+}
+
+
+def test_split_and_stitch():
+    chunker = Input_Chunker(chunk_size=2)
+    chunks = [json.loads(chunk) for chunk in chunker.split(json.dumps(SIM_CASE))]
+
+    assert [chunk["Inputs"][0]["values"] for chunk in chunks] == [
+        [0, 1], [2, 3], [4]]
+    assert all(chunk["Algorithms"] == SIM_CASE["Algorithms"] for chunk in chunks)
+
+    results = [{"jobID": str(i), "Outputs": chunk["Inputs"]}
+               for i, chunk in enumerate(chunks)]
+    stitched = chunker.stitch(results)
+    assert stitched["jobID"] == "0,1,2"
+    assert stitched["Outputs"] == SIM_CASE["Inputs"]
+
+    assert chunker.stitch(results[:2] + [None]) is None
+    assert Input_Chunker(chunk_size=5).split(json.dumps(SIM_CASE)) == [
+        json.dumps(SIM_CASE)]
+
+
+def test_split_formula_inputs():
+    formula = {"name": "var3", "formula": "var1 + var2"}
+    simCase = dict(SIM_CASE, Inputs=SIM_CASE["Inputs"] + [formula])
+    chunks = [json.loads(chunk)
+              for chunk in Input_Chunker(chunk_size=2).split(json.dumps(simCase))]
+
+    assert [chunk["Inputs"][1]["values"] for chunk in chunks] == [
+        [10, 11], [12, 13], [14]]
+    assert all(chunk["Inputs"][2] == formula for chunk in chunks)
+
+
+def test_chunked_evaluate(evaluate_data, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLL_INTERVAL", 0)
+    with ms.MoDS_Session(chunk_size=10, lazy_results=True) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(evaluate_data, rel=cuba.relationship)
+        session.run()
+
+        table = session.results(simulation)
+        assert list(table["var1"]) == list(range(25))
+        assert list(table["var2"]) == [i + 0.5 for i in range(25)]
+        job_id, = simulation.get(oclass=mods.JobID)
+        assert len(job_id.get(oclass=mods.JobIDItem)[0].name.split(",")) == 3
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import threading
+import time
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Async_Agent_Bridge, Fixed_Polling, Job_State)
+
+INPUTS = {
+    "SimulationType": "MOO",
+    "Inputs": [{"name": f"var{i}", "values": [0.1]} for i in range(1, 7)],
+}
+
+
+def test_job_events(slow_jobs):
+    bridge = Agent_Bridge(polling_strategy=Fixed_Polling(0.01, 10000))
+    events = []
+    bridge.addListener(events.append)
+
+    outputs = bridge.runJob(json.dumps(INPUTS))
+
+    assert outputs is not None
+    # Transitions only, not every poll
+    assert [event.state for event in events] == [
+        Job_State.SUBMITTED, Job_State.RUNNING, Job_State.DONE]
+    assert events[-1].attempt == bridge.attempts > 2
+    assert all(event.jobID == bridge.jobID for event in events)
+
+
+def test_many_polls(slow_jobs):
+    bridge = Agent_Bridge(polling_strategy=Fixed_Polling(0, 100000))
+    assert bridge.runJob(json.dumps(INPUTS)) is not None
+    assert bridge.state == Job_State.DONE
+
+
+def test_cancel_job(slow_jobs):
+    bridge = Agent_Bridge(polling_strategy=Fixed_Polling(10, 60))
+    threading.Timer(0.2, bridge.cancel).start()
+
+    start = time.monotonic()
+    assert bridge.runJob(json.dumps(INPUTS)) is None
+    assert time.monotonic() - start < 5
+    assert bridge.state == Job_State.CANCELLED
+
+
+def test_cancel_async_wait(slow_jobs):
+    bridge = Async_Agent_Bridge(polling_strategy=Fixed_Polling(10, 60))
+
+    async def run_and_cancel():
+        threading.Timer(0.2, bridge.cancel).start()
+        return await bridge.runJob(json.dumps(INPUTS))
+
+    start = time.monotonic()
+    assert asyncio.run(run_and_cancel()) is None
+    assert time.monotonic() - start < 5
+    assert bridge.state == Job_State.CANCELLED
+
+
+def test_cancel_async_job(slow_jobs):
+    bridge = Async_Agent_Bridge(polling_strategy=Fixed_Polling(10, 60))
+    events = []
+    bridge.addListener(events.append)
+
+    async def run_and_cancel():
+        task = asyncio.ensure_future(bridge.runJob(json.dumps(INPUTS)))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run_and_cancel())
+    assert [event.state for event in events] == [
+        Job_State.SUBMITTED, Job_State.CANCELLED]
@@ -0,0 +1,69 @@
+import time
+from osp.core.namespaces import mods, cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Fixed_Polling, Job_State, Request_Coalescer, as_completed,
+    wait_any)
+
+
+def test_submit_many(moo_batch, slow_jobs, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", Fixed_Polling(0.05, 1000))
+    with ms.MoDS_Session() as session:
+        wrapper = cuba.wrapper(session=session)
+        simulations = wrapper.add(*moo_batch, rel=cuba.relationship)
+
+        started = time.monotonic()
+        events = []
+        handles = [session.submit(simulation, listener=events.append)
+                   for simulation in simulations]
+        # Submitting does not wait for the jobs
+        assert time.monotonic() - started < slow_jobs
+        assert all(handle.jobID and not handle.done() for handle in handles)
+
+        assert wait_any(handles, timeout=0) is None
+        assert wait_any(handles) in handles
+
+        finished = list(as_completed(handles, timeout=30))
+        assert sorted(map(id, finished)) == sorted(map(id, handles))
+        for handle in finished:
+            assert handle.result()["jobID"] == handle.jobID
+            assert handle.state == Job_State.DONE
+            pareto_front = handle.simulation.get(oclass=mods.ParetoFront)
+            assert len(pareto_front) == 1
+            assert len(pareto_front[0].get(oclass=mods.DataPoint)) == 10
+
+        states = {event.state for event in events}
+        assert {Job_State.SUBMITTED, Job_State.RUNNING, Job_State.DONE} <= states
+
+
+def test_cancel_submitted(moo_data, slow_jobs, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", Fixed_Polling(10, 60))
+    with ms.MoDS_Session() as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(moo_data, rel=cuba.relationship)
+
+        handle = session.submit(simulation)
+        done = []
+        handle.add_done_callback(done.append)
+        assert handle.cancel()
+
+        assert handle.result(timeout=5) is None
+        assert handle.cancelled() and done == [handle]
+        assert not handle.cancel()
+        assert not simulation.get(oclass=mods.ParetoFront)
+
+
+def test_cancel_shared(moo_data, slow_jobs, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", Fixed_Polling(0.05, 1000))
+    with ms.MoDS_Session(coalescer=Request_Coalescer()) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(moo_data, rel=cuba.relationship)
+
+        handle = session.submit(simulation)
+        deadline = time.monotonic() + 5
+        while handle.state != Job_State.RUNNING and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Shared jobs cannot be cancelled once started
+        assert not handle.cancel()
+        assert handle.result(timeout=30) is not None
+        assert handle.state == Job_State.DONE and not handle.cancelled()
@@ -0,0 +1,42 @@
+import json
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Fixed_Polling, HTTP_Backend, Job_Journal, Job_State,
+    Result_Cache)
+from osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates import Engine_Template
+
+INPUTS = json.dumps({
+    "SimulationType": "MOO",
+    "Inputs": [{"name": f"var{i}", "values": [0.1]} for i in range(1, 7)],
+})
+MOO = Engine_Template.MOO
+POLLING = Fixed_Polling(0.05, 1000)
+
+
+def test_resume_after_restart(slow_jobs, tmp_path, monkeypatch):
+    journal = Job_Journal(str(tmp_path))
+    backend = HTTP_Backend(POLLING, journal=journal)
+    jobID = backend.submit(INPUTS, MOO)
+    assert backend.poll(jobID) == Job_State.RUNNING
+    journal.close()
+
+    # A new client process only knows the job from the journal
+    journal = Job_Journal(str(tmp_path))
+    assert [job["jobID"] for job in journal.pending()] == [jobID]
+
+    def noSubmission(self, jsonString):
+        raise AssertionError("The job should not be submitted again")
+    monkeypatch.setattr(Agent_Bridge, "sendSubmission", noSubmission)
+    outputs = HTTP_Backend(POLLING, journal=journal).run(INPUTS, MOO)
+
+    assert outputs["jobID"] == jobID
+    assert journal.pending() == []
+    assert journal.find(Result_Cache.key(INPUTS, MOO)) is None
+
+
+def test_resubmit_unknown_job(tmp_path):
+    journal = Job_Journal(str(tmp_path))
+    journal.record(Result_Cache.key(INPUTS, MOO), "unknown-job", MOO)
+
+    outputs = HTTP_Backend(POLLING, journal=journal).run(INPUTS, MOO)
+    assert outputs["jobID"] != "unknown-job"
+    assert journal.pending() == []
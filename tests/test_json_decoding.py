@@ -0,0 +1,73 @@
+import json
+from array import array
+import pytest
+import osp.wrappers.sim_cmcl_mods_wrapper.json_decoding as json_decoding
+from osp.wrappers.sim_cmcl_mods_wrapper import Agent_Bridge, Fixed_Polling, Json_Backend
+from osp.wrappers.sim_cmcl_mods_wrapper.json_decoding import Results_Decoder
+
+RESULTS = {
+    "jobID": "1",
+    "Outputs": [
+        {"name": "ints", "values": [1, 2, 3]},
+        {"name": "floats", "values": [1, 2.5, -3e-3]},
+        {"name": "labels", "values": ["a", 1, None]},
+        {"name": "mixed", "values": [1, 2.5, "s"]},
+        {"values": [[1, 2], {"values": [3]}, 3], "name": "nested"},
+    ],
+    "message": {"text": "done", "codes": [1, 2]},
+}
+
+
+def chunked(results, size=7):
+    body = json.dumps(results).encode("utf-8")
+    return (body[i:i + size] for i in range(0, len(body), size))
+
+
+@pytest.mark.parametrize("name", Json_Backend.BACKENDS)
+def test_json_backend(name):
+    if name != "json":
+        pytest.importorskip(name)
+    backend = Json_Backend(name)
+    assert backend.loads(json.dumps(RESULTS).encode("utf-8")) == RESULTS
+    assert json.loads(backend.dumps({"values": array("d", [0.5])})) == {
+        "values": [0.5]}
+
+
+def test_decode_results():
+    assert Results_Decoder().decode(chunked(RESULTS)) == RESULTS
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_decode_typed_outputs(monkeypatch, incremental):
+    if incremental:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(json_decoding, "ijson", None)
+
+    results = Results_Decoder(typed_outputs=True).decode(chunked(RESULTS))
+
+    ints, floats, labels, mixed, nested = (
+        output["values"] for output in results["Outputs"])
+    assert isinstance(ints, array) and ints.typecode == "q"
+    assert isinstance(floats, array) and floats.typecode == "d"
+    assert isinstance(labels, list)
+    assert json.loads(Json_Backend().dumps(results)) == RESULTS
+
+    # Columns that are not numeric keep the types of their values
+    assert [type(value) for value in mixed] == [int, float, str]
+    assert json.dumps(results["Outputs"][3:]) == json.dumps(RESULTS["Outputs"][3:])
+
+    no_outputs = {"jobID": "1", "message": "error"}
+    assert Results_Decoder(typed_outputs=True).decode(
+        chunked(no_outputs)) == no_outputs
+
+
+def test_bridge_typed_outputs():
+    bridge = Agent_Bridge(typed_outputs=True,
+                          polling_strategy=Fixed_Polling(interval=0.1))
+    outputs = bridge.runJob(json.dumps({
+        "SimulationType": "MOO",
+        "Inputs": [{"name": f"var{i}", "values": [0.1]} for i in range(1, 7)],
+    }))
+    assert all(isinstance(output["values"], array)
+               for output in outputs["Outputs"])
@@ -0,0 +1,74 @@
+import pytest
+import requests
+from osp.core.namespaces import cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Fixed_Polling, Metrics_Registry, Result_Cache)
+
+
+def test_exposition():
+    registry = Metrics_Registry()
+    counter = registry.counter("jobs_total", "Jobs")
+    counter.inc(template="MOO")
+    counter.inc(2, template="MOO")
+    counter.inc(template="say \"hi\"")
+    histogram = registry.histogram("latency_seconds", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+
+    assert registry.counter("jobs_total") is counter
+    assert counter.value(template="MOO") == 3
+    with pytest.raises(ValueError):
+        registry.histogram("jobs_total")
+    with pytest.raises(ValueError):
+        counter.inc(-1)
+
+    assert registry.exposition() == (
+        "# HELP jobs_total Jobs\n"
+        "# TYPE jobs_total counter\n"
+        "jobs_total{template=\"MOO\"} 3\n"
+        "jobs_total{template=\"say \\\"hi\\\"\"} 1\n"
+        "# TYPE latency_seconds histogram\n"
+        "latency_seconds_bucket{le=\"0.1\"} 1\n"
+        "latency_seconds_bucket{le=\"1.0\"} 2\n"
+        "latency_seconds_bucket{le=\"+Inf\"} 3\n"
+        "latency_seconds_sum 5.55\n"
+        "latency_seconds_count 3\n")
+
+
+def test_session_metrics(moo_data, slow_jobs, monkeypatch, tmp_path):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", Fixed_Polling(0.2, 100))
+    registry = Metrics_Registry()
+    cache = Result_Cache()
+    # The second simulation is found in the cache
+    for _ in range(2):
+        with ms.MoDS_Session(metrics=registry, cache=cache) as session:
+            wrapper = cuba.wrapper(session=session)
+            wrapper.add(moo_data, rel=cuba.relationship)
+            session.run()
+
+    labels = dict(template="MOO")
+    assert registry.counter("mods_jobs_submitted_total").value(**labels) == 1
+    assert registry.counter("mods_jobs_completed_total").value(**labels) == 2
+    assert registry.counter("mods_cache_hits_total").value() == 1
+    assert registry.histogram("mods_submit_latency_seconds").count(**labels) == 1
+    assert registry.histogram("mods_job_latency_seconds").sum(**labels) >= slow_jobs
+    assert registry.histogram("mods_polls_per_job").sum(**labels) > 1
+    assert registry.counter("mods_sent_bytes_total").value() > 0
+    assert registry.counter("mods_received_bytes_total").value() > 0
+    assert registry.counter("mods_cuds_created_total").value() > 0
+
+    server = registry.serve()
+    try:
+        url = "http://%s:%s/metrics" % server.server_address[:2]
+        response = requests.get(url)
+        assert response.status_code == 200
+        assert "mods_jobs_completed_total{template=\"MOO\"} 2" in response.text
+        assert requests.get(url + "/unknown").status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    path = tmp_path / "mods.prom"
+    registry.dump(str(path))
+    assert path.read_text() == response.text
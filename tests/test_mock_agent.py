@@ -0,0 +1,113 @@
+import importlib.util
+import json
+import os
+import time
+import requests
+from osp.wrappers.sim_cmcl_mods_wrapper import Agent_Bridge, Fixed_Polling
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def submit(query):
+    response = requests.get(f"{os.environ['MODS_AGENT_BASE_URL']}/request",
+                            params={"query": json.dumps(query)})
+    return response.status_code, response.json()
+
+
+def outputs(jobID):
+    return requests.get(f"{os.environ['MODS_AGENT_BASE_URL']}/output/request",
+                        params={"query": json.dumps({"jobID": jobID})})
+
+
+def make_query(simulation_type, num_inputs=3, num_points=5):
+    return {
+        "SimulationType": simulation_type,
+        "Algorithms": [{"name": "algorithm1", "variables": [
+            {"name": "x1", "type": "input"}, {"name": "x2", "type": "input"},
+            {"name": "y1", "type": "output"}, {"name": "y2", "type": "output"}]}],
+        "Inputs": [{"name": f"var{k}", "values": [str(i) for i in range(num_points)]}
+                   for k in range(num_inputs)],
+    }
+
+
+def test_job_durations(mock_agent_config):
+    mock_agent_config(JOB_DURATION=0.5, JOB_DURATION_DISTRIBUTION="uniform",
+                      JOB_DURATION_SPREAD=0.1, RANDOM_SEED=1)
+    _, job = submit(make_query("MOO"))
+    assert outputs(job["jobID"]).status_code == 204
+    time.sleep(0.7)
+    assert outputs(job["jobID"]).status_code == 200
+
+    config_url = f"{os.environ['MODS_AGENT_BASE_URL']}/admin/config"
+    response = requests.post(config_url, json={"JOB_DURATION_DISTRIBUTION": "normal"})
+    assert response.status_code == 400
+
+
+def test_output_sizes(mock_agent_config):
+    mock_agent_config(PARETO_POINTS=50, EVALUATE_POINTS=1000, SENSITIVITY_ORDER=2)
+
+    _, job = submit(make_query("MOO", num_inputs=2))
+    columns = outputs(job["jobID"]).json()["Outputs"]
+    assert [len(column["values"]) for column in columns] == [50, 50]
+
+    _, job = submit(make_query("Evaluate"))
+    columns = outputs(job["jobID"]).json()["Outputs"]
+    assert [column["values"][:6] for column in columns] == [
+        [0.0, 1.0, 2.0, 3.0, 4.0, 0.0]] * 3
+    assert {len(column["values"]) for column in columns} == {1000}
+
+    _, job = submit(make_query("Sensitivity"))
+    sensitivities = outputs(job["jobID"]).json()["Sensitivities"]
+    assert [sensitivity["name"] for sensitivity in sensitivities] == ["y1", "y2"]
+    assert sensitivities[0]["labels"] == [
+        {"order": 1, "values": ["x1", "x2"]}, {"order": 2, "values": ["x1 x2"]}]
+
+
+def test_error_injection(mock_agent_config):
+    bridge = Agent_Bridge(polling_strategy=Fixed_Polling(0.01, 100))
+    mock_agent_config(JOB_ERROR_RATE=1.0)
+    assert bridge.runJob(json.dumps(make_query("MOO"))) is None
+
+    mock_agent_config(JOB_ERROR_RATE=0, POLL_ERROR_RATE=1.0)
+    _, job = submit(make_query("MOO"))
+    assert outputs(job["jobID"]).status_code == 503
+
+    mock_agent_config(SUBMIT_ERROR_RATE=1.0)
+    assert submit(make_query("MOO"))[0] == 500
+    assert bridge.submitJob(json.dumps(make_query("MOO"))) is None
+
+
+def test_job_storage(mock_agent_config):
+    mock_agent_config(MAX_JOBS=2, JOB_TTL=0.5)
+    jobIDs = [submit(make_query("MOO"))[1]["jobID"] for _ in range(3)]
+    assert [outputs(jobID).status_code for jobID in jobIDs] == [400, 200, 200]
+    time.sleep(0.7)
+    assert outputs(jobIDs[-1]).status_code == 400
+
+    config_url = f"{os.environ['MODS_AGENT_BASE_URL']}/admin/config"
+    for update in ({"WORKERS": 2}, {"JOB_DURATION": "2"}, {"MAX_JOBS": 2.5},
+                   {"JOB_STORE": "jobs.sqlite"}, [1]):
+        assert requests.post(config_url, json=update).status_code == 400
+
+
+def test_shared_job_store(tmp_path):
+    spec = importlib.util.spec_from_file_location(
+        "mock_agent_jobs", os.path.join(THIS_DIR, "mods_mock_agent", "api", "jobs.py"))
+    jobs = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(jobs)
+
+    # Two workers sharing one database
+    path = str(tmp_path / "jobs.sqlite")
+    first, second = jobs.Job_Store(path), jobs.Job_Store(path)
+    for k in range(3):
+        first.put(f"job{k}", time.time(), {"jobID": f"job{k}"}, 2, 60)
+    assert second.get("job0", 60) is None
+    assert second.get("job2", 60)[1] == {"jobID": "job2"}
+    assert len(second) == 2
+
+    # ...and the settings changed at run time
+    first.updateSettings({"JOB_DURATION": 2.0})
+    second.updateSettings({"RANDOM_SEED": 1}, reseed=True)
+    assert first.settings() == ({"JOB_DURATION": 2.0, "RANDOM_SEED": 1}, 1)
+    second.resetSettings()
+    assert first.settings() == ({}, 2)
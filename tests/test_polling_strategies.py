@@ -0,0 +1,45 @@
+import json
+import time
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Fixed_Polling, Exponential_Backoff_Polling)
+
+INPUTS = {
+    "SimulationType": "MOO",
+    "Inputs": [{"name": f"var{i}", "values": [0.1]} for i in range(1, 7)],
+}
+
+
+def test_fixed_polling():
+    assert list(Fixed_Polling(interval=3, max_attempts=4).delays()) == [3, 3, 3]
+
+
+def test_exponential_backoff_polling():
+    strategy = Exponential_Backoff_Polling(
+        initial_delay=1, fast_polls=2, factor=2, max_delay=5,
+        jitter=0.1, deadline=None, seed=1)
+    delays = strategy.delays()
+    delays = [next(delays) for _ in range(6)]
+
+    for delay, expected in zip(delays, [1, 1, 2, 4, 5, 5]):
+        assert expected * 0.9 <= delay <= expected * 1.1
+
+
+def test_exponential_backoff_polling_deadline():
+    strategy = Exponential_Backoff_Polling(initial_delay=1, deadline=0)
+    assert list(strategy.delays()) == []
+
+
+def test_polling_running_job(slow_jobs):
+    bridge = Agent_Bridge(polling_strategy=Exponential_Backoff_Polling(
+        initial_delay=0.1, factor=1.5, deadline=10))
+
+    start = time.monotonic()
+    outputs = bridge.runJob(json.dumps(INPUTS))
+    assert outputs is not None
+    assert slow_jobs <= time.monotonic() - start < slow_jobs + 2
+
+
+def test_polling_deadline(slow_jobs):
+    bridge = Agent_Bridge(polling_strategy=Exponential_Backoff_Polling(
+        initial_delay=0.1, deadline=0.5))
+    assert bridge.runJob(json.dumps(INPUTS)) is None
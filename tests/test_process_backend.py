@@ -0,0 +1,94 @@
+import json
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+from osp.core.namespaces import cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Execution_Backend, HDMR_Surrogate, Process_Pool_Backend, Surrogate_Store)
+from osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates import Engine_Template
+from osp.wrappers.sim_cmcl_mods_wrapper.process_backend import (
+    attachColumns, shareColumns)
+
+
+class Unreachable_Backend(Execution_Backend):
+    NAME = "unreachable"
+
+    def submit(self, jsonSimCase, template):
+        raise AssertionError("The job should run locally")
+
+    poll = fetch = cancel = run = submit
+
+
+@pytest.fixture()
+def process_backend(tmp_path):
+    Surrogate_Store(str(tmp_path)).export("mods-sim-1")
+    backend = Process_Pool_Backend(max_workers=2,
+                                   surrogate_directory=str(tmp_path),
+                                   fallback=Unreachable_Backend())
+    yield backend
+    backend.close()
+
+
+def test_shared_columns():
+    columns = {"a": np.arange(5.0), "b": np.ones(5)}
+    shared, block = shareColumns(columns, threshold=0)
+    assert shared[0] == "shared"
+    attached, view = attachColumns(shared)
+    np.testing.assert_array_equal(attached["a"], columns["a"])
+    del attached
+    view.close()
+    block.close()
+    block.unlink()
+
+    assert shareColumns(columns, threshold=1000)[0][0] == "inline"
+
+
+def test_process_evaluate(process_backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(Process_Pool_Backend, "SHARED_MEMORY_THRESHOLD", 0)
+    num_points = 50000
+    simCase = {
+        "SimulationType": "Evaluate",
+        "Algorithms": [{"name": "algorithm1", "surrogateToLoad": "mods-sim-1"}],
+        "Inputs": [
+            {"name": "var1", "values": np.linspace(0, 1, num_points).tolist()},
+            {"name": "var2", "values": np.linspace(1, 2, num_points).tolist()},
+        ],
+    }
+    results = process_backend.run(json.dumps(simCase), Engine_Template.Evaluate)
+
+    surrogate = HDMR_Surrogate(json.loads((tmp_path / "mods-sim-1.json").read_text()))
+    expected = surrogate.evaluate({input["name"]: input["values"]
+                                   for input in simCase["Inputs"]})
+    assert results["jobID"] == "local:mods-sim-1"
+    np.testing.assert_allclose(results["Outputs"][0]["values"], expected["var3"])
+
+    jobID = process_backend.submit(json.dumps(simCase), Engine_Template.Evaluate)
+    assert process_backend.fetch(jobID)["Outputs"][0]["name"] == "var3"
+
+
+def test_process_session(mcdm_data, process_backend):
+    with ms.MoDS_Session(backend=process_backend, lazy_results=True) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(mcdm_data, rel=cuba.relationship)
+        session.run()
+        assert session.results(simulation)["ModelId"].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert process_backend.metrics.snapshot()["completed"] == 1
+
+
+def test_cancel_finished(process_backend, monkeypatch):
+    monkeypatch.setattr(Process_Pool_Backend, "SHARED_MEMORY_THRESHOLD", 0)
+    simCase = {
+        "SimulationType": "Evaluate",
+        "Algorithms": [{"name": "algorithm1", "surrogateToLoad": "mods-sim-1"}],
+        "Inputs": [{"name": "var1", "values": [0.0, 0.5, 1.0]},
+                   {"name": "var2", "values": [1.0, 1.5, 2.0]}],
+    }
+    jobID = process_backend.submit(json.dumps(simCase), Engine_Template.Evaluate)
+    _, sharedOutputs = process_backend._jobs[jobID][0].result(timeout=30)
+    assert sharedOutputs[0] == "shared"
+
+    # The output block of a cancelled job is released
+    process_backend.cancel(jobID)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=sharedOutputs[1])
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+from osp.core.namespaces import mods, cuba
+import osp.core.utils.simple_search as search
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper.ranking import Local_Ranker, nonDominated
+
+
+def bruteForceFront(points):
+    return np.array([
+        not any(np.all(other <= point) and np.any(other < point)
+                for other in points)
+        for point in points
+    ])
+
+
+@pytest.mark.parametrize("num_objectives", [1, 2, 3, 5])
+def test_non_dominated(num_objectives):
+    rng = np.random.default_rng(num_objectives)
+    # Few distinct values, so that there are ties and duplicates
+    points = rng.integers(0, 6, size=(300, num_objectives)).astype(float)
+    assert np.array_equal(nonDominated(points), bruteForceFront(points))
+
+
+def test_local_mcdm(mcdm_data):
+    with ms.MoDS_Session(local_ranking=True, lazy_results=True) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(mcdm_data, rel=cuba.relationship)
+        session.run()
+
+        table = session.results(simulation)
+        # Model 1 exceeds the maximum Cost1, model 6 is dominated by model 4
+        assert table["ModelId"].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+        table.toCUDS()
+        ranks = search.find_cuds_objects_by_oclass(
+            mods.RankedDataPoint, wrapper, rel=None)
+        assert sorted(point.ranking for point in ranks) == [1, 2, 3, 4]
+        job_id = search.find_cuds_objects_by_oclass(
+            mods.JobIDItem, wrapper, rel=None)[0]
+        assert job_id.name == "local:MCDM"
+
+
+def test_local_mcdm_async(mcdm_data, monkeypatch):
+    threads = []
+    rank = Local_Ranker.rank
+
+    def recordingRank(self, jsonSimCase):
+        threads.append(threading.current_thread())
+        return rank(self, jsonSimCase)
+
+    monkeypatch.setattr(Local_Ranker, "rank", recordingRank)
+    with ms.MoDS_Session(local_ranking=True, lazy_results=True) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(mcdm_data, rel=cuba.relationship)
+        asyncio.run(session.arun())
+
+        assert session.results(simulation)["ModelId"].tolist() == [
+            2.0, 3.0, 4.0, 5.0]
+    # The ranking does not run on the event loop
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from osp.core.namespaces import mods, cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Exponential_Backoff_Polling, Request_Coalescer)
+
+POLLING = Exponential_Backoff_Polling(initial_delay=0.1, deadline=10)
+
+
+def test_coalesce_threads(moo_batch, slow_jobs, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", POLLING)
+    coalescer = Request_Coalescer()
+    pareto_fronts = []
+
+    def run(simulation):
+        with ms.MoDS_Session(coalescer=coalescer) as session:
+            wrapper = cuba.wrapper(session=session)
+            simulation = wrapper.add(simulation, rel=cuba.relationship)
+            wrapper.session.run()
+            pareto_fronts.append(simulation.get(oclass=mods.ParetoFront)[0])
+
+    threads = [threading.Thread(target=run, args=(sim,)) for sim in moo_batch]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(pareto_fronts) == len(moo_batch)
+    assert len({front.uid for front in pareto_fronts}) == len(moo_batch)
+    assert coalescer.stats() == dict(
+        executed=1, coalesced=len(moo_batch) - 1, inflight=0)
+
+
+def test_coalesce_tasks(moo_batch, slow_jobs, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", POLLING)
+    coalescer = Request_Coalescer()
+
+    with ms.MoDS_Session(coalescer=coalescer) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulations = wrapper.add(*moo_batch, rel=cuba.relationship)
+        assert all(session.run_many(simulations))
+
+    assert coalescer.stats()["executed"] == 1
+    assert coalescer.stats()["coalesced"] == len(moo_batch) - 1
+
+
+def test_cancel_leader():
+    coalescer = Request_Coalescer()
+    started = []
+
+    async def job():
+        started.append(len(started))
+        if len(started) == 1:
+            # The first caller's job never finishes: its task is cancelled
+            await asyncio.sleep(3600)
+        return {"jobID": "retried"}
+
+    async def main():
+        leader = asyncio.ensure_future(coalescer.arun("key", job))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(coalescer.arun("key", job))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        # The follower runs the job itself instead of being cancelled
+        assert await follower == {"jobID": "retried"}
+        assert leader.cancelled()
+
+    asyncio.run(main())
+    assert started == [0, 1]
+    assert coalescer.stats() == dict(executed=2, coalesced=1, inflight=0)
+
+
+def test_leader_error():
+    coalescer = Request_Coalescer()
+
+    async def job():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("job failed")
+
+    async def main():
+        return await asyncio.gather(coalescer.arun("key", job),
+                                    coalescer.arun("key", job),
+                                    return_exceptions=True)
+
+    # Errors of the job are raised to every caller
+    errors = asyncio.run(main())
+    assert [str(error) for error in errors] == ["job failed"] * 2
+    assert coalescer.stats()["executed"] == 1
@@ -0,0 +1,89 @@
+import json
+import math
+import time
+from osp.core.namespaces import mods, cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+import osp.wrappers.sim_cmcl_mods_wrapper.engine_sim_templates as engtempl
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Fixed_Polling, Result_Cache)
+
+MOO = engtempl.Engine_Template.MOO
+RESULTS = {"jobID": "1", "Outputs": [{"name": "var1", "values": [1.0, 2.0]}]}
+
+
+def test_cache_key():
+    key = Result_Cache.key('{"a": 1, "b": [1, 2]}', MOO)
+    assert key == Result_Cache.key('{"b":[1,2],"a":1}', MOO)
+    assert key != Result_Cache.key('{"a": 1, "b": [2, 1]}', MOO)
+    assert key != Result_Cache.key(
+        '{"a": 1, "b": [1, 2]}', engtempl.Engine_Template.MOOonly)
+
+
+def test_memory_cache():
+    cache = Result_Cache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", RESULTS)
+    cache.put("b", RESULTS)
+    cached = cache.get("a")
+    assert cached == RESULTS
+    cached["Outputs"].clear()
+    assert cache.get("a") == RESULTS
+
+    # "b" is the least recently used entry
+    cache.put("c", RESULTS)
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 1)
+
+    # NaN is kept, not stored as null
+    cache.put("nan", {"Outputs": [{"name": "var1", "values": [float("nan")]}]})
+    assert math.isnan(cache.get("nan")["Outputs"][0]["values"][0])
+
+
+def test_cache_ttl():
+    cache = Result_Cache(ttl=0.1)
+    cache.put("a", RESULTS)
+    assert cache.get("a") == RESULTS
+    time.sleep(0.2)
+    assert cache.get("a") is None
+
+
+def test_disk_cache(tmp_path):
+    cache = Result_Cache(directory=str(tmp_path))
+    cache.put("a", RESULTS, MOO)
+    cache.close()
+
+    cache = Result_Cache(directory=str(tmp_path))
+    assert cache.get("a") == RESULTS
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("a") == RESULTS
+    assert cache.stats()["memory_hits"] == 1
+
+    max_disk_bytes = len(json.dumps(RESULTS))
+    cache = Result_Cache(directory=str(tmp_path), max_disk_bytes=max_disk_bytes)
+    cache.put("b", RESULTS, MOO)
+    assert cache.stats()["disk_entries"] == 1
+
+
+def test_session_cache(moo_data, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", Fixed_Polling(0.1, 60))
+    cache = Result_Cache()
+
+    with ms.MoDS_Session(cache=cache) as session:
+        wrapper = cuba.wrapper(session=session)
+        wrapper.add(moo_data, rel=cuba.relationship)
+        wrapper.session.run()
+
+    def fail(*args):
+        raise AssertionError("Agent_Bridge used despite cached results")
+    monkeypatch.setattr(Agent_Bridge, "runJob", fail)
+
+    with ms.MoDS_Session(cache=cache) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(moo_data, rel=cuba.relationship)
+        wrapper.session.run()
+
+        pareto_front = simulation.get(oclass=mods.ParetoFront)
+        assert len(pareto_front[0].get(oclass=mods.DataPoint)) == 10
+
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,42 @@
+import numpy as np
+from osp.core.namespaces import mods, cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import Result_Table
+
+OUTPUTS = [
+    {"name": "var1", "values": [1.0, 2.0, 3.0]},
+    {"name": "var2", "values": [4, 5, 6]},
+]
+
+
+def test_result_table():
+    table = Result_Table(OUTPUTS)
+    assert len(table) == 3
+    assert table.names == ["var1", "var2"]
+    assert table["var1"].dtype == np.float64
+    assert table.row(1) == {"var1": 2.0, "var2": 5}
+    assert table.toArray().shape == (3, 2)
+    assert table.nbytes == 3 * 8 * 2
+    assert table.toJSON() == OUTPUTS
+
+
+def test_lazy_results(moo_data):
+    with ms.MoDS_Session(lazy_results=True) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(moo_data, rel=cuba.relationship)
+        session.run()
+
+        # Only the job ID is registered as CUDS
+        assert simulation.get(oclass=mods.ParetoFront) == []
+        assert len(simulation.get(oclass=mods.JobID)) == 1
+
+        table = session.results(simulation)
+        assert len(table) == 10
+        assert table.names == [f"var{i}" for i in range(1, 7)]
+
+        # Data points are built on demand, once
+        pareto_front = table.toCUDS()
+        assert table.toCUDS() is pareto_front
+        assert simulation.get(oclass=mods.ParetoFront) == [pareto_front]
+        data_points = pareto_front.get(oclass=mods.RankedDataPoint)
+        assert sorted(point.ranking for point in data_points) == list(range(1, 11))
@@ -0,0 +1,120 @@
+import asyncio
+import time
+import numpy as np
+from osp.core.namespaces import mods, cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, HDMR_Surrogate, Surrogate_Store)
+
+
+def expected_var3(var1, var2):
+    var1, var2 = np.asarray(var1), np.asarray(var2)
+    return 1 + 2 * var1 - 0.5 * var2**2 + 0.25 * var1 * var2
+
+
+def test_hdmr_surrogate():
+    surrogate = HDMR_Surrogate({
+        "inputs": [
+            {"name": "a", "minimum": 0.0, "maximum": 2.0},
+            {"name": "b", "minimum": -1.0, "maximum": 1.0},
+        ],
+        "outputs": [
+            {"name": "y", "f0": 1.0, "terms": [
+                {"variables": ["a"], "orders": [2], "coefficient": 3.0},
+                {"variables": ["a", "b"], "orders": [1, 3], "coefficient": -1.0},
+            ]},
+            {"name": "z", "f0": 0.0, "terms": []},
+        ],
+    })
+    a, b = np.linspace(0, 2, 7), np.linspace(-1, 1, 7)
+    outputs = surrogate.evaluate({"a": a, "b": b})
+
+    sa, sb = a / 2, (b + 1) / 2
+    np.testing.assert_allclose(outputs["y"], 1 + 3 * sa**2 - sa * sb**3)
+    np.testing.assert_allclose(outputs["z"], 0)
+
+
+def test_surrogate_store(tmp_path):
+    store = Surrogate_Store(directory=str(tmp_path))
+    surrogate = store.get("mods-sim-1")
+    assert surrogate.inputs == ["var1", "var2"]
+    assert store.get("mods-sim-1") is surrogate
+    assert (tmp_path / "mods-sim-1.json").exists()
+
+    # Exports are read back from the directory without downloading them
+    assert Surrogate_Store(directory=str(tmp_path)).get(
+        "mods-sim-1", download=False).outputs == ["var3"]
+
+
+def test_local_evaluate(evaluate_data, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "runJob", None)
+    with ms.MoDS_Session(surrogates=Surrogate_Store(), lazy_results=True) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(evaluate_data, rel=cuba.relationship)
+        session.run()
+
+        table = session.results(simulation)
+        var1, var2 = np.arange(25), np.arange(25) + 0.5
+        np.testing.assert_allclose(table["var3"], expected_var3(var1, var2))
+
+
+def test_export_saved_surrogate(moo_data, tmp_path, monkeypatch):
+    monkeypatch.setattr(Agent_Bridge, "POLL_INTERVAL", 0)
+    store = Surrogate_Store(str(tmp_path), export_saved=True)
+    with ms.MoDS_Session(surrogates=store) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(moo_data, rel=cuba.relationship)
+        session.run()
+
+        job_id = simulation.get(oclass=mods.JobID)[0].get(
+            oclass=mods.JobIDItem)[0].name
+        assert (tmp_path / f"{job_id}.json").exists()
+
+
+def test_unavailable_surrogate(monkeypatch):
+    downloads = []
+
+    def downloadSurrogate(self, surrogateID):
+        downloads.append(surrogateID)
+        return None
+
+    monkeypatch.setattr(Agent_Bridge, "downloadSurrogate", downloadSurrogate)
+    store = Surrogate_Store()
+    assert store.get("mods-sim-missing") is None
+    assert store.get("mods-sim-missing") is None
+    assert store.export("mods-sim-missing") is None
+    # Failed downloads are not requested again
+    assert downloads == ["mods-sim-missing"]
+
+
+def test_local_evaluate_async(evaluate_data, monkeypatch):
+    download = Agent_Bridge.downloadSurrogate
+
+    def slowDownload(self, surrogateID):
+        time.sleep(0.5)
+        return download(self, surrogateID)
+
+    monkeypatch.setattr(Agent_Bridge, "downloadSurrogate", slowDownload)
+
+    async def main(session):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        task = asyncio.ensure_future(ticker())
+        await session.arun()
+        task.cancel()
+        return ticks
+
+    with ms.MoDS_Session(surrogates=Surrogate_Store(), lazy_results=True) as session:
+        wrapper = cuba.wrapper(session=session)
+        simulation = wrapper.add(evaluate_data, rel=cuba.relationship)
+        # The download does not block the event loop
+        assert len(asyncio.run(main(session))) >= 5
+
+        table = session.results(simulation)
+        var1, var2 = np.arange(25), np.arange(25) + 0.5
+        np.testing.assert_allclose(table["var3"], expected_var3(var1, var2))
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from osp.core.namespaces import cuba
+import osp.wrappers.sim_cmcl_mods_wrapper.mods_session as ms
+from osp.wrappers.sim_cmcl_mods_wrapper import (
+    Agent_Bridge, Fixed_Polling, Memory_Tracer, No_Op_Tracer, currentTracer,
+    useTracer)
+
+
+def test_memory_tracer():
+    tracer = Memory_Tracer(max_spans=3)
+    assert isinstance(currentTracer(), No_Op_Tracer)
+    with useTracer(tracer):
+        with currentTracer().start_as_current_span("run") as run:
+            for size in (10, 20):
+                with tracer.start_as_current_span(
+                        "poll", attributes={"attempt": size}) as poll:
+                    poll.set_attribute("response_bytes", size)
+        run.set_attribute("status_code", 200)
+    assert isinstance(currentTracer(), No_Op_Tracer)
+
+    polls = [span for span in tracer.spans if span.name == "poll"]
+    assert [span.parentID for span in polls] == [run.spanID] * 2
+    assert {span.traceID for span in tracer.spans} == {run.traceID}
+
+    summary = tracer.summary()
+    assert summary["counts"] == {"poll": 2, "run": 1}
+    assert summary["sizes"] == {"response_bytes": 30}
+    assert summary["total"] == run.duration >= summary["phases"]["poll"]
+
+
+def test_last_run_profile(moo_data, slow_jobs, monkeypatch, caplog):
+    monkeypatch.setattr(Agent_Bridge, "POLLING_STRATEGY", Fixed_Polling(0.2, 100))
+    tracer = Memory_Tracer()
+    with ms.MoDS_Session(tracer=tracer) as session:
+        assert session.last_run_profile() is None
+        wrapper = cuba.wrapper(session=session)
+        wrapper.add(moo_data, rel=cuba.relationship)
+        with caplog.at_level(logging.INFO):
+            session.run()
+
+        profile = session.last_run_profile()
+        for phase in ("determineTemplate", "generateJSON", "execute", "submit",
+                      "poll", "download", "toCUDS"):
+            assert profile["counts"][phase] >= 1
+        assert profile["counts"]["poll"] > 1
+        assert profile["phases"]["execute"] >= slow_jobs
+        assert profile["sizes"]["payload_bytes"] == profile["sizes"]["json_bytes"]
+        assert profile["sizes"]["response_bytes"] > 0
+
+        records = [record for record in caplog.records
+                   if hasattr(record, "mods_profile")]
+        assert records[-1].mods_profile == profile
+
+        # The spans are forwarded to the tracer of the session
+        assert tracer.summary()["counts"] == profile["counts"]
+
+        # The requests of the asynchronous bridge are traced as well
+        asyncio.run(session.arun())
+        assert session.last_run_profile()["counts"]["poll"] > 1